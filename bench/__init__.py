@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 13:00:00 krylon>
+#
+# /data/code/python/krylisp/bench/__init__.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.bench
+
+Benchmarks for the interpreter. Each module can be run on its own, e.g.
+
+    python -m krylisp.bench.dispatch
+
+The suite module runs the classic workloads with both engines and checks
+the results against a baseline:
+
+    python -m krylisp.bench.suite --json results.json
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
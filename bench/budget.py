@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 17:25:00 krylon>
+#
+# /data/code/python/krylisp/bench/budget.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.bench.budget
+
+Measure what counting steps against a budget costs, and how long the
+Scheduler takes to switch between tasks.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import time
+from typing import Final
+
+from krylisp import budget, lisp, parser
+from krylisp.bench.dispatch import FIB_SRC, best_of
+
+TASKS: Final[int] = 8
+
+
+def fuel(compiled: bool, src: str) -> tuple[float, float]:
+    """Return the best times for evaluating src without and with a budget."""
+    interp = lisp.LispInterpreter(compiled=compiled)
+    interp.eval_expr(parser.parse_string(FIB_SRC))
+    form = parser.parse_string(src)
+    plain = best_of(5, interp.eval_expr, form)
+    counted = best_of(5, lambda: interp.eval_budget(form, budget.Budget(fuel=10**9, timeout=60)))
+    return plain, counted
+
+
+def schedule(compiled: bool, src: str, slice_fuel: int) -> tuple[float, int]:
+    """Return the best time for running TASKS evaluations of src under a Scheduler, and the number of slices."""
+    best = float("inf")
+    slices = 0
+    for _ in range(3):
+        sched = budget.Scheduler(fuel=slice_fuel)
+        tasks = []
+        for _ in range(TASKS):
+            interp = lisp.LispInterpreter(compiled=compiled)
+            interp.eval_expr(parser.parse_string(FIB_SRC))
+            # The first call compiles fib, so it is made before the clock starts.
+            interp.eval_expr(parser.parse_string("(fib 2)"))
+            tasks.append(sched.spawn(interp, parser.parse_string(src)))
+        before = time.perf_counter()
+        sched.run()
+        best = min(best, time.perf_counter() - before)
+        slices = sum(task.slices for task in tasks)
+    return best, slices
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    for compiled in (False, True):
+        engine = "compiled" if compiled else "walk"
+        src = "(fib 20)" if compiled else "(fib 18)"
+        plain, counted = fuel(compiled, src)
+        print(f"{engine:8} {src}    plain {plain:7.3f} s    budget {counted:7.3f} s"
+              f"    overhead {(counted / plain - 1) * 100:5.1f} %")
+        # One slice per task, as a baseline.
+        serial, _ = schedule(compiled, src, 10**9)
+        for slice_fuel in (100, 1000):
+            elapsed, slices = schedule(compiled, src, slice_fuel)
+            print(f"{engine:8} {TASKS} x {src} in slices of {slice_fuel:5d}    {elapsed:7.3f} s"
+                  f"    {slices:6d} slices    {(elapsed - serial) / (slices - TASKS) * 1e6:6.1f} µs/switch")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
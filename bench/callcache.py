@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 18:40:00 krylon>
+#
+# /data/code/python/krylisp/bench/callcache.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.bench.callcache
+
+Measure what caching the global function a call site calls saves the
+walking interpreter, for calls made from behind a growing number of
+scopes.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from typing import Final
+
+from krylisp import lisp, parser
+from krylisp.bench.dispatch import best_of
+
+SRC: Final[str] = "(defun inc (x) (+ x 1))"
+LOOP: Final[str] = "(do ((i 0 (+ i 1)) (s 0 (inc s))) ((= i 5000) s))"
+
+
+def nested(depth: int) -> str:
+    """Return the loop, depth lets further in."""
+    src = LOOP
+    for idx in range(depth):
+        src = f"(let ((y{idx} {idx})) {src})"
+    return src
+
+
+def run(depth: int, cached: bool) -> float:
+    """Return the best time for running the loop depth lets deep, with or without the call cache."""
+    interp = lisp.LispInterpreter()
+    if not cached:
+        interp.call_cache = None
+    interp.eval_expr(parser.parse_string(SRC))
+    return best_of(5, interp.eval_expr, parser.parse_string(nested(depth)))
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    for depth in (0, 1, 4, 16):
+        plain = run(depth, False)
+        cached = run(depth, True)
+        print(f"depth {depth:2}    uncached {plain:7.3f} s    cached {cached:7.3f} s    {plain / cached:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
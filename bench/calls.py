@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 12:42:00 krylon>
+#
+# /data/code/python/krylisp/bench/calls.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.bench.calls
+
+Measure the overhead of calling a Lisp function, directly and via apply.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from typing import Final
+
+from krylisp.bench.engines import run
+
+SETUP_SRC: Final[str] = "(defun id3 (a b &rest c) a)"
+COUNT: Final[int] = 20000
+CASES: Final[list[tuple[str, str]]] = [
+    ("call", f"(do ((i 0 (+ i 1))) ((= i {COUNT}) i) (id3 i 2 3))"),
+    ("apply", f"(do ((i 0 (+ i 1))) ((= i {COUNT}) i) (apply id3 '(1 2 3)))"),
+    ("loop only", f"(do ((i 0 (+ i 1))) ((= i {COUNT}) i) i)"),
+]
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    for compiled in (False, True):
+        engine = "compiled" if compiled else "walk"
+        loop = run(CASES[-1][1], compiled, SETUP_SRC)
+        for title, src in CASES[:-1]:
+            delta = run(src, compiled, SETUP_SRC) - loop
+            print(f"{engine:8} {title:6} {delta / COUNT * 1e9:8.0f} ns/call")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 19:15:00 krylon>
+#
+# /data/code/python/krylisp/bench/containers.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.bench.containers
+
+Measure how much faster looking up keys in a hash table is than looking
+them up in an association list written in Lisp, for a growing number of
+keys.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from typing import Final
+
+from krylisp import lisp, parser
+from krylisp.bench.dispatch import best_of
+
+SRC: Final[str] = """
+(defun assq (k alist)
+  (if (null alist)
+      nil
+      (if (eq k (car (car alist)))
+          (car alist)
+          (assq k (cdr alist)))))
+"""
+
+# Fill the alist and the hash table with the same keys, in the same order.
+# The steps of do are taken in order, so the alist grows before i does.
+SETUP: Final[str] = """
+(do ((alist nil (cons (list i (* i i)) alist))
+     (i 0 (+ i 1))
+     (table squares table))
+    ((= i {size}) (setq pairs alist))
+  (puthash i (* i i) table))
+"""
+
+ALIST: Final[str] = "(do ((s 0 (+ s (car (cdr (assq i pairs))))) (i 0 (+ i 1))) ((= i {size}) s))"
+TABLE: Final[str] = "(do ((s 0 (+ s (gethash i squares))) (i 0 (+ i 1))) ((= i {size}) s))"
+
+
+def run(size: int, compiled: bool) -> tuple[float, float]:
+    """Return the best times for looking up each of size keys once, in the alist and in the hash table."""
+    interp = lisp.LispInterpreter(compiled=compiled)
+    interp.eval_expr(parser.parse_string(SRC))
+    interp.eval_expr(parser.parse_string("(setq pairs nil)"))
+    interp.eval_expr(parser.parse_string("(setq squares (make-hash-table))"))
+    interp.eval_expr(parser.parse_string(SETUP.format(size=size)))
+    alist = parser.parse_string(ALIST.format(size=size))
+    table = parser.parse_string(TABLE.format(size=size))
+    if interp.eval_expr(alist) != interp.eval_expr(table):
+        raise AssertionError("The alist and the hash table disagree")
+    return best_of(3, interp.eval_expr, alist), best_of(3, interp.eval_expr, table)
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    for compiled in (False, True):
+        engine = "compiled" if compiled else "walk"
+        for size in (10, 100, 400):
+            alist, table = run(size, compiled)
+            print(f"{engine:8} {size:4} keys    alist {alist:7.4f} s    hash table {table:7.4f} s"
+                  f"    {alist / table:6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
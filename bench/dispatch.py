@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 09:37:00 krylon>
+#
+# /data/code/python/krylisp/bench/dispatch.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.bench.dispatch
+
+Measure what it costs eval_list to find out what kind of form it is looking at.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import time
+from typing import Final
+
+from krylisp import data, lisp, parser
+
+FIB_SRC: Final[str] = "(defun fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))"
+
+
+def best_of(rounds: int, fn, *args) -> float:
+    """Run fn rounds times and return the fastest run in seconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        before = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - before)
+    return best
+
+
+def lookup_chain(names: list[str], sym: data.Atom, count: int) -> None:
+    """Dispatch sym count times the old way, by comparing it to every form name."""
+    for _ in range(count):
+        for name in names:
+            if sym == name:
+                break
+
+
+def lookup_table(forms: dict, sym: data.Atom, count: int) -> None:
+    """Dispatch sym count times through the dispatch table."""
+    for _ in range(count):
+        forms.get(sym.value)
+
+
+def run_fib(n: int = 18, rounds: int = 3) -> float:
+    """Return the best time for computing (fib n)."""
+    interp = lisp.LispInterpreter()
+    interp.eval_expr(parser.parse_string(FIB_SRC))
+    form = parser.parse_string(f"(fib {n})")
+    return best_of(rounds, interp.eval_expr, form)
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    count: Final[int] = 100_000
+    interp = lisp.LispInterpreter()
+    names: Final[list[str]] = list(interp.forms)
+    sym: Final[data.Atom] = data.Atom("fib")
+
+    chain = best_of(3, lookup_chain, names, sym, count)
+    table = best_of(3, lookup_table, interp.forms, sym, count)
+    print(f"Dispatching a function call, {len(names)} forms:")
+    print(f"    comparison chain: {chain / count * 1e9:10.1f} ns/form")
+    print(f"    dispatch table:   {table / count * 1e9:10.1f} ns/form")
+    print(f"(fib 18): {run_fib():.3f} s")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
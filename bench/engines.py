@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 11:14:00 krylon>
+#
+# /data/code/python/krylisp/bench/engines.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.bench.engines
+
+Compare the tree-walking evaluator with the compiler.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from typing import Final
+
+from krylisp import lisp, parser
+from krylisp.bench.dispatch import FIB_SRC, best_of
+
+LOOP_SRC: Final[str] = "(do ((i 0 (+ i 1)) (s 0 (+ s (* i i)))) ((= i 20000) s))"
+
+
+def run(src: str, compiled: bool, setup: str = "") -> float:
+    """Return the best time for evaluating src."""
+    interp = lisp.LispInterpreter(compiled=compiled)
+    if setup != "":
+        interp.eval_expr(parser.parse_string(setup))
+    form = parser.parse_string(src)
+    return best_of(3, interp.eval_expr, form)
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    cases: Final[list[tuple[str, str, str]]] = [
+        ("numeric do loop", LOOP_SRC, ""),
+        ("(fib 18)", "(fib 18)", FIB_SRC),
+    ]
+    for title, src, setup in cases:
+        walk = run(src, False, setup)
+        comp = run(src, True, setup)
+        print(f"{title:16} walk {walk:8.3f} s    compiled {comp:8.3f} s    {walk / comp:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 14:35:00 krylon>
+#
+# /data/code/python/krylisp/bench/formcache.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.bench.formcache
+
+Compare reading a source file to taking its forms from the form cache.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import os
+import tempfile
+from typing import Final
+
+from krylisp.bench.dispatch import best_of
+from krylisp.formcache import FormCache
+
+FUNCTIONS: Final[int] = 2000
+
+
+def consume(cache: FormCache, path: str, cold: bool = False) -> None:
+    """Take all forms of the file at path from cache. If cold is True, empty the cache first."""
+    if cold and os.path.exists(cache.cache_path(path)):
+        os.remove(cache.cache_path(path))
+    for _ in cache.forms(path):
+        pass
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    with tempfile.TemporaryDirectory() as folder:
+        path: Final[str] = os.path.join(folder, "library.lisp")
+        with open(path, "w", encoding="utf-8") as fh:
+            for idx in range(FUNCTIONS):
+                fh.write(f";; Function number {idx}\n"
+                         f"(defun fn-{idx} (x y)\n"
+                         f"  (if (< x y) `(less ,x ,y \"{idx}\") (list 'more (* x {idx}) y 2.5)))\n")
+        cache: Final[FormCache] = FormCache(os.path.join(folder, "cache"))
+        cold = best_of(5, consume, cache, path, True)
+        warm = best_of(5, consume, cache, path)
+        stats: Final[dict] = cache.stats()
+        print(f"{FUNCTIONS} functions    read {cold:7.4f} s    cached {warm:7.4f} s    {cold / warm:5.1f}x")
+        print(f"hits {stats['hits']}    misses {stats['misses']}    saved {stats['saved-ms']:.1f} ms"
+              f"    cache file {os.path.getsize(cache.cache_path(path)) // 1024} KiB")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 14:10:00 krylon>
+#
+# /data/code/python/krylisp/bench/image.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.bench.image
+
+Compare starting an interpreter by loading a prelude from source to
+starting it from an image of the same prelude.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import os
+import tempfile
+from typing import Final
+
+from krylisp import lisp
+from krylisp.bench.dispatch import best_of
+
+FUNCTIONS: Final[int] = 300
+
+# The prelude is seed.lisp, a few hundred functions, and a table that
+# takes a while to compute, as a warmed-up environment would have.
+TABLE_SRC: Final[str] = """
+(defun squares (n acc) (if (= n 0) acc (squares (- n 1) (cons (* n n) acc))))
+(setq table (squares 3000 nil))
+"""
+
+
+def prelude(folder: str) -> list[str]:
+    """Write the prelude files to folder and return their paths."""
+    path: Final[str] = os.path.join(folder, "prelude.lisp")
+    with open(path, "w", encoding="utf-8") as fh:
+        for idx in range(FUNCTIONS):
+            fh.write(f"(defun fn-{idx} (x y)\n  (if (< x y) (+ x (* y {idx})) (- x y)))\n")
+        fh.write(TABLE_SRC)
+    return [os.path.join(os.path.dirname(lisp.__file__), "seed.lisp"), path]
+
+
+def from_source(compiled: bool, sources: list[str]) -> None:
+    """Start an interpreter by loading sources."""
+    interp = lisp.LispInterpreter(compiled=compiled)
+    for src in sources:
+        lisp.load_file(interp, src)
+
+
+def from_image(compiled: bool, path: str, sources: list[str]) -> None:
+    """Start an interpreter from the image at path."""
+    lisp.LispInterpreter(compiled=compiled).load_image(path, sources)
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    with tempfile.TemporaryDirectory() as folder:
+        sources: Final[list[str]] = prelude(folder)
+        path: Final[str] = os.path.join(folder, "prelude.image")
+        for compiled in (False, True):
+            engine = "compiled" if compiled else "walk"
+            lisp.LispInterpreter(compiled=compiled).load_image(path, sources)
+            source = best_of(5, from_source, compiled, sources)
+            loaded = best_of(5, from_image, compiled, path, sources)
+            print(f"{engine:8} source {source:7.3f} s    image {loaded:7.3f} s    {source / loaded:5.1f}x"
+                  f"    {os.path.getsize(path) // 1024} KiB")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
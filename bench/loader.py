@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 12:13:00 krylon>
+#
+# /data/code/python/krylisp/bench/loader.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.bench.loader
+
+Load files with a single top-level form of growing length, to check that
+the time it takes grows linearly with the size of the file.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import os
+import tempfile
+import time
+
+from krylisp import lisp
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "long.lisp")
+        for lines in (2000, 4000, 8000, 16000):
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write("(list\n")
+                for idx in range(lines):
+                    fh.write(f"  {idx}\n")
+                fh.write(")\n")
+            interp = lisp.LispInterpreter()
+            before = time.perf_counter()
+            lisp.load_file(interp, path)
+            delta = time.perf_counter() - before
+            print(f"{lines:6} lines    {delta:8.4f} s    {delta / lines * 1e6:6.2f} µs/line")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 11:20:00 krylon>
+#
+# /data/code/python/krylisp/bench/lookup.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.bench.lookup
+
+Measure how the cost of looking up a variable grows with the number of
+scopes between the reference and the binding.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from typing import Final
+
+from krylisp.bench.engines import run
+
+LOOP: Final[str] = "(do ((i 0 (+ i 1)) (s 0 (+ s {}))) ((= i 5000) s))"
+
+
+def nested(depth: int) -> str:
+    """Return a loop that reads a variable bound depth lets further out."""
+    src = LOOP.format("x")
+    for idx in range(depth):
+        src = f"(let ((y{idx} {idx})) {src})"
+    return f"(let ((x 1)) {src})"
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    cases: Final[list[tuple[str, str, str]]] = [
+        ("global", LOOP.format("g"), "(setq g 1)"),
+    ]
+    for depth in (0, 1, 4, 16):
+        cases.append((f"depth {depth}", nested(depth), ""))
+    for title, src, setup in cases:
+        walk = run(src, False, setup)
+        comp = run(src, True, setup)
+        print(f"{title:10} walk {walk:8.3f} s    compiled {comp:8.3f} s    {walk / comp:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
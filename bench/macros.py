@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 11:31:00 krylon>
+#
+# /data/code/python/krylisp/bench/macros.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.bench.macros
+
+Compare a loop that calls a macro with the same loop expanded by hand.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from typing import Final
+
+from krylisp.bench.engines import run
+
+INCF_SRC: Final[str] = "(defmacro incf (x) `(setq ,x (+ ,x 1)))"
+MACRO_SRC: Final[str] = "(do ((i 0 (+ i 1)) (n 0 n)) ((= i 5000) n) (incf n))"
+HAND_SRC: Final[str] = "(do ((i 0 (+ i 1)) (n 0 n)) ((= i 5000) n) (setq n (+ n 1)))"
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    for compiled in (False, True):
+        engine = "compiled" if compiled else "walk"
+        macro = run(MACRO_SRC, compiled, INCF_SRC)
+        hand = run(HAND_SRC, compiled, INCF_SRC)
+        print(f"{engine:8} incf {macro:8.3f} s    by hand {hand:8.3f} s    {macro / hand:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 13:55:00 krylon>
+#
+# /data/code/python/krylisp/bench/memo.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.bench.memo
+
+Compare a function that is called with the same arguments over and over,
+with and without memoization.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from typing import Final
+
+from krylisp import lisp, parser
+from krylisp.bench.dispatch import best_of
+
+SCORE_SRC: Final[str] = """
+(defun score (l)
+  (if (null l)
+      0
+      (+ (* (car l) (car l)) (score (cdr l)))))
+"""
+LOOP_SRC: Final[str] = "(do ((i 0 (+ i 1)) (s 0 (+ s (score '(1 2 3 4 5 6 7 8))))) ((= i 2000) s))"
+
+
+def run(compiled: bool, memoized: bool) -> float:
+    """Return the best time for running the loop that calls score."""
+    interp = lisp.LispInterpreter(compiled=compiled)
+    interp.eval_expr(parser.parse_string(SCORE_SRC))
+    if memoized:
+        interp.memoize("score")
+    return best_of(3, interp.eval_expr, parser.parse_string(LOOP_SRC))
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    for compiled in (False, True):
+        engine = "compiled" if compiled else "walk"
+        plain = run(compiled, False)
+        cached = run(compiled, True)
+        print(f"{engine:8} plain {plain:7.3f} s    memoized {cached:7.3f} s    {plain / cached:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
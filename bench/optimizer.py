@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 18:05:00 krylon>
+#
+# /data/code/python/krylisp/bench/optimizer.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.bench.optimizer
+
+Measure how much faster a loop full of constant expressions runs once
+the optimizer has folded them.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from typing import Final
+
+from krylisp import lisp, parser
+from krylisp.bench.dispatch import best_of
+
+SRC: Final[str] = """
+(defun seconds (days)
+  (if (> days 0)
+      (* days (* 60 60 24))
+      (if t 0 (print "negative"))))
+"""
+LOOP_SRC: Final[str] = """
+(do ((i 0 (+ i 1))
+     (s 0 (+ s (seconds (mod i 7)) (- (* 2 1000) (/ 3000 2)))))
+    ((= i (* 10 1000)) s))
+"""
+
+
+def run(compiled: bool, optimize: bool) -> float:
+    """Return the best time for running the loop, with or without the optimizer."""
+    interp = lisp.LispInterpreter(compiled=compiled, optimize=optimize)
+    interp.eval_expr(interp.optimize(parser.parse_string(SRC)))
+    return best_of(5, interp.eval_expr, interp.optimize(parser.parse_string(LOOP_SRC)))
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    for compiled in (False, True):
+        engine = "compiled" if compiled else "walk"
+        plain = run(compiled, False)
+        folded = run(compiled, True)
+        print(f"{engine:8} plain {plain:7.3f} s    optimized {folded:7.3f} s    {plain / folded:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 15:05:00 krylon>
+#
+# /data/code/python/krylisp/bench/parallel.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.bench.parallel
+
+Compare mapping a CPU-bound function over a list in the interpreter to
+mapping it with pmap, with a growing number of worker processes.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import os
+import time
+from typing import Final
+
+from krylisp import lisp, parallel, parser
+from krylisp.bench.dispatch import FIB_SRC
+
+ITEMS: Final[int] = 32
+N: Final[int] = 16
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    interp = lisp.LispInterpreter(compiled=True)
+    interp.eval_expr(parser.parse_string(FIB_SRC))
+    items: Final[list[int]] = [N] * ITEMS
+    before = time.perf_counter()
+    for item in items:
+        interp.env["fib"](item)
+    serial: Final[float] = time.perf_counter() - before
+    print(f"{ITEMS} x (fib {N})    serial {serial:7.3f} s    {os.cpu_count()} CPUs")
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        interp.pool = parallel.Pool(interp, workers)
+        try:
+            # The first call starts the workers, which is not what is measured.
+            interp.pmap(interp.env["fib"], [1] * workers)
+            before = time.perf_counter()
+            interp.pmap(interp.env["fib"], items)
+            delta = time.perf_counter() - before
+        finally:
+            interp.close_pool()
+        print(f"{workers:2} workers    pmap {delta:7.3f} s    {serial / delta:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 12:01:00 krylon>
+#
+# /data/code/python/krylisp/bench/reader.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.bench.reader
+
+Measure the throughput of the reader in MB/s, and compare it with the
+pyparsing grammar it replaced, if pyparsing is installed.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import sys
+import time
+from typing import Any, Callable, Final
+
+from krylisp import data, parser
+
+FORM_SRC: Final[str] = """
+;; Function number {0}
+(defun f{0} (x &rest more)
+  (let ((y (* x {0})) (z 2.5))
+    (if (< y 100) `(small ,y ,@more) '(big "a string" {0}))))
+"""
+
+
+def generate(size: int) -> str:
+    """Return about size bytes of Lisp source."""
+    parts = []
+    total = 0
+    idx = 0
+    while total < size:
+        part = FORM_SRC.format(idx)
+        parts.append(part)
+        total += len(part)
+        idx += 1
+    return "".join(parts)
+
+
+def legacy_grammar() -> Callable[[str], Any]:
+    """Return a function that parses a string with the old pyparsing grammar."""
+    # pylint: disable-msg=C0415,E0401
+    from pyparsing import (Forward, Literal, QuotedString, Regex, Suppress,
+                           Word, ZeroOrMore, alphas, nums)
+
+    def to_list(tok):
+        return data.ConsCell.fromList([to_list(x) if x.__class__.__name__ == "ParseResults" else x
+                                       for x in tok])
+
+    open_paren = Suppress(Literal("("))
+    close_paren = Suppress(Literal(")"))
+    expr = Forward()
+    integer = Regex(r"-?\d+").set_parse_action(lambda s, loc, tok: int(tok[0]))
+    floating_point_number = Regex(r"-?\d+[.]\d+(?:e-?\d+)?").set_parse_action(
+        lambda s, loc, tok: float(tok[0]))
+    symbol = Word(alphas + nums + "-!$%&/=+-_*<>|").set_parse_action(
+        lambda s, loc, tok: data.Atom(tok[0]))
+    comment = Suppress(Regex(";[^\n]*"))
+    lisp_list = open_paren + ZeroOrMore(expr) + close_paren
+    lisp_list.set_parse_action(
+        lambda s, loc, tok: to_list(tok) if len(tok) > 0 else data.ConsCell(None, None))
+
+    def quoted(prefix: str, name: str, body):
+        return (Suppress(Literal(prefix)) + body).set_parse_action(
+            lambda s, loc, tok: parser.quote_body(data.Atom(name), to_list(tok)))
+
+    backquote_content = Forward()
+    backquote_list = open_paren + ZeroOrMore(backquote_content) + close_paren
+    backquote_list.set_parse_action(lambda s, loc, tok: to_list(tok))
+    backquote_content << (expr |  # pylint: disable-msg=W0106
+                          quoted(",@", "comma-at", expr) |
+                          quoted(",", "comma", expr) |
+                          backquote_list)
+    token = (floating_point_number | integer | QuotedString('"') | symbol | comment |
+             quoted("'", "quote", expr) | quoted("`", "backquote", backquote_content))
+    expr << (token | lisp_list)  # pylint: disable-msg=W0104
+    program = ZeroOrMore(expr)
+    return program.parse_string
+
+
+def throughput(fn: Callable[[str], Any], src: str) -> float:
+    """Return the best throughput of fn on src in MB/s."""
+    best = float("inf")
+    for _ in range(3):
+        before = time.perf_counter()
+        fn(src)
+        best = min(best, time.perf_counter() - before)
+    return len(src) / best / 1e6
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    size: Final[int] = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    src: Final[str] = generate(size)
+    reader: Final[float] = throughput(lambda s: list(parser.read(s)), src)
+    print(f"reader    {len(src) / 1e6:6.2f} MB    {reader:8.2f} MB/s")
+    try:
+        legacy = legacy_grammar()
+    except ImportError:
+        print("pyparsing is not installed, cannot compare with the old grammar")
+        return
+    old: Final[float] = throughput(legacy, src)
+    print(f"pyparsing {len(src) / 1e6:6.2f} MB    {old:8.2f} MB/s    reader is {reader / old:5.1f}x faster")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 16:50:00 krylon>
+#
+# /data/code/python/krylisp/bench/run.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.bench.run
+
+Run the batch evaluation command over a few thousand small rule files
+with a growing number of worker processes.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import json
+import os
+import tempfile
+from typing import Final
+
+from krylisp import run
+
+FILES: Final[int] = 2000
+PRELUDE: Final[str] = """
+(defun fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))
+(defun score (l) (if (null l) 0 (+ (car l) (score (cdr l)))))
+"""
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    with tempfile.TemporaryDirectory() as folder:
+        prelude: Final[str] = os.path.join(folder, "prelude.lisp")
+        with open(prelude, "w", encoding="utf-8") as fh:
+            fh.write(PRELUDE)
+        files: Final[list[str]] = []
+        for idx in range(FILES):
+            files.append(os.path.join(folder, f"rule-{idx}.lisp"))
+            with open(files[-1], "w", encoding="utf-8") as fh:
+                fh.write(f"(setq limit {idx % 7 + 8})\n(list (fib limit) (score '(1 2 3 {idx})))\n")
+        output: Final[str] = os.path.join(folder, "results.jsonl")
+        for workers in sorted({1, 2, os.cpu_count() or 1}):
+            run.main(["--prelude", prelude, "--workers", str(workers), "--no-cache", "--output", output] + files)
+            with open(output, "r", encoding="utf-8") as fh:
+                summary = json.loads(fh.readlines()[-1])["summary"]
+            print(f"{workers:2} workers    {summary['jobs']} jobs in {summary['seconds']:6.3f} s"
+                  f"    {summary['jobs-per-s']:8.1f} jobs/s    {summary['errors']} errors")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
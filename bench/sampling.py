@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 13:40:00 krylon>
+#
+# /data/code/python/krylisp/bench/sampling.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.bench.sampling
+
+Measure what the sampling profiler costs a running interpreter.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import time
+from typing import Final
+
+from krylisp import lisp, parser
+from krylisp.bench.dispatch import FIB_SRC
+
+ROUNDS: Final[int] = 7
+INTERVAL: Final[float] = 0.001
+
+
+def measure(compiled: bool, src: str) -> tuple[float, float, int]:
+    """
+    Return the best times for evaluating src without and with the sampler, and the number of samples.
+
+    The runs with and without the sampler take turns, so both see the
+    machine in the same mood.
+    """
+    interp = lisp.LispInterpreter(compiled=compiled)
+    interp.eval_expr(parser.parse_string(FIB_SRC))
+    form = parser.parse_string(src)
+    plain = sampled = float("inf")
+    samples = 0
+    for _ in range(ROUNDS):
+        before = time.perf_counter()
+        interp.eval_expr(form)
+        plain = min(plain, time.perf_counter() - before)
+
+        interp.start_sampler(INTERVAL)
+        before = time.perf_counter()
+        interp.eval_expr(form)
+        sampled = min(sampled, time.perf_counter() - before)
+        samples += interp.stop_sampler().samples
+    return plain, sampled, samples
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    for compiled in (False, True):
+        engine = "compiled" if compiled else "walk"
+        src = "(fib 23)" if compiled else "(fib 20)"
+        plain, sampled, samples = measure(compiled, src)
+        print(f"{engine:8} {src}    off {plain:7.3f} s    on {sampled:7.3f} s"
+              f"    overhead {(sampled / plain - 1) * 100:5.1f} %    {samples // ROUNDS} samples/run")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
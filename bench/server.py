@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 16:20:00 krylon>
+#
+# /data/code/python/krylisp/bench/server.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.bench.server
+
+Have a number of clients send requests to the evaluation server at the
+same time, and report the throughput and the latencies it measured.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Final
+
+from krylisp import server
+
+CLIENTS: Final[int] = 16
+REQUESTS: Final[int] = 50
+PRELUDE: Final[str] = "(defun fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))\n"
+
+
+async def client(path: str, idx: int) -> None:
+    """Connect to the server at path and send it REQUESTS requests, one after the other."""
+    reader, writer = await asyncio.open_unix_connection(path)
+    for num in range(REQUESTS):
+        src = f"(setq last {num})\n(fib {10 + idx % 4})"
+        writer.write(json.dumps({"id": num, "src": src}).encode("utf-8") + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        assert "value" in response, response
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(folder: str, workers: int) -> None:
+    """Serve CLIENTS clients with workers worker threads and print the results."""
+    prelude: Final[str] = os.path.join(folder, "prelude.lisp")
+    with open(prelude, "w", encoding="utf-8") as fh:
+        fh.write(PRELUDE)
+    srv: Final[server.Server] = server.Server((prelude,), workers=workers)
+    path: Final[str] = os.path.join(folder, f"bench-{workers}.sock")
+    listener: Final = await srv.start(path)
+    before: Final[float] = time.perf_counter()
+    await asyncio.gather(*(client(path, idx) for idx in range(CLIENTS)))
+    delta: Final[float] = time.perf_counter() - before
+    stats: Final[dict] = srv.stats()
+    listener.close()
+    await listener.wait_closed()
+    srv.close()
+    print(f"{workers:2} workers    {stats['requests'] / delta:7.0f} requests/s"
+          f"    p50 {stats['p50-ms']:6.2f} ms    p90 {stats['p90-ms']:6.2f} ms    p99 {stats['p99-ms']:6.2f} ms")
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    with tempfile.TemporaryDirectory() as folder:
+        for workers in (1, 4):
+            asyncio.run(run(folder, workers))
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
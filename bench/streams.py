@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 19:50:00 krylon>
+#
+# /data/code/python/krylisp/bench/streams.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.bench.streams
+
+Measure the time and peak memory of a pipeline over a long sequence,
+run over a lazy stream and over the same elements collected into a
+list first.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import time
+import tracemalloc
+from typing import Final
+
+from krylisp import lisp, parser
+
+PIPELINE: Final[str] = """
+(stream-reduce (lambda (a x) (+ a x)) 0
+  (stream-filter (lambda (x) (= 0 (mod x 2)))
+    (stream-map (lambda (x) (* x 3)) {source})))
+"""
+
+LAZY: Final[str] = "(stream-range 0 {count})"
+EAGER: Final[str] = "(stream-to-list (stream-range 0 {count}))"
+
+
+def run(compiled: bool, source: str) -> tuple[float, int]:
+    """Return the time and the peak memory in bytes taken by the pipeline over source."""
+    interp = lisp.LispInterpreter(compiled=compiled)
+    expr = parser.parse_string(PIPELINE.format(source=source))
+    tracemalloc.start()
+    try:
+        before = time.perf_counter()
+        interp.eval_expr(expr)
+        elapsed = time.perf_counter() - before
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    for compiled in (False, True):
+        engine = "compiled" if compiled else "walk"
+        for count in (10_000, 100_000, 1_000_000):
+            lazy, lazy_peak = run(compiled, LAZY.format(count=count))
+            eager, eager_peak = run(compiled, EAGER.format(count=count))
+            print(f"{engine:8} {count:9,}    stream {lazy:6.2f} s {lazy_peak / 1024:9.1f} KiB"
+                  f"    list {eager:6.2f} s {eager_peak / 1024:9.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
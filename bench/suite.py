@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 13:00:00 krylon>
+#
+# /data/code/python/krylisp/bench/suite.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.bench.suite
+
+Run a set of classic Lisp workloads with both engines, write the results
+as JSON and compare them with a baseline, e.g.
+
+    python -m krylisp.bench.suite --json results.json
+    python -m krylisp.bench.suite --save-baseline
+    python -m krylisp.bench.suite --baseline ~/.krylisp.d/bench-baseline.json
+
+If any workload is slower than in the baseline by more than the
+tolerance, the suite exits with status 1.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Any, Callable, Final, Optional
+
+from krylisp import common, lisp, parser
+from krylisp.bench.dispatch import best_of
+from krylisp.bench.reader import generate
+
+FORMAT_VERSION: Final[int] = 1
+SEED_PATH: Final[str] = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     "seed.lisp")
+
+# A Case is called with a flag that says if the compiler is to be used,
+# and returns a function that runs the workload once.
+Case = Callable[[bool], Callable[[], Any]]
+
+
+def lisp_case(setup: tuple[str, ...], src: str, seed: bool = False) -> Case:
+    """Return a Case that evaluates src after the forms in setup, and after loading seed.lisp if seed is True."""
+    def prepare(compiled: bool) -> Callable[[], Any]:
+        interp = lisp.LispInterpreter(compiled=compiled)
+        if seed:
+            lisp.load_file(interp, SEED_PATH)
+        for expr in setup:
+            interp.eval_expr(parser.parse_string(expr))
+        form = parser.parse_string(src)
+        return lambda: interp.eval_expr(form)
+    return prepare
+
+
+def parse_case(size: int) -> Case:
+    """Return a Case that parses about size bytes of source."""
+    def prepare(_compiled: bool) -> Callable[[], Any]:
+        src: Final[str] = generate(size)
+        return lambda: parser.parse_string(src)
+    return prepare
+
+
+def deep_let(depth: int) -> str:
+    """Return a form that nests depth lets and adds up the variables at the bottom."""
+    src = "(+ " + " ".join(f"v{idx}" for idx in range(depth)) + ")"
+    for idx in reversed(range(depth)):
+        src = f"(let ((v{idx} {idx})) {src})"
+    return f"(do ((i 0 (+ i 1)) (s 0 (+ s {src}))) ((= i 200) s))"
+
+
+SUITE: Final[dict[str, tuple[Case, bool]]] = {
+    # The flag says if the workload is run with both engines; parsing does
+    # not depend on the engine.
+    "fib": (lisp_case(
+        ("(defun fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))",),
+        "(fib 18)"), True),
+    "tak": (lisp_case(
+        ("(defun tak (x y z) (if (not (< y x)) z "
+         "(tak (tak (- x 1) y z) (tak (- y 1) z x) (tak (- z 1) x y))))",),
+        "(tak 16 10 4)"), True),
+    "ackermann": (lisp_case(
+        ("(defun ack (m n) (if (= m 0) (+ n 1) "
+         "(if (= n 0) (ack (- m 1) 1) (ack (- m 1) (ack m (- n 1))))))",),
+        "(ack 2 40)"), True),
+    "list-reverse": (lisp_case(
+        ("(defun build (n acc) (if (= n 0) acc (build (- n 1) (cons n acc))))",
+         "(defun rev (l acc) (if (null l) acc (rev (cdr l) (cons (car l) acc))))"),
+        "(car (rev (build 5000 nil) nil))"), True),
+    "incf-loop": (lisp_case(
+        (),
+        "(do ((i 0 (+ i 1)) (n 0 n)) ((= i 10000) n) (incf n) (decf n) (incf n))",
+        seed=True), True),
+    "deep-let": (lisp_case((), deep_let(30)), True),
+    "parse": (parse_case(1000000), False),
+}
+
+
+def run_suite(names: list[str], engines: list[str], rounds: int) -> dict[str, float]:
+    """Run the named workloads with the given engines and return the best time of each."""
+    results: dict[str, float] = {}
+    for name in names:
+        case, per_engine = SUITE[name]
+        for engine in (engines if per_engine else ["walk"]):
+            key = f"{name}/{engine}" if per_engine else name
+            results[key] = best_of(rounds, case(engine == "compiled"))
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """Return a message for each result that is slower than its baseline by more than tolerance."""
+    regressions = []
+    for key, seconds in results.items():
+        before = baseline.get(key)
+        if before is not None and seconds > before * (1 + tolerance):
+            regressions.append(f"{key}: {seconds:.4f} s, baseline {before:.4f} s "
+                               f"(+{(seconds / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def report(results: dict[str, float], rounds: int) -> dict[str, Any]:
+    """Return the results along with a description of where they were measured."""
+    return {
+        "version": FORMAT_VERSION,
+        "krylisp": common.APP_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime(common.TIME_FMT),
+        "rounds": rounds,
+        "results": results,
+    }
+
+
+def load_baseline(path: str) -> Optional[dict[str, float]]:
+    """Return the results stored in the baseline file at path, or None if there is none."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            stored = json.load(fh)
+    except FileNotFoundError:
+        return None
+    if stored.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path} has version {stored.get('version')}, expected {FORMAT_VERSION}")
+    return stored["results"]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the benchmark suite and return the exit status."""
+    argp = argparse.ArgumentParser(description="Run the krylisp benchmark suite")
+    argp.add_argument("cases", nargs="*", choices=[[]] + list(SUITE),
+                      help="The workloads to run (default: all of them)")
+    argp.add_argument("--engine", choices=["walk", "compiled", "both"], default="both")
+    argp.add_argument("--rounds", type=int, default=3,
+                      help="How often to run each workload; the fastest run counts")
+    argp.add_argument("--json", metavar="PATH",
+                      help="Write the results to PATH, or to stdout if PATH is -")
+    argp.add_argument("--baseline", metavar="PATH", default=common.path.baseline(),
+                      help="The results to compare with")
+    argp.add_argument("--save-baseline", action="store_true",
+                      help="Store the results as the new baseline")
+    argp.add_argument("--tolerance", type=float, default=0.25,
+                      help="How much slower than the baseline a workload may be")
+    args = argp.parse_args(argv)
+
+    names: Final[list[str]] = args.cases or list(SUITE)
+    engines: Final[list[str]] = ["walk", "compiled"] if args.engine == "both" else [args.engine]
+    results: Final[dict[str, float]] = run_suite(names, engines, args.rounds)
+    for key, seconds in results.items():
+        print(f"{key:24} {seconds:10.4f} s", file=sys.stderr)
+
+    res: Final[dict[str, Any]] = report(results, args.rounds)
+    if args.json == "-":
+        json.dump(res, sys.stdout, indent=2)
+        print()
+    elif args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(res, fh, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(res, fh, indent=2)
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+        return 0
+
+    baseline: Final[Optional[dict[str, float]]] = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}, nothing to compare with", file=sys.stderr)
+        return 0
+    regressions: Final[list[str]] = compare(results, baseline, args.tolerance)
+    for msg in regressions:
+        print(f"REGRESSION {msg}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
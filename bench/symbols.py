@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 12:27:00 krylon>
+#
+# /data/code/python/krylisp/bench/symbols.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.bench.symbols
+
+Measure the cost of creating and comparing symbols, with interned Atoms
+and with the Atom class as it was before symbols were interned.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import timeit
+from typing import Any, Callable, Final, Union
+
+from krylisp import data
+
+NAMES: Final[list[str]] = [f"symbol-{idx}" for idx in range(100)] + \
+    ["lambda", "macro", "return", "quote", "Lambda", "Return"]
+
+
+class LegacyAtom:
+    """LegacyAtom is the Atom class from before symbols were interned."""
+
+    __slots__ = ['value']
+
+    value: Union[str, int, float]
+
+    def __init__(self, value: Union[str, int, float, 'LegacyAtom']) -> None:
+        if isinstance(value, (int, float)):
+            self.value = value
+        elif isinstance(value, LegacyAtom):
+            self.value = value.value
+        elif data.int_re.match(value) is not None:
+            self.value = int(value)
+        elif data.float_re.match(value) is not None:
+            self.value = float(value)
+        else:
+            self.value = value.lower()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LegacyAtom):
+            return self.value == other.value
+        if isinstance(other, str):
+            return self.value == other.lower()
+        if self.value == 'nil':
+            return data.nullp(other)
+        return False
+
+    def __hash__(self):
+        return self.value.__hash__()
+
+
+def measure(cls: Callable[[str], Any], interned: bool) -> tuple[float, ...]:
+    """Return the time in ns to create a symbol, to compare one to a str, and to a symbol."""
+    atoms: Final[list] = [cls(name) for name in NAMES]
+    lam: Final = cls("lambda")
+    count: Final[int] = 200
+
+    def create():
+        for name in NAMES:
+            cls(name)
+
+    def compare_str():
+        for atom in atoms:
+            _ = atom == "lambda"
+
+    # Interned symbols can be compared by identity, which is what the
+    # interpreter does now.
+    def compare_sym():
+        if interned:
+            for atom in atoms:
+                _ = atom is lam
+        else:
+            for atom in atoms:
+                _ = atom == lam
+
+    per_op: Final[float] = 1e9 / (count * len(NAMES))
+    return tuple(min(timeit.repeat(fn, number=count, repeat=5)) * per_op
+                 for fn in (create, compare_str, compare_sym))
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    before: Final = measure(LegacyAtom, False)
+    after: Final = measure(data.Atom, True)
+    for idx, what in enumerate(("create", "== str", "symbol")):
+        print(f"{what:10} before {before[idx]:7.1f} ns    after {after[idx]:7.1f} ns    "
+              f"{before[idx] / after[idx]:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 11:45:00 krylon>
+#
+# /data/code/python/krylisp/bench/tailcall.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.bench.tailcall
+
+Run a tail-recursive loop over a million iterations with both engines.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import sys
+import time
+from typing import Final
+
+from krylisp import lisp, parser
+
+COUNT_SRC: Final[str] = \
+    "(defun count-down (n acc) (if (= n 0) acc (count-down (- n 1) (+ acc 1))))"
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    count: Final[int] = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    for compiled in (False, True):
+        engine = "compiled" if compiled else "walk"
+        interp = lisp.LispInterpreter(compiled=compiled)
+        interp.eval_expr(parser.parse_string(COUNT_SRC))
+        form = parser.parse_string(f"(count-down {count} 0)")
+        before = time.perf_counter()
+        res = interp.eval_expr(form)
+        delta = time.perf_counter() - before
+        print(f"{engine:8} {res} iterations {delta:8.3f} s    {delta / count * 1e9:8.0f} ns/call")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
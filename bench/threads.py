@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 15:40:00 krylon>
+#
+# /data/code/python/krylisp/bench/threads.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.bench.threads
+
+Compare the memory one interpreter per thread takes to that of contexts
+sharing one frozen global Environment, and measure what giving each
+thread a call stack of its own costs.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import threading
+import time
+import tracemalloc
+from typing import Final
+
+from krylisp import lisp, parser
+from krylisp.bench.dispatch import FIB_SRC
+
+FUNCTIONS: Final[int] = 300
+PRELUDE: Final[str] = FIB_SRC + "".join(f"(defun fn-{idx} (x y) (if (< x y) (+ x (* y {idx})) (- x y)))\n"
+                                        for idx in range(FUNCTIONS))
+
+
+def prelude(interp: lisp.LispInterpreter) -> None:
+    """Define the functions of the prelude in interp."""
+    for form in parser.read(PRELUDE):
+        interp.eval_expr(form)
+
+
+def memory(workers: int, shared: bool) -> int:
+    """Return the bytes allocated for workers interpreters, or for workers contexts if shared is True."""
+    tracemalloc.start()
+    before: Final[int] = tracemalloc.get_traced_memory()[0]
+    keep = []
+    if shared:
+        interp = lisp.LispInterpreter(compiled=True, threadsafe=True)
+        prelude(interp)
+        keep = [interp.context() for _ in range(workers)]
+    else:
+        for _ in range(workers):
+            interp = lisp.LispInterpreter(compiled=True)
+            prelude(interp)
+            keep.append(interp)
+    used: Final[int] = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del keep
+    return used
+
+
+def throughput(threadsafe: bool, threads: int) -> float:
+    """Return how long threads threads take to compute (fib 18) each, in contexts of one interpreter."""
+    interp = lisp.LispInterpreter(compiled=True, threadsafe=threadsafe)
+    prelude(interp)
+    form: Final = parser.parse_string("(fib 18)")
+    # Compile fib before it is measured.
+    interp.eval_expr(parser.parse_string("(fib 2)"))
+    envs: Final[list] = [interp.context() for _ in range(threads)]
+    workers = [threading.Thread(target=interp.eval_expr, args=(form, env)) for env in envs]
+    before: Final[float] = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - before
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    for workers in (1, 4, 16):
+        own = memory(workers, False)
+        shared = memory(workers, True)
+        print(f"{workers:3} workers    interpreters {own // 1024:6} KiB    contexts {shared // 1024:6} KiB")
+    # Without threadsafe, only one thread at a time may evaluate.
+    plain: Final[float] = min(throughput(False, 1) for _ in range(5))
+    for threads in (1, 4):
+        safe = min(throughput(True, threads) for _ in range(5))
+        print(f"{threads:3} threads    threadsafe {safe:7.3f} s    {safe / threads / plain:5.2f}x"
+              " the time of one thread without threadsafe")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 13:10:00 krylon>
+#
+# /data/code/python/krylisp/bench/tracing.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.bench.tracing
+
+Measure what tracing costs the tree walker, with and without a tracer.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from typing import Any, Final, Optional
+
+from krylisp import data, error, lisp, parser
+from krylisp.bench.dispatch import FIB_SRC, best_of
+from krylisp.bench.engines import LOOP_SRC
+from krylisp.tracer import Tracer
+
+ROUNDS: Final[int] = 5
+
+
+class Untraced(lisp.LispInterpreter):
+    """Untraced walks without ever looking at a tracer, as a reference."""
+
+    __slots__ = ()
+
+    def walk(self, expr: Any, env: data.Environment) -> Any:
+        while True:
+            if isinstance(expr, data.ConsCell):
+                res = self.step_list(expr, env)
+                if res.__class__ is lisp.TailCall:
+                    expr = res.expr
+                    env = res.env
+                    continue
+            elif isinstance(expr, data.Atom):
+                res = self.eval_atom(expr, env)
+            elif isinstance(expr, (str, int, float)):
+                res = expr
+            elif expr is None:
+                res = data.EMPTY_LIST
+            else:
+                raise error.LispError(f"Unexpected type for expression ({expr.__class__}): {expr}")
+            return res
+
+
+def measure(interp: lisp.LispInterpreter, src: str, setup: str,
+            tracer: Optional[Tracer] = None) -> float:
+    """Return the best time for evaluating src in interp with tracer installed."""
+    if setup != "":
+        interp.eval_expr(parser.parse_string(setup))
+    interp.tracer = tracer
+    return best_of(ROUNDS, interp.eval_expr, parser.parse_string(src))
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    cases: Final[list[tuple[str, str, str]]] = [
+        ("numeric do loop", LOOP_SRC, ""),
+        ("(fib 18)", "(fib 18)", FIB_SRC),
+    ]
+    for title, src, setup in cases:
+        bare = measure(Untraced(), src, setup)
+        absent = measure(lisp.LispInterpreter(), src, setup)
+        noop = measure(lisp.LispInterpreter(), src, setup, Tracer())
+        print(f"{title:16} no check {bare:7.3f} s    no tracer {absent:7.3f} s ({absent / bare:5.2f}x)"
+              f"    no-op tracer {noop:7.3f} s ({noop / bare:5.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
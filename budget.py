@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 17:25:00 krylon>
+#
+# /data/code/python/krylisp/budget.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.budget
+
+Budgets bound how many steps an evaluation may take, how long it may
+run and how much memory it may allocate. The Scheduler uses them to
+share the interpreter between many evaluations, a slice at a time.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import sys
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Final, Optional
+
+from krylisp import data, error
+
+if TYPE_CHECKING:
+    from krylisp.lisp import LispInterpreter
+
+# How many steps may pass between two looks at the clock and the allocator.
+CHECK_INTERVAL: Final[int] = 256
+# The steps a Scheduler gives each Task per slice, unless told otherwise.
+SLICE_FUEL: Final[int] = 1000
+
+# Samstag, 17. 10. 2026
+# A step is a call to a Lisp function, or one iteration of a do loop; both
+# engines count them where they already do the work for it, so code that
+# runs without a Budget only pays for looking whether there is one. Fuel is
+# counted exactly, but the clock and the allocator are only looked at every
+# CHECK_INTERVAL steps. Memory is counted in blocks allocated by the Python
+# allocator since the Budget was filled, for the whole process, which is a
+# cheap approximation, not an account.
+#
+# An evaluation that runs out of its Budget raises BudgetExceeded, unless
+# the Budget has a pause function. Then it calls that, and carries on once
+# the pause function returns, so whoever called it can hand out a new
+# Budget in the meantime. The Scheduler runs each Task in a thread of its
+# own, and lets only one of them run at a time: a Task pauses by handing
+# control back to the Scheduler and waiting for its next turn.
+
+
+class Budget:
+    """Budget limits the steps, the wall-clock time and the allocations of an evaluation."""
+
+    __slots__ = ['fuel', 'deadline', 'allocation', 'blocks', 'period', 'countdown', 'steps', 'pause']
+
+    fuel: Optional[int]
+    deadline: Optional[float]
+    allocation: Optional[int]
+    blocks: int
+    period: int
+    countdown: int
+    steps: int
+    pause: Optional[Callable[['Budget', str], None]]
+
+    def __init__(self, fuel: Optional[int] = None, timeout: Optional[float] = None,
+                 allocation: Optional[int] = None,
+                 pause: Optional[Callable[['Budget', str], None]] = None) -> None:
+        # The number of steps taken under this Budget, across refills.
+        self.steps = 0
+        self.pause = pause
+        self.refill(fuel, timeout, allocation)
+
+    def refill(self, fuel: Optional[int] = None, timeout: Optional[float] = None,
+               allocation: Optional[int] = None) -> None:
+        """
+        Allow fuel more steps, timeout more seconds and allocation more blocks from now on.
+
+        A limit that is None is not checked.
+        """
+        for name, limit in (("fuel", fuel), ("timeout", timeout), ("allocation", allocation)):
+            if limit is not None and limit < 0:
+                raise error.LispError(f"The {name} of a budget must not be negative, not {limit}")
+        self.fuel = fuel
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.allocation = allocation
+        self.blocks = sys.getallocatedblocks()
+        self.period = self.countdown = CHECK_INTERVAL if fuel is None else min(CHECK_INTERVAL, fuel)
+
+    def tick(self) -> None:
+        """Count one step."""
+        self.countdown -= 1
+        if self.countdown < 0:
+            self.check()
+
+    def check(self) -> None:
+        """Charge the steps counted since the last check, and see if any limit has been exceeded."""
+        used: Final[int] = self.period - self.countdown
+        self.steps += used
+        if self.fuel is not None:
+            self.fuel -= used
+            if self.fuel < 0:
+                self.exhausted("fuel", "Evaluation ran out of fuel")
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.exhausted("deadline", "Evaluation ran past its deadline")
+        if self.allocation is not None and sys.getallocatedblocks() - self.blocks > self.allocation:
+            self.exhausted("allocation", f"Evaluation allocated more than {self.allocation} blocks")
+        if self.countdown < 0:
+            self.period = self.countdown = \
+                CHECK_INTERVAL if self.fuel is None else max(min(CHECK_INTERVAL, self.fuel), 0)
+
+    def exhausted(self, limit: str, message: str) -> None:
+        """Raise BudgetExceeded for limit, or pause until the Budget has been refilled."""
+        if self.pause is None:
+            raise error.BudgetExceeded(limit, message)
+        self.pause(self, limit)
+
+
+class Task:  # pylint: disable-msg=R0902
+    """Task is one evaluation run by a Scheduler."""
+
+    __slots__ = ['interp', 'expr', 'env', 'fuel', 'timeout', 'budget', 'thread', 'turn', 'parked',
+                 'started', 'done', 'cancelled', 'slices', 'value', 'error']
+
+    def __init__(self, interp: 'LispInterpreter', expr: Any, env: Optional[data.Environment],
+                 fuel: Optional[int], timeout: Optional[float]) -> None:
+        self.interp = interp
+        self.expr = expr
+        self.env = env
+        # The limits for all slices of the Task together.
+        self.fuel = fuel
+        self.timeout = timeout
+        self.budget = Budget(pause=self.wait)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        # The Scheduler sets turn to let the Task run; the Task sets parked
+        # when it has paused or finished.
+        self.turn = threading.Event()
+        self.parked = threading.Event()
+        self.started: Optional[float] = None
+        self.done = False
+        # The limit and message the Task is cancelled with.
+        self.cancelled: Optional[tuple[str, str]] = None
+        self.slices = 0
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        """Evaluate the expression. This is the thread of the Task."""
+        self.turn.wait()
+        self.turn.clear()
+        try:
+            self.value = self.interp.eval_budget(self.expr, self.budget, self.env)
+        except Exception as err:  # pylint: disable-msg=W0703
+            self.error = err
+        finally:
+            self.done = True
+            self.parked.set()
+
+    def wait(self, _budget: Budget, _limit: str) -> None:
+        """Hand control back to the Scheduler until the next turn. This is the pause function of the Budget."""
+        self.parked.set()
+        self.turn.wait()
+        self.turn.clear()
+        if self.cancelled is not None:
+            raise error.BudgetExceeded(*self.cancelled)
+
+    def resume(self, fuel: Optional[int], timeout: Optional[float], allocation: Optional[int]) -> None:
+        """Let the Task run with a new Budget until it pauses or finishes."""
+        self.parked.clear()
+        self.budget.refill(fuel, timeout, allocation)
+        if self.started is None:
+            self.started = time.monotonic()
+            self.thread.start()
+        self.slices += 1
+        self.turn.set()
+        self.parked.wait()
+
+    def cancel(self, limit: str = "cancelled", message: str = "Evaluation was cancelled") -> None:
+        """Make the Task fail with BudgetExceeded for limit."""
+        self.cancelled = (limit, message)
+        if self.started is None:
+            self.error = error.BudgetExceeded(limit, message)
+            self.done = True
+            return
+        self.parked.clear()
+        self.turn.set()
+        self.parked.wait()
+
+    def check(self) -> None:
+        """Cancel the Task if it has used up the fuel or the time it was given for all its slices."""
+        if self.fuel is not None and self.budget.steps >= self.fuel:
+            self.cancel("fuel", f"Task ran out of its {self.fuel} steps")
+        elif self.timeout is not None and self.started is not None \
+                and time.monotonic() - self.started > self.timeout:
+            self.cancel("deadline", f"Task ran longer than {self.timeout} s")
+
+
+class Scheduler:
+    """
+    Scheduler time-slices many evaluations, resuming each with a new Budget in turn.
+
+    Each Task needs an interpreter of its own, since the Budget and the
+    call stack belong to the interpreter.
+    """
+
+    __slots__ = ['fuel', 'timeout', 'allocation', 'queue']
+
+    def __init__(self, fuel: Optional[int] = SLICE_FUEL, timeout: Optional[float] = None,
+                 allocation: Optional[int] = None) -> None:
+        if fuel is None and timeout is None:
+            raise error.LispError("A slice needs a limit on either its fuel or its time")
+        # The Budget of one slice.
+        self.fuel = fuel
+        self.timeout = timeout
+        self.allocation = allocation
+        self.queue: deque[Task] = deque()
+
+    def spawn(self, interp: 'LispInterpreter', expr: Any, env: Optional[data.Environment] = None,
+              fuel: Optional[int] = None, timeout: Optional[float] = None) -> Task:
+        """
+        Add a Task that evaluates expr in env with interp, and return it.
+
+        fuel and timeout limit the steps and the seconds of all slices of
+        the Task together; a Task that exceeds them fails with
+        BudgetExceeded.
+        """
+        if any(task.interp is interp for task in self.queue):
+            raise error.LispError("Another task is already running on this interpreter")
+        task: Final[Task] = Task(interp, expr, env, fuel, timeout)
+        self.queue.append(task)
+        return task
+
+    def step(self) -> Optional[Task]:
+        """Run the next Task for one slice, and return it, or None if there is nothing left to run."""
+        if not self.queue:
+            return None
+        task: Final[Task] = self.queue.popleft()
+        task.resume(self.fuel, self.timeout, self.allocation)
+        if not task.done:
+            task.check()
+        if not task.done:
+            self.queue.append(task)
+        return task
+
+    def cancel(self, task: Task) -> None:
+        """Stop task, which then fails with BudgetExceeded."""
+        if task in self.queue:
+            self.queue.remove(task)
+            task.cancel()
+
+    def run(self) -> None:
+        """Run the Tasks until all of them have finished."""
+        while self.step() is not None:
+            pass
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-# Time-stamp: <2025-03-08 16:00:14 krylon>
+# Time-stamp: <2026-10-17 14:35:00 krylon>
 #
 # /data/code/python/krylisp/common.py
 # created on 17. 05. 2024
@@ -85,6 +85,14 @@ class Path:
         """Return the path of the history file for the REPL"""
         return os.path.join(self.__base, "repl.history")
 
+    def baseline(self) -> str:
+        """Return the path of the benchmark results to compare new ones with"""
+        return os.path.join(self.__base, "bench-baseline.json")
+
+    def cache(self) -> str:
+        """Return the path of the folder the parsed forms of loaded files are cached in"""
+        return os.path.join(self.__base, "cache")
+
 
 path: Path = Path(os.path.expanduser(f"~/.{APP_NAME.lower()}.d"))
 
@@ -0,0 +1,806 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-18 03:20:00 krylon>
+#
+# /data/code/python/krylisp/compiler.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.compiler
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from typing import Any, Callable, Final, Optional
+
+from krylisp import data, error, lisp
+from krylisp.containers import SELF_EVALUATING
+from krylisp.streams import ConsStream, Promise
+
+# Samstag, 17. 10. 2026
+# eval_list looks at the same ConsCells over and over again, every time a
+# loop body or function body is executed, and every time it has to figure
+# out anew what kind of form it is looking at. The Compiler does that once
+# and turns each node into a Python closure that takes the Environment and
+# returns the value of the node. Special forms, builtins and the number of
+# arguments are known when the closure is created.
+#
+# Variables are resolved at compile time, too: Every let, do and function
+# call creates a data.Frame whose variables live in a list of slots, and a
+# reference to a local variable becomes a pair of how many Frames to go up
+# and which slot to read. Variables that are not local to any Frame go
+# straight to the dict of the global Environment.
+#
+# Expressions in tail position are compiled with tail set to True. A call
+# to a Function in tail position does not call the Function, but returns a
+# TailCall, and Lambda.invoke keeps calling Functions until it gets a
+# value, so tail recursion runs in constant Python stack.
+
+Code = Callable[[data.Environment], Any]
+FormCompiler = Callable[['Compiler', data.ConsCell, 'Scope', bool], Code]
+
+COMPILERS: Final[dict[str, FormCompiler]] = {}
+
+# How many lambda lists that were not compiled the Compiler keeps the
+# Lambdas of, see Compiler.call_lambda.
+LAMBDA_CACHE_SIZE: Final[int] = 1024
+
+
+def compiles(*names: str) -> Callable:
+    """Register the decorated function as the compiler for the given special forms."""
+    def register(fn: FormCompiler) -> FormCompiler:
+        for name in names:
+            COMPILERS[name] = fn
+        return fn
+    return register
+
+
+def constant(value: Any) -> Code:
+    """Return a Code that always returns value."""
+    return lambda _env: value
+
+
+def sequence(codes: list[Code]) -> Code:
+    """Return a Code that runs codes in order and returns the value of the last one."""
+    if len(codes) == 0:
+        return constant(data.EMPTY_LIST)
+    if len(codes) == 1:
+        return codes[0]
+
+    init: Final[tuple[Code, ...]] = tuple(codes[:-1])
+    last: Final[Code] = codes[-1]
+
+    def run(env):
+        for code in init:
+            code(env)
+        return last(env)
+    return run
+
+
+def forms(lst: Any) -> list:
+    """Return the elements of the Lisp list lst as a Python list."""
+    res = []
+    node = lst
+    while node is not None and not data.nullp(node):
+        res.append(node.head)
+        node = node.tail
+    return res
+
+
+def symbol_name(sym: Any) -> str:
+    """Return the name of the symbol sym."""
+    if isinstance(sym, data.Atom) and isinstance(sym.value, str):
+        return sym.value
+    if isinstance(sym, str):
+        return sym
+    raise error.LispError(f"{sym} is not a symbol!")
+
+
+def up(env: data.Environment, depth: int) -> data.Environment:
+    """Return the Environment depth levels above env."""
+    for _ in range(depth):
+        env = env.parent
+    return env
+
+
+def local_ref(depth: int, slot: int) -> Code:
+    """Return a Code that reads a local variable."""
+    match depth:
+        case 0:
+            return lambda env: env.slots[slot]
+        case 1:
+            return lambda env: env.parent.slots[slot]
+        case 2:
+            return lambda env: env.parent.parent.slots[slot]
+        case _:
+            return lambda env: up(env, depth).slots[slot]
+
+
+def local_set(depth: int, slot: int, value: Code) -> Code:
+    """Return a Code that sets a local variable and returns the new value."""
+    def assign(env):
+        val = value(env)
+        up(env, depth).slots[slot] = val
+        return val
+    return assign
+
+
+class TailCall:  # pylint: disable-msg=R0903
+    """TailCall is returned by compiled code in tail position to have fn called with args by the form call."""
+
+    __slots__ = ['fn', 'args', 'call']
+
+    fn: data.Function
+    args: list
+    call: Any
+
+    def __init__(self, fn: data.Function, args: list, call: Any) -> None:
+        self.fn = fn
+        self.args = args
+        self.call = call
+
+
+class Scope:
+    """
+    A Scope is the compile-time picture of a Frame.
+
+    It knows the names of the variables in the Frame, and at which slot
+    each of them lives. The outermost Scope stands for the Environment the
+    compiled code is run in; if that is the global Environment, genv is
+    that Environment and table is its dict. Otherwise both are None, and
+    variables that are not local to any Frame are looked up by name at
+    runtime.
+    """
+
+    __slots__ = ['index', 'parent', 'table', 'genv']
+
+    index: dict[str, int]
+    parent: Optional['Scope']
+    table: Optional[dict]
+    genv: Optional[data.Environment]
+
+    def __init__(self, names, parent: Optional['Scope'] = None,
+                 genv: Optional[data.Environment] = None) -> None:
+        self.index = {name: idx for idx, name in enumerate(names)}
+        self.parent = parent
+        self.genv = genv
+        self.table = genv.data if genv is not None else None
+
+    def resolve(self, name: str) -> tuple[int, Optional[int]]:
+        """
+        Find the variable name.
+
+        Return the number of Frames to go up and the slot of the variable. If
+        the variable is not local, the slot is None, and the depth is that of
+        the outermost Scope.
+        """
+        depth = 0
+        scope = self
+        while scope.parent is not None:
+            idx = scope.index.get(name)
+            if idx is not None:
+                return depth, idx
+            scope = scope.parent
+            depth += 1
+        return depth, None
+
+    def root(self) -> 'Scope':
+        """Return the outermost Scope."""
+        scope = self
+        while scope.parent is not None:
+            scope = scope.parent
+        return scope
+
+
+class Lambda:
+    """
+    Lambda holds everything that is needed to call the Functions created from one lambda list.
+
+    The body is compiled the first time one of them is called.
+    """
+
+    __slots__ = ['comp', 'names', 'rest', 'scope', 'body', 'code', 'calls', 'interp']
+
+    comp: 'Compiler'
+    names: tuple[str, ...]
+    rest: Optional[str]
+    scope: Scope
+    body: Any
+    code: Optional[Code]
+
+    def __init__(self, comp: 'Compiler', formals: Any, body: Any, parent: Scope) -> None:
+        self.comp = comp
+        self.names, self.rest = parse_formals(formals)
+        self.scope = Scope(self.names + ((self.rest,) if self.rest is not None else ()), parent)
+        self.body = body
+        self.code = None
+        self.calls: list = comp.interp.calls
+        self.interp: 'lisp.LispInterpreter' = comp.interp
+
+    def invoke(self, env: data.Environment, args: list, call: Any = None) -> Any:
+        """
+        Run the body with args bound to the parameters, in a Frame below env, and return its value.
+
+        call is pushed onto the call stack while the body runs, and replaced
+        by the call of each tail call the body makes.
+        """
+        calls: Final[list] = self.calls
+        calls.append(call)
+        try:
+            res = self.enter(env, args)
+            while res.__class__ is TailCall:
+                calls[-1] = res.call
+                fn = res.fn
+                res = fn.code.enter(fn.env, res.args)
+            return res
+        finally:
+            calls.pop()
+
+    def enter(self, env: data.Environment, args: list) -> Any:
+        """Run the body with args bound to the parameters, in a Frame below env, up to its tail call."""
+        budget: Final[Any] = self.interp.budget
+        if budget is not None:
+            # Budget.tick, inlined.
+            budget.countdown -= 1
+            if budget.countdown < 0:
+                budget.check()
+        code = self.code
+        if code is None:
+            code = self.code = self.comp.compile_body(self.body, self.scope, True)
+
+        count: Final[int] = len(self.names)
+        if len(args) < count:
+            raise error.LispError(
+                "arg list is shorter than the list of formal arguments!")
+        if self.rest is not None:
+            args = args[:count] + [data.ConsCell.fromList(args[count:])]
+        elif len(args) > count:
+            args = args[:count]
+        return code(data.Frame(env, self.scope.index, args))
+
+
+class Compiler:
+    """
+    Compiler turns Lisp forms into nested closures.
+
+    A compiled form is called with an Environment and returns the value
+    of the form. Unlike eval_list, the Compiler looks at the complete form
+    before any of it is evaluated, so malformed special forms are reported
+    when they are compiled, not when they are executed.
+
+    Compiled code is lexically scoped: Functions see the variables of the
+    Environment they were created in, not those of their caller.
+    """
+
+    __slots__ = ['interp', 'lambdas']
+
+    interp: 'lisp.LispInterpreter'
+    lambdas: dict[int, tuple[data.ConsCell, Lambda]]
+
+    def __init__(self, interp: 'lisp.LispInterpreter') -> None:
+        self.interp = interp
+        # Lambdas for lambda lists that are called without having been
+        # compiled, e.g. quoted ones, keyed by the id of the list. The list
+        # is stored alongside, so an id that is reused by a new list is not
+        # mistaken for the old one. At most LAMBDA_CACHE_SIZE are kept, the
+        # oldest is dropped to make room for a new one.
+        self.lambdas = {}
+
+    def compile_toplevel(self, expr: Any, env: data.Environment) -> Code:
+        """Compile expr to be run in env."""
+        return self.compile(expr, self.scope_of(env))
+
+    def scope_of(self, env: data.Environment) -> Scope:
+        """Return the Scope that describes env."""
+        if isinstance(env, data.Frame):
+            return Scope(sorted(env.index, key=env.index.__getitem__), self.scope_of(env.parent))
+        return Scope((), None, env if env.parent is None else None)
+
+    def compile(self, expr: Any, scope: Scope, tail: bool = False) -> Code:
+        """
+        Compile an expression of arbitrary kind or complexity.
+
+        If tail is True, the expression is in tail position in a function
+        body, and the resulting Code may return a TailCall.
+        """
+        if isinstance(expr, data.ConsCell):
+            return self.compile_list(expr, scope, tail)
+        if isinstance(expr, data.Atom):
+            return self.compile_atom(expr, scope)
+        if isinstance(expr, (str, int, float)):
+            return constant(expr)
+        if expr is None:
+            return constant(data.EMPTY_LIST)
+        if isinstance(expr, SELF_EVALUATING):
+            return constant(expr)
+        raise error.LispError(f"Unexpected type for expression ({expr.__class__}): {expr}")
+
+    def compile_atom(self, atom: data.Atom, scope: Scope) -> Code:
+        """Compile an Atom."""
+        val = atom.value
+        if isinstance(val, (int, float)):
+            return constant(val)
+        if val == 'nil':
+            return constant(data.EMPTY_LIST)
+        if val == 't':
+            return constant(data.Atom('t'))
+        if val.startswith(":"):
+            return constant(atom)
+        return self.compile_ref(val, scope)
+
+    def compile_ref(self, name: str, scope: Scope) -> Code:
+        """Compile a reference to the variable name."""
+        depth, slot = scope.resolve(name)
+        if slot is not None:
+            return local_ref(depth, slot)
+
+        table: Final[Optional[dict]] = scope.root().table
+        if table is not None:
+            def global_ref(_env):
+                try:
+                    return table[name]
+                except KeyError as err:
+                    raise error.LispError(f"No such variable in environment: {name}") from err
+            return global_ref
+
+        def dynamic_ref(env):
+            return up(env, depth)[name]
+        return dynamic_ref
+
+    def compile_set(self, sym: data.Atom, value: Code, scope: Scope) -> Code:
+        """Compile setting the variable sym to the result of value."""
+        name: Final[str] = symbol_name(sym)
+        depth, slot = scope.resolve(name)
+        if slot is not None:
+            return local_set(depth, slot, value)
+
+        root: Final[Scope] = scope.root()
+        table: Final[Optional[dict]] = root.table
+        if table is not None:
+            genv: Final[data.Environment] = root.genv
+
+            def global_set(env):
+                val = value(env)
+                genv.set_global(name, val)
+                return val
+            return global_set
+
+        def dynamic_set(env):
+            val = value(env)
+            up(env, depth)[name] = val
+            return val
+        return dynamic_set
+
+    def compile_list(self, lst: data.ConsCell, scope: Scope, tail: bool = False) -> Code:
+        """Compile a list, i.e. a special form or a function call."""
+        if data.nullp(lst):
+            return constant(data.EMPTY_LIST)
+
+        head = lst.head
+        if isinstance(head, data.Atom) and isinstance(head.value, str):
+            name: Final[str] = head.value
+            handler = self.interp.forms.get(name)
+            if handler is not None:
+                fn = self.interp.builtins.get(name)
+                if fn is not None:
+                    return self.compile_builtin(fn, lst, scope)
+                form_compiler = COMPILERS.get(name)
+                if form_compiler is not None and handler is lisp.SPECIAL_FORMS.get(name):
+                    return form_compiler(self, lst, scope, tail)
+                interp: Final[lisp.LispInterpreter] = self.interp
+
+                def special(env):
+                    res = handler(interp, lst, env)
+                    if res.__class__ is lisp.TailCall:
+                        if not res.pushed:
+                            return interp.eval_expr(res.expr, res.env)
+                        try:
+                            return interp.eval_expr(res.expr, res.env)
+                        finally:
+                            interp.calls.pop()
+                    return res
+                return special
+        return self.compile_call(lst, scope, tail)
+
+    def compile_builtin(self, fn: Callable[..., Any], lst: data.ConsCell, scope: Scope) -> Code:  # pylint: disable-msg=R0911
+        """Compile a call to a builtin function."""
+        arg_forms: Final[list] = forms(lst.tail)
+        args: Final[list[Code]] = [self.compile(x, scope) for x in arg_forms]
+        fn = lisp.SPECIALIZED.get((fn, len(args)), fn)
+        match len(args):
+            case 0:
+                return lambda env: fn()
+            case 1:
+                a = args[0]
+                return lambda env: fn(a(env))
+            case 2:
+                a, b = args
+                # Numbers are common enough as arguments to be worth not
+                # calling a closure for.
+                if isinstance(arg_forms[1], (int, float)):
+                    k = arg_forms[1]
+                    return lambda env: fn(a(env), k)
+                if isinstance(arg_forms[0], (int, float)):
+                    k = arg_forms[0]
+                    return lambda env: fn(k, b(env))
+                return lambda env: fn(a(env), b(env))
+            case 3:
+                a, b, c = args
+                return lambda env: fn(a(env), b(env), c(env))
+            case _:
+                return lambda env: fn(*[arg(env) for arg in args])
+
+    def compile_call(self, lst: data.ConsCell, scope: Scope, tail: bool = False) -> Code:
+        """Compile a call to a function or macro."""
+        op_code: Final[Code] = self.compile(lst.head, scope)
+        arg_codes: Final[tuple[Code, ...]] = tuple(self.compile(x, scope) for x in forms(lst.tail))
+        # The macro this call site was last expanded with, and the compiled
+        # expansion. Running the compiled expansion again counts as a hit in
+        # the interpreter's MacroCache.
+        expansion: dict[str, Any] = {}
+        macros: Final[lisp.MacroCache] = self.interp.macros
+        calls: Final[list] = self.interp.calls
+
+        def call(env):
+            op = op_code(env)
+            if op is expansion.get('macro'):
+                macros.hits += 1
+                calls.append(lst)
+                try:
+                    return expansion['code'](env)
+                finally:
+                    calls.pop()
+            if isinstance(op, data.Function):
+                if tail and op.code.__class__ is Lambda:
+                    return TailCall(op, [arg(env) for arg in arg_codes], lst)
+                return op.code.invoke(op.env, [arg(env) for arg in arg_codes], lst)
+            if isinstance(op, data.ConsCell) and isinstance(op.head, data.Atom):
+                if op.head is lisp.LAMBDA:
+                    return self.call_lambda(op, [arg(env) for arg in arg_codes], env, lst)
+                if op.head is lisp.MACRO:
+                    calls.append(lst)
+                    try:
+                        expansion['code'] = self.compile(self.interp.macroexpand(op, lst, env), scope, tail)
+                        expansion['macro'] = op
+                        return expansion['code'](env)
+                    finally:
+                        calls.pop()
+            return lst
+        return call
+
+    def compile_body(self, body: Any, scope: Scope, tail: bool = False) -> Code:
+        """Compile a function body, which ends after the first top-level return form."""
+        exprs = forms(body)
+        for idx, expr in enumerate(exprs):
+            if isinstance(expr, data.ConsCell) and expr.car() == 'return':
+                exprs = exprs[:idx+1]
+                break
+        return self.compile_sequence(exprs, scope, tail)
+
+    def compile_sequence(self, exprs: list, scope: Scope, tail: bool = False) -> Code:
+        """Compile a list of expressions to be evaluated in order, the last one in tail position."""
+        if len(exprs) == 0:
+            return constant(data.EMPTY_LIST)
+        return sequence([self.compile(x, scope) for x in exprs[:-1]] +
+                        [self.compile(exprs[-1], scope, tail)])
+
+    def call_lambda(self, op: data.ConsCell, args: list, env: data.Environment, call: Any = None) -> Any:
+        """
+        Call the lambda list op with the evaluated arguments args, from the form call.
+
+        A lambda list that was not created by compiled code, e.g. a quoted
+        one, does not know where it was created, so its free variables are
+        looked up by name, starting at the caller.
+        """
+        entry = self.lambdas.get(id(op))
+        if entry is None or entry[0] is not op:
+            entry = (op, Lambda(self, op[1], op.tail.tail, Scope(())))
+            lambdas: Final[dict] = self.lambdas
+            if len(lambdas) >= LAMBDA_CACHE_SIZE:
+                try:
+                    del lambdas[next(iter(lambdas))]
+                except (KeyError, StopIteration, RuntimeError):
+                    # Another thread has changed them meanwhile.
+                    pass
+            lambdas[id(op)] = entry
+        return entry[1].invoke(env, args, call)
+
+    def compile_template(self, expr: Any, scope: Scope) -> Code:
+        """Compile the template of a backquote expression."""
+        if not isinstance(expr, data.ConsCell):
+            if isinstance(expr, (data.Atom, str, int, float)):
+                return constant(expr)
+            raise error.LispError(
+                f"Invalid type for backquote expression: {expr.__class__} - {expr}")
+
+        # Each part is a pair of a flag that says if the value is spliced
+        # into the result, and the Code to compute the value.
+        parts: Final[list[tuple[bool, Code]]] = []
+        for subexpr in expr:
+            if isinstance(subexpr, data.ConsCell):
+                if subexpr.car() == 'comma-at':
+                    parts.append((True, self.compile_splice(subexpr[1], scope)))
+                elif subexpr.car() == 'comma':
+                    if len(subexpr) != 2:
+                        raise error.LispError("A comma un-quotes a single item")
+                    parts.append((False, self.compile(subexpr[1], scope)))
+                else:
+                    parts.append((False, self.compile_template(subexpr, scope)))
+            else:
+                parts.append((False, constant(subexpr)))
+
+        def build(env):
+            items = []
+            for splice, code in parts:
+                if splice:
+                    items.extend(code(env))
+                else:
+                    items.append(code(env))
+            return data.ConsCell.fromList(items)
+        return build
+
+    def compile_splice(self, expr: Any, scope: Scope) -> Code:
+        """Compile the argument of a ,@ inside a backquote template."""
+        code: Final[Code] = self.compile(expr, scope)
+        interp: Final[lisp.LispInterpreter] = self.interp
+
+        def splice(env):
+            res = code(env)
+            if isinstance(res, data.Atom):
+                return [interp.eval_atom(res, env) if res in env else res]
+            if isinstance(res, data.ConsCell) and not data.nullp(res):
+                return list(res)
+            return []
+        return splice
+
+
+def parse_formals(formals: Any) -> tuple[tuple[str, ...], Optional[str]]:
+    """Return the names of the positional parameters and of the &rest parameter, if any."""
+    names = []
+    rest = None
+    params = forms(formals)
+    for idx, param in enumerate(params):
+        if param == '&rest':
+            rest = symbol_name(params[idx+1])
+            break
+        names.append(symbol_name(param))
+    return tuple(names), rest
+
+
+# Special forms
+
+@compiles('if')
+def compile_if(comp: Compiler, lst: data.ConsCell, scope: Scope, tail: bool) -> Code:
+    """(if condition then-part else-part)"""
+    if len(lst) != 4:
+        raise error.LispError(
+            "'if' needs exactly three parameters: condition, then-part, else-part!")
+    cond: Final[Code] = comp.compile(lst[1], scope)
+    then_part: Final[Code] = comp.compile(lst[2], scope, tail)
+    else_part: Final[Code] = comp.compile(lst[3], scope, tail)
+    nullp = data.nullp
+
+    def run(env):
+        if nullp(cond(env)):
+            return else_part(env)
+        return then_part(env)
+    return run
+
+
+@compiles('return')
+def compile_return(comp: Compiler, lst: data.ConsCell, scope: Scope, tail: bool) -> Code:
+    """(return value)"""
+    return comp.compile(lst[1], scope, tail)
+
+
+@compiles('and')
+def compile_and(comp: Compiler, lst: data.ConsCell, scope: Scope, tail: bool) -> Code:
+    """(and expr...)"""
+    exprs: Final[list] = forms(lst.tail)
+    if len(exprs) == 0:
+        return constant(data.EMPTY_LIST)
+    codes: Final[tuple[Code, ...]] = tuple(comp.compile(x, scope) for x in exprs[:-1])
+    last: Final[Code] = comp.compile(exprs[-1], scope, tail)
+    nullp = data.nullp
+
+    def run(env):
+        for code in codes:
+            if nullp(code(env)):
+                return data.EMPTY_LIST
+        return last(env)
+    return run
+
+
+@compiles('or')
+def compile_or(comp: Compiler, lst: data.ConsCell, scope: Scope, tail: bool) -> Code:
+    """(or expr...)"""
+    exprs: Final[list] = forms(lst.tail)
+    if len(exprs) == 0:
+        return constant(data.EMPTY_LIST)
+    codes: Final[tuple[Code, ...]] = tuple(comp.compile(x, scope) for x in exprs[:-1])
+    last: Final[Code] = comp.compile(exprs[-1], scope, tail)
+    nullp = data.nullp
+
+    def run(env):
+        for code in codes:
+            val = code(env)
+            if not nullp(val):
+                return val
+        return last(env)
+    return run
+
+
+@compiles('quote')
+def compile_quote(_comp: Compiler, lst: data.ConsCell, _scope: Scope, _tail: bool) -> Code:
+    """(quote expr)"""
+    return constant(lst[1])
+
+
+@compiles('delay')
+def compile_delay(comp: Compiler, lst: data.ConsCell, scope: Scope, _tail: bool) -> Code:
+    """(delay expr)"""
+    if len(lst) != 2:
+        raise error.LispError("'delay' needs exactly one parameter!")
+    code: Final[Code] = comp.compile(lst[1], scope)
+
+    def run(env):
+        return Promise(lambda: code(env))
+    return run
+
+
+@compiles('cons-stream')
+def compile_cons_stream(comp: Compiler, lst: data.ConsCell, scope: Scope, _tail: bool) -> Code:
+    """(cons-stream head tail)"""
+    if len(lst) != 3:
+        raise error.LispError("'cons-stream' needs exactly two parameters: head, tail!")
+    head: Final[Code] = comp.compile(lst[1], scope)
+    rest: Final[Code] = comp.compile(lst[2], scope)
+
+    def run(env):
+        return ConsStream(head(env), Promise(lambda: rest(env)))
+    return run
+
+
+@compiles('lambda')
+def compile_lambda(comp: Compiler, lst: data.ConsCell, scope: Scope, _tail: bool) -> Code:
+    """(lambda args body...)"""
+    formals: Final[Any] = lst[1]
+    body: Final[Any] = lst.tail.tail
+    lam: Final[Lambda] = Lambda(comp, formals, body, scope)
+
+    def run(env):
+        return data.Function(formals, body, env, code=lam)
+    return run
+
+
+@compiles('defun')
+def compile_defun(comp: Compiler, lst: data.ConsCell, scope: Scope, _tail: bool) -> Code:
+    """(defun name args body...)"""
+    if len(lst.cdr()) < 3:
+        raise error.LispError(
+            "A Function definition needs at least three arguments (name, arglist, body)")
+    name: Final[Any] = lst[1]
+    formals: Final[Any] = lst[2]
+    body: Final[Any] = lst.tail.tail.tail
+    lam: Final[Lambda] = Lambda(comp, formals, body, scope)
+
+    def run(env):
+        comp.interp.define_function(name, data.Function(formals, body, env, symbol_name(name), lam), env)
+        return name
+    return run
+
+
+@compiles('defmacro')
+def compile_defmacro(comp: Compiler, lst: data.ConsCell, _scope: Scope, _tail: bool) -> Code:
+    """(defmacro name args body...)"""
+    if len(lst.cdr()) < 3:
+        raise error.LispError(
+            "A Macro definition needs at least three arguments (name, arglist, body)")
+    name: Final[Any] = lst[1]
+    definition: Final[data.ConsCell] = lst.cdr().cdr()
+
+    def run(env):
+        comp.interp.define_macro(name, definition, env)
+        return name
+    return run
+
+
+@compiles('backquote')
+def compile_backquote(comp: Compiler, lst: data.ConsCell, scope: Scope, _tail: bool) -> Code:
+    """(backquote template)"""
+    return comp.compile_template(lst[1], scope)
+
+
+@compiles('let')
+def compile_let(comp: Compiler, lst: data.ConsCell, scope: Scope, tail: bool) -> Code:
+    """(let ((var value)...) body...)"""
+    bindings: Final[list] = forms(lst[1])
+    values: Final[tuple[Code, ...]] = tuple(comp.compile(binding[1], scope) for binding in bindings)
+    let_scope: Final[Scope] = Scope([symbol_name(binding[0]) for binding in bindings], scope)
+    body: Final[Code] = comp.compile_sequence(forms(lst.tail.tail), let_scope, tail)
+    index: Final[dict[str, int]] = let_scope.index
+
+    def run(env):
+        return body(data.Frame(env, index, [value(env) for value in values]))
+    return run
+
+
+@compiles('apply')
+def compile_apply(comp: Compiler, lst: data.ConsCell, scope: Scope, tail: bool) -> Code:
+    """(apply function arglist)"""
+    if len(lst) != 3:
+        raise error.LispError("Apply takes exactly two arguments (function and arglist)!")
+    args: Final[Code] = comp.compile(lst[2], scope)
+    op = lst[1]
+    if isinstance(op, data.Atom) and op.value in comp.interp.builtins:
+        fn: Final[Callable[..., Any]] = comp.interp.builtins[op.value]
+        return lambda env: fn(*forms(args(env)))
+    op_code: Final[Code] = comp.compile(op, scope)
+
+    def run(env):
+        fn = op_code(env)
+        values = forms(args(env))
+        if isinstance(fn, data.Function):
+            if tail and fn.code.__class__ is Lambda:
+                return TailCall(fn, values, lst)
+            return fn.code.invoke(fn.env, values, lst)
+        if isinstance(fn, data.ConsCell) and fn.head is lisp.LAMBDA:
+            return comp.call_lambda(fn, values, env, lst)
+        raise error.LispError(f"{op} is not a function!")
+    return run
+
+
+@compiles('setq')
+def compile_setq(comp: Compiler, lst: data.ConsCell, scope: Scope, _tail: bool) -> Code:
+    """(setq symbol value...)"""
+    args: Final[list] = forms(lst.tail)
+    if len(args) % 2 != 0:
+        raise error.LispError("The parameters to setq must be a list of symbols and values.")
+    for sym in args[::2]:
+        if not isinstance(sym, data.Atom):
+            raise error.LispError(f"{sym} is not a symbol!")
+    return sequence([comp.compile_set(args[idx], comp.compile(args[idx+1], scope), scope)
+                     for idx in range(0, len(args), 2)])
+
+
+@compiles('do')
+def compile_do(comp: Compiler, lst: data.ConsCell, scope: Scope, tail: bool) -> Code:
+    """(do ((var init update)...) (end-test result) body...)"""
+    if len(lst) < 3:
+        raise error.LispError(
+            "do needs at least two arguments (init-list and end-list)!")
+    var_defs: Final[list] = forms(lst[1])
+    inits: Final[tuple[Code, ...]] = tuple(comp.compile(var_def[1], scope) for var_def in var_defs)
+    loop_scope: Final[Scope] = Scope([symbol_name(var_def[0]) for var_def in var_defs], scope)
+    updates: Final[tuple[tuple[int, Code], ...]] = tuple(
+        (idx, comp.compile(var_def[2], loop_scope)) for idx, var_def in enumerate(var_defs))
+    end_test: Final[Code] = comp.compile(lst[2][0], loop_scope)
+    result: Final[Code] = comp.compile(lst[2][1], loop_scope, tail)
+    body: Final[tuple[Code, ...]] = tuple(comp.compile(x, loop_scope) for x in forms(lst.tail.tail.tail))
+    index: Final[dict[str, int]] = loop_scope.index
+    nullp = data.nullp
+    interp: Final[Any] = comp.interp
+
+    def run(env):
+        loop_env = data.Frame(env, index, [init(env) for init in inits])
+        slots = loop_env.slots
+        while nullp(end_test(loop_env)):
+            if interp.budget is not None:
+                interp.budget.tick()
+            for code in body:
+                code(loop_env)
+            for idx, code in updates:
+                slots[idx] = code(loop_env)
+        return result(loop_env)
+    return run
+
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
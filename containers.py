@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 19:15:00 krylon>
+#
+# /data/code/python/krylisp/containers.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.containers
+
+Hash tables and vectors, the compound data types besides lists.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from typing import Any, Final, Hashable, Iterable, Iterator
+
+from krylisp import data, error
+from krylisp.memo import key
+
+# Samstag, 17. 10. 2026
+# Lists are all the language had for compound data, so a lookup in an
+# association list and an index into a list both took time proportional
+# to the length of the list. A HashTable is a dict, and a Vector a Python
+# list, with a Lisp face on them.
+#
+# HashTables compare keys by structure, the way memo does for the
+# arguments it caches: symbols by name, numbers and strings by value and
+# type, lists element by element. Each entry keeps the key it was stored
+# under, so maphash can hand it back. Vectors and HashTables are mutable,
+# so they cannot be hashed, which keeps them from being keys themselves,
+# or arguments whose values are memoized.
+#
+# The reader reads #(...) as a Vector, which evaluates to itself, like a
+# quoted list: its elements are not evaluated, and it is the same Vector
+# every time the form is evaluated.
+
+
+def hash_key(value: Any) -> Hashable:
+    """Return the key value is stored under in a HashTable."""
+    try:
+        k = key(value)
+        hash(k)
+    except TypeError as err:
+        raise error.LispError(f"{value} cannot be used as a hash key") from err
+    return k
+
+
+class HashTable:
+    """HashTable maps keys to values, comparing the keys by structure."""
+
+    __slots__ = ['table']
+
+    table: dict[Hashable, tuple[Any, Any]]
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __init__(self) -> None:
+        self.table = {}
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __repr__(self) -> str:
+        return f"#<HashTable {len(self.table)} >"
+
+    def get(self, k: Any, default: Any = data.EMPTY_LIST) -> Any:
+        """Return the value stored under k, or default if there is none."""
+        entry = self.table.get(hash_key(k))
+        return default if entry is None else entry[1]
+
+    def put(self, k: Any, value: Any) -> Any:
+        """Store value under k and return it."""
+        self.table[hash_key(k)] = (k, value)
+        return value
+
+    def remove(self, k: Any) -> bool:
+        """Remove the value stored under k. Return True if there was one."""
+        return self.table.pop(hash_key(k), None) is not None
+
+    def items(self) -> list[tuple[Any, Any]]:
+        """Return the keys and values, as they are now."""
+        return list(self.table.values())
+
+
+class Vector:
+    """Vector is an array of values that can be indexed in constant time."""
+
+    __slots__ = ['items']
+
+    items: list
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __init__(self, items: Iterable = ()) -> None:
+        self.items = list(items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.items)
+
+    def __repr__(self) -> str:
+        return f"#<Vector {len(self.items)} >"
+
+    def check(self, idx: Any) -> int:
+        """Return idx if it is a valid index into the Vector, or raise a LispError."""
+        if idx.__class__ is not int or not 0 <= idx < len(self.items):
+            raise error.LispError(f"Index {idx} is out of bounds for a vector of length {len(self.items)}")
+        return idx
+
+    def ref(self, idx: Any) -> Any:
+        """Return the element at idx."""
+        return self.items[self.check(idx)]
+
+    def set(self, idx: Any, value: Any) -> Any:
+        """Set the element at idx to value and return it."""
+        self.items[self.check(idx)] = value
+        return value
+
+    def push(self, value: Any) -> int:
+        """Append value to the Vector and return its index."""
+        self.items.append(value)
+        return len(self.items) - 1
+
+
+# The types whose instances evaluate to themselves, like numbers and strings.
+SELF_EVALUATING: Final[tuple[type, ...]] = (HashTable, Vector)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
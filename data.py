@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-# Time-stamp: <2024-05-19 21:56:43 krylon>
+# Time-stamp: <2026-10-17 23:45:00 krylon>
 #
 # /data/code/python/krylisp/data.py
 # created on 17. 05. 2024
@@ -17,7 +17,6 @@ krylisp.data
 (c) 2024 Benjamin Walkenhorst
 """
 
-import copy
 import re
 from collections import deque
 from typing import Any, Final, Generator, Optional, Union
@@ -45,6 +44,14 @@ def listp(x: Any) -> bool:
 # Wenn ich Zahlen als Atome darstellen will, sollte ich sicherstellen, dass
 # die gleich beim Erzeugen des Atoms geparst werden und die auch bei Vergleichen
 # mit berücksichtigen.
+#
+# Samstag, 17. 10. 2026
+# Symbols are interned: There is exactly one Atom for each name, so two
+# symbols are equal if and only if they are the same object. SYMBOLS maps
+# each name, and each spelling of it that has been seen, to its Atom.
+SYMBOLS: Final[dict[str, 'Atom']] = {}
+
+
 class Atom:
     """An Atom is a number or a symbol, the basic building block of Lisp data"""
 
@@ -52,24 +59,50 @@ class Atom:
 
     value: Union[str, int, float]
 
-    def __init__(self, value: Union[str, int, float, 'Atom']) -> None:
-        if isinstance(value, (int, float)):
-            self.value = value
-        elif isinstance(value, Atom):
-            self.value = value.value
-        elif int_re.match(value) is not None:
-            self.value = int(value)
-        elif float_re.match(value) is not None:
-            self.value = float(value)
-        else:
-            assert isinstance(value, str)
-            self.value = value.lower()
+    def __new__(cls, value: Union[str, int, float, 'Atom']) -> 'Atom':
+        if value.__class__ is str:
+            sym = SYMBOLS.get(value)
+            if sym is not None:
+                return sym
+            return cls.intern(value)
+        if isinstance(value, Atom):
+            return value
+        assert isinstance(value, (int, float))
+        atom = object.__new__(cls)
+        atom.value = value
+        return atom
+
+    @classmethod
+    def intern(cls, name: str) -> 'Atom':
+        """Return the Atom for name, which is a number if name looks like one."""
+        if int_re.match(name) is not None:
+            return cls(int(name))
+        if float_re.match(name) is not None:
+            return cls(float(name))
+        key: Final[str] = name.lower()
+        sym = SYMBOLS.get(key)
+        if sym is None:
+            sym = object.__new__(cls)
+            sym.value = key
+            sym = SYMBOLS.setdefault(key, sym)
+        SYMBOLS[name] = sym
+        return sym
+
+    def __reduce__(self):
+        return (Atom, (self.value,))
 
     def __eq__(self, other) -> bool:
-        if isinstance(other, Atom):
-            return self.value == other.value
-        if isinstance(other, str):
+        if self is other:
+            return True
+        cls = other.__class__
+        if cls is str:
+            sym = SYMBOLS.get(other)
+            if sym is not None:
+                return sym is self
             return self.value == other.lower()
+        if cls is Atom:
+            # Symbols are only equal to themselves, numbers to the same number.
+            return self.value.__class__ is not str and self.value == other.value
         if self.value == 'nil':
             return nullp(other)
         return False
@@ -83,8 +116,8 @@ class Atom:
     def __repr__(self):
         return f"#<Atom {self.value} >"
 
-    def __nonzero__(self):
-        return self != 'nil'
+    def __bool__(self):
+        return self.value != 'nil'
 
 
 # Ich muss mur noch einmal Gedanken über die Darstellung von nil machen... ;-/
@@ -128,7 +161,7 @@ class ConsCell:
                 yield x
                 break
 
-    def __nonzero__(self) -> bool:
+    def __bool__(self) -> bool:
         return (self.head is not None) or (self.tail is not None)
 
     def __str__(self) -> str:
@@ -221,14 +254,51 @@ def nullp(x: Union[Atom, None, ConsCell]) -> bool:
     return x is NIL
 
 
+def callablep(value: Any) -> bool:
+    """Return True if value is something a call can call: a Function, a lambda list or a macro."""
+    if value.__class__ is Function:
+        return True
+    return value.__class__ is ConsCell and value.head.__class__ is Atom and value.head.value in ('lambda', 'macro')
+
+
+class Overlay(dict):
+    """
+    An Overlay is the dict of a global Environment that shares the variables of another one.
+
+    Variables that have not been set in the Overlay itself are looked up in
+    the shared dict, which the Overlay never changes.
+    """
+
+    __slots__ = ['shared']
+
+    shared: dict
+
+    def __init__(self, shared: dict) -> None:
+        super().__init__()
+        self.shared = shared
+
+    def __missing__(self, key: str) -> Any:
+        return self.shared[key]
+
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key) or key in self.shared
+
+    def get(self, key: str, default: Any = None) -> Any:  # type: ignore[override]
+        return self[key] if key in self else default
+
+
 class Environment:
     """An Environment is a set of variable bindings that may reference other Environments."""
 
-    __slots__ = ['data', 'parent', 'level']
+    __slots__ = ['data', 'parent', 'level', 'frozen', 'root', 'version', 'changed', '__weakref__']
 
     data: dict
     parent: Optional['Environment']
     level: int
+    frozen: bool
+    root: 'Environment'
+    version: int
+    changed: Optional[set[str]]
 
     def __init__(self, parent: Optional['Environment'] = None, init: Optional[dict] = None) -> None:  # noqa: E501, pylint: disable-msg=C0301
         if init is None:
@@ -240,19 +310,36 @@ class Environment:
         for sym, val in init.items():
             self.data[sym.value if isinstance(sym, Atom) else sym] = val
         self.level = 0 if (parent is None) else parent.level + 1
+        # Only a global Environment can be frozen, see freeze.
+        self.frozen = False
+        # The global Environment this one belongs to.
+        self.root = self if parent is None else parent.root
+        # Counts the changes to global variables that were bound to something
+        # callable, so caches of what a name calls can tell they are stale.
+        self.version = 0
+        # If this is a set, the names of the global variables set since are
+        # added to it, so worker processes can be told what has changed.
+        self.changed = None
 
     def __getitem__(self, key: Union[str, Atom]) -> Any:
         lookup_key = key
         if isinstance(key, Atom):
             assert isinstance(key.value, str)
             lookup_key = key.value
+
+        env = self
+        while env is not None:
+            if isinstance(env, Frame):
+                return env[lookup_key]
+            if isinstance(env, dict):
+                break
+            if lookup_key in env.data:
+                return env.data[lookup_key]
+            env = env.parent
+
         try:
-            if lookup_key in self.data:
-                return self.data[lookup_key]
-            if isinstance(self.parent, dict):
-                return self.parent[lookup_key]
-            if isinstance(self.parent, Environment):
-                return self.parent[lookup_key]
+            if isinstance(env, dict):
+                return env[lookup_key]
             raise error.LispError(f"No such variable in environment: {lookup_key}")
         except KeyError as err:
             # Shouldn't I raise NoSuchVariableError?
@@ -272,39 +359,70 @@ class Environment:
 
         # Nein, das ist falsch...
         env: Environment = self
-        while (env.parent is not None) and (key not in env.data):
+        while (env.parent is not None) and not env.binds(key):
             # print("Going up one level to")
             env = env.parent
             # print(env)
 
-        if key in env.data:
+        if env.binds(key):
             # print(f"Updating variable {key} in environment {env}")
-            env.data[key] = value
+            if env.parent is None:
+                env.set_global(key, value)
+            else:
+                env.assign(key, value)
+        elif self.parent is None:
+            self.set_global(key, value)
         else:
             # print(f"Updating variable {key} in environment {self.data}")
             self.data[key] = value
 
     def __contains__(self, key: str) -> bool:
-        if key in self.data:
-            return True
-
-        parent: Optional[Environment] = self.parent
-        while parent is not None:
-            if key in parent:
+        env: Optional[Environment] = self
+        while env is not None:
+            if env.binds(key):
                 return True
-            parent = parent.parent
+            env = env.parent
         return False
 
     def __repr__(self) -> str:
-        env = copy.copy(self.data)
+        env = dict(self.items())
         p = self.parent
         while p is not None:
-            for key, val in p.data.items():
+            for key, val in p.items():
                 if key not in env:
                     env[key] = val
             p = p.parent
         return str(env)
 
+    def binds(self, key: str) -> bool:
+        """Return True if this Environment itself (not its parents) has a variable key."""
+        return key in self.data
+
+    def assign(self, key: str, value: Any) -> None:
+        """Set the variable key in this Environment itself."""
+        self.data[key] = value
+
+    def set_global(self, key: str, value: Any) -> None:
+        """
+        Set the variable key in this global Environment.
+
+        All changes to global variables go through here, the compiled ones
+        included, so the version is bumped whenever a name that was bound
+        to something callable is bound anew, and changed sees every name
+        that is set.
+        """
+        if self.frozen:
+            raise error.LispError(f"Cannot set {key}, the global Environment is frozen")
+        if callablep(self.data.get(key)):
+            self.version += 1
+        if self.changed is not None:
+            self.changed.add(key)
+        self.data[key] = value
+
+    def items(self):
+        """Return the variables of this Environment itself as (name, value) pairs."""
+        return self.data.items()
+
     def get_global(self) -> 'Environment':
         """Get the upmost enclosing Environment (i.e. the global environment)"""
         env = self
@@ -316,22 +434,98 @@ class Environment:
         """Return the depth of nested Environments"""
         return self.level
 
+    def freeze(self) -> None:
+        """Make this global Environment read-only, so it can be shared by overlays."""
+        assert self.parent is None, "Only the global Environment can be frozen"
+        self.frozen = True
+
+    def overlay(self) -> 'Environment':
+        """
+        Return a new global Environment that sees the variables of this one.
+
+        Variables that are set in the new Environment are set there only,
+        so any number of them can share this one, which must be frozen.
+        """
+        assert self.parent is None and self.frozen, "Only a frozen global Environment can be shared"
+        env: Final[Environment] = Environment()
+        env.data = Overlay(self.data)
+        return env
+
+
+class Frame(Environment):
+    """
+    A Frame is an Environment that keeps its variables in a list of slots.
+
+    Frames are created by compiled code, which knows at which slot each
+    variable lives and accesses the slots directly. The index maps names to
+    slots for everyone else, and is shared by all Frames of the same shape.
+    Names that are not in the index cannot be added to a Frame, so they are
+    passed on to the parent.
+    """
+
+    __slots__ = ['index', 'slots']
+
+    index: dict[str, int]
+    slots: list
+
+    def __init__(self, parent: Environment, index: dict[str, int], slots: list) -> None:  # pylint: disable-msg=W0231
+        self.parent = parent
+        self.index = index
+        self.slots = slots
+        self.level = parent.level + 1
+        self.root = parent.root
+
+    def __getitem__(self, key: Union[str, Atom]) -> Any:
+        if isinstance(key, Atom):
+            key = key.value
+        idx = self.index.get(key)
+        if idx is not None:
+            return self.slots[idx]
+        return self.parent[key]
+
+    def __setitem__(self, key: Union[str, Atom], value) -> None:
+        if isinstance(key, Atom):
+            key = key.value
+        idx = self.index.get(key)
+        if idx is not None:
+            self.slots[idx] = value
+        else:
+            self.parent[key] = value
+
+    def binds(self, key: str) -> bool:
+        return key in self.index
+
+    def assign(self, key: str, value: Any) -> None:
+        self.slots[self.index[key]] = value
+
+    def items(self):
+        return zip(self.index, self.slots)
+
 
 class Function:
     """A Function is a callable code object"""
 
-    def __init__(self, args, body, environment) -> None:
+    __slots__ = ['env', 'args', 'body', 'name', 'code']
+
+    def __init__(self, args, body, environment, name=None, code=None) -> None:  # pylint: disable-msg=R0913
         assert isinstance(environment, (dict, Environment))
         assert isinstance(args, (list, tuple, ConsCell))
-        assert isinstance(body, ConsCell)
+        assert body is None or isinstance(body, ConsCell)
 
         self.env = environment
         self.args = args
         self.body = body
+        self.name = name
+        # Whatever the engine that created the Function needs to run it.
+        self.code = code
+
+    def __repr__(self) -> str:
+        return f"#<Function {self.name if self.name is not None else 'lambda'} >"
 
     # Eigentlich muss ich noch dingsen...
     def __call__(self, *args):
         """Call the function with the given arguments"""
+        return self.code.invoke(self.env, list(args), self.name)
 
 
 # Local Variables: #
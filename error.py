@@ -1,5 +1,5 @@
 #!/usr/bin/env python
-# Time-stamp: <2024-05-18 15:42:00 krylon>
+# Time-stamp: <2026-10-17 14:10:00 krylon>
 #
 # /home/krylon/sources/trunk/python/lispy/error.py
 # created on 19. 09. 2010
@@ -39,3 +39,19 @@ class LispError(Exception):
 
 class NoSuchVariableError(LispError):
     """Indicates a reference to an unbound name"""
+
+
+class ImageError(LispError):
+    """Indicates an image that cannot be loaded, because it is damaged or stale"""
+
+
+class BudgetExceeded(LispError):
+    """Indicates an evaluation that ran out of fuel, time or memory, see krylisp.budget"""
+
+    def __init__(self, limit: str, message: str) -> None:
+        super().__init__(message)
+        # Which limit was exceeded: fuel, deadline, allocation or cancelled.
+        self.limit = limit
+
+    def __reduce__(self):
+        return (BudgetExceeded, (self.limit, str(self)))
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 20:20:00 krylon>
+#
+# /data/code/python/krylisp/formcache.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.formcache
+
+Cache the forms read from a source file, so a file that has not changed
+does not need to be read again.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import hashlib
+import marshal
+import os
+import threading
+import time
+from typing import Any, BinaryIO, Final, Iterator, Optional
+
+from krylisp import data, parser
+from krylisp.containers import Vector
+
+# The suffix of cache files, like .pyc for Python.
+SUFFIX: Final[str] = ".forms"
+
+# How many cache files a folder keeps.
+MAX_FILES: Final[int] = 256
+
+# How many bytes of a source file are hashed at a time.
+CHUNK_SIZE: Final[int] = 1 << 16
+
+SYMBOLS: Final[dict[str, data.Atom]] = data.SYMBOLS
+
+# Samstag, 17. 10. 2026
+# The cache file for a source file is named after the SHA-256 of its
+# absolute path. It starts with the version of the Reader and the SHA-256
+# of the source, followed by the forms, one marshal record each, then an
+# Ellipsis and the time it took to read the file. If either hash or the
+# version do not match, the file is read again and the cache file replaced.
+# Forms are stored with marshal, which only knows Python's own types, so
+# lists become tuples, vectors become lists, symbols become strs, and
+# strings become UTF-8 bytes.
+# A form that cannot be stored that way, like one that is nested too deeply
+# for marshal, means the file is not cached at all.
+#
+# Forms are decoded and encoded one at a time, as they are used, so loading
+# a file through the cache takes no more memory than reading it does. If a
+# cache file turns out to be damaged halfway through, the rest of the forms
+# are read from the source. The folder keeps at most max_files cache files;
+# whenever one is written, those used least recently are removed.
+
+
+def encode(form: Any) -> Any:
+    """Return form as an object marshal can store."""
+    cls = form.__class__
+    if cls is data.Atom:
+        if form.value.__class__ is not str:
+            raise ValueError(f"Cannot cache {form}")
+        return form.value
+    if cls is str:
+        return form.encode("utf-8")
+    if cls is data.ConsCell:
+        items = []
+        node = form
+        while node is not None:
+            if node.__class__ is not data.ConsCell:
+                raise ValueError(f"Cannot cache dotted list {form}")
+            if node.head is None and node.tail is None and not items:
+                break
+            items.append(encode(node.head))
+            node = node.tail
+        return tuple(items)
+    if cls is Vector:
+        return [encode(item) for item in form]
+    return form
+
+
+def decode(obj: Any) -> Any:
+    """Return the form obj stands for."""
+    cls = obj.__class__
+    if cls is tuple:
+        if not obj:
+            return data.ConsCell(None, None)
+        res = None
+        # Most elements are symbols or numbers, which are handled here
+        # rather than by a call to decode.
+        for item in reversed(obj):
+            cls = item.__class__
+            if cls is str:
+                item = SYMBOLS.get(item) or data.Atom(item)
+            elif cls is tuple:
+                item = decode(item)
+            elif cls is bytes:
+                item = item.decode("utf-8")
+            elif cls is list:
+                item = decode(item)
+            res = data.ConsCell(item, res)
+        return res
+    if cls is str:
+        return SYMBOLS.get(obj) or data.Atom(obj)
+    if cls is bytes:
+        return obj.decode("utf-8")
+    if cls is list:
+        return Vector(decode(item) for item in obj)
+    return obj
+
+
+class FormCache:
+    """FormCache keeps the forms read from source files in a folder, along with hit and miss counts."""
+
+    __slots__ = ['folder', 'max_files', 'hits', 'misses', 'saved_ns']
+
+    folder: str
+    max_files: int
+    hits: int
+    misses: int
+    saved_ns: int
+
+    def __init__(self, folder: str, max_files: int = MAX_FILES) -> None:
+        self.folder = folder
+        self.max_files = max_files
+        self.hits = 0
+        self.misses = 0
+        # How much less time the hits took than reading the files would have.
+        self.saved_ns = 0
+
+    def cache_path(self, path: str) -> str:
+        """Return the path of the cache file for the source file path."""
+        key: Final[str] = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()
+        return os.path.join(self.folder, key[:32] + SUFFIX)
+
+    def forms(self, path: str) -> Iterator[Any]:
+        """
+        Return an iterator over the top-level forms in the file at path.
+
+        If the cache has the forms, they are taken from it. Otherwise, the
+        file is read, and once all of its forms have been used, they are
+        added to the cache.
+        """
+        digest: Final[str] = file_digest(path)
+        cache_path: Final[str] = self.cache_path(path)
+        used = 0
+        try:
+            with open(cache_path, "rb") as fh:
+                version, source = marshal.load(fh)
+                if version == parser.VERSION and source == digest:
+                    decode_ns = 0
+                    while True:
+                        before = time.perf_counter_ns()
+                        obj = marshal.load(fh)
+                        if obj is Ellipsis:
+                            break
+                        form = decode(obj)
+                        decode_ns += time.perf_counter_ns() - before
+                        used += 1
+                        yield form
+                    parse_ns = marshal.load(fh)
+                    self.hits += 1
+                    self.saved_ns += parse_ns - decode_ns
+                    touch(cache_path)
+                    return
+        except (OSError, EOFError, ValueError, TypeError, RecursionError):
+            pass
+        self.misses += 1
+        yield from self.read(path, digest, cache_path, used)
+
+    def read(self, path: str, digest: str, cache_path: str, skip: int = 0) -> Iterator[Any]:
+        """
+        Return an iterator over the forms in the file at path, after the first skip.
+
+        The forms are written to a new cache file as they are read, which
+        replaces the old one once they have all been used.
+        """
+        tmp: Final[str] = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        out: Optional[BinaryIO] = None
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            out = open(tmp, "wb")  # pylint: disable-msg=R1732
+            marshal.dump((parser.VERSION, digest), out)
+        except (OSError, ValueError):
+            discard(out, tmp)
+            out = None
+        parse_ns = 0
+        complete = False
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                reader: Final[Iterator[Any]] = parser.read_file(fh)
+                idx = 0
+                while True:
+                    before = time.perf_counter_ns()
+                    try:
+                        form = next(reader)
+                    except StopIteration:
+                        break
+                    finally:
+                        parse_ns += time.perf_counter_ns() - before
+                    if out is not None:
+                        try:
+                            marshal.dump(encode(form), out)
+                        except (OSError, ValueError, RecursionError):
+                            discard(out, tmp)
+                            out = None
+                    if idx >= skip:
+                        yield form
+                    idx += 1
+            complete = True
+        finally:
+            if out is not None:
+                self.finish(out, tmp, cache_path, parse_ns if complete and file_digest(path) == digest else None)
+
+    def finish(self, out: BinaryIO, tmp: str, cache_path: str, parse_ns: Optional[int]) -> None:
+        """
+        Complete the cache file being written to tmp, and put it in place of cache_path.
+
+        If parse_ns is None, the file was not read to its end, or has been
+        changed while it was, so the new cache file is thrown away instead.
+        """
+        if parse_ns is None:
+            discard(out, tmp)
+            return
+        try:
+            marshal.dump(Ellipsis, out)
+            marshal.dump(parse_ns, out)
+            out.close()
+            os.replace(tmp, cache_path)
+        except (OSError, ValueError):
+            discard(out, tmp)
+            return
+        self.prune()
+
+    def prune(self) -> None:
+        """Remove the cache files used least recently, so there are no more than max_files left."""
+        try:
+            names: Final[list[str]] = [name for name in os.listdir(self.folder) if name.endswith(SUFFIX)]
+        except OSError:
+            return
+        if len(names) <= self.max_files:
+            return
+        entries: list[tuple[float, str]] = []
+        for name in names:
+            path = os.path.join(self.folder, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                pass
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of hits and misses, the hit rate and the time saved in milliseconds."""
+        total: Final[int] = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit-rate": self.hits / total if total else 0.0,
+            "saved-ms": self.saved_ns / 1e6,
+        }
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 of the file at path, read in pieces."""
+    digest: Final = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def touch(path: str) -> None:
+    """Mark the cache file at path as used just now, so prune keeps it."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def discard(out: Optional[BinaryIO], tmp: str) -> None:
+    """Close out and remove the unfinished cache file tmp."""
+    try:
+        if out is not None:
+            out.close()
+        os.remove(tmp)
+    except OSError:
+        pass
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-18 02:10:00 krylon>
+#
+# /data/code/python/krylisp/image.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.image
+
+Save the global Environment of an interpreter to a file, and load it
+into another one.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import hashlib
+import io
+import os
+import pickle
+import zlib
+from typing import TYPE_CHECKING, Any, Final, Iterable, Optional
+
+from krylisp import common, data, error
+from krylisp.memo import Memo
+from krylisp.streams import Promise, Stream
+
+if TYPE_CHECKING:
+    from krylisp.lisp import LispInterpreter
+
+MAGIC: Final[bytes] = b"KRYLISP IMAGE\n"
+# Increment this whenever the layout of the image or of the objects in it
+# changes, so images written before are recognized as stale.
+VERSION: Final[int] = 2
+
+# Samstag, 17. 10. 2026
+# An image is the magic line, a pickled header, and the pickled global
+# Environment, compressed with zlib. The header says which version of the
+# format and of the interpreter wrote the image, and which source files
+# it was built from, with their SHA-256, so an image that is older than
+# its sources can be told apart from a good one.
+#
+# The global Environment itself is not stored, only its variables; the
+# Functions in it refer to the Environment of the interpreter that loads
+# the image instead. Functions are stored without their code, which
+# belongs to one engine of one interpreter, and get new code when they are
+# loaded. Memoized Functions keep the values they have cached, but start
+# over counting hits and misses. Lists are stored as a list of their
+# elements, so a long list does not need a deep Python stack. That means
+# lists that share a tail no longer share it after loading, and a circular
+# list cannot be saved. Promises and streams cannot be saved either.
+
+
+def digest(path: str) -> str:
+    """Return the SHA-256 of the file at path."""
+    with open(path, "rb") as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+
+def build_list(heads: list, tail: Any) -> data.ConsCell:
+    """Return the list of heads, ending in tail."""
+    res = tail
+    for head in reversed(heads):
+        res = data.ConsCell(head, res)
+    return res
+
+
+def new_function() -> data.Function:
+    """Return an empty Function, to be filled in by the unpickler."""
+    return data.Function.__new__(data.Function)
+
+
+class Pickler(pickle.Pickler):
+    """Pickler writes the objects in a global Environment, or in a context on top of the frozen base."""
+
+    def __init__(self, fh: io.BytesIO, genv: data.Environment, base: Optional[data.Environment] = None) -> None:
+        super().__init__(fh, pickle.HIGHEST_PROTOCOL)
+        self.genv = genv
+        self.base = genv if base is None else base
+
+    def persistent_id(self, obj: Any) -> Any:
+        return "global" if obj is self.genv or obj is self.base else None
+
+    def reducer_override(self, obj: Any) -> Any:
+        """Reduce lists and Functions to objects that can be pickled."""
+        cls = obj.__class__
+        if cls is data.ConsCell:
+            if obj is data.EMPTY_LIST:
+                return "EMPTY_LIST"
+            heads = []
+            node = obj
+            while node.__class__ is data.ConsCell:
+                heads.append(node.head)
+                node = node.tail
+            return (build_list, (heads, node))
+        if cls is data.Function:
+            if obj.code.__class__ is Memo:
+                code: Any = ("memo", obj.code.max_size, obj.code.fn, list(obj.code.cache.items()))
+            elif hasattr(obj.code, "enter"):
+                code = ("lambda",)
+            else:
+                raise error.ImageError(f"Cannot save {obj}, its code is {obj.code.__class__.__name__}")
+            return (new_function, (), (None, {"env": obj.env, "args": obj.args, "body": obj.body,
+                                              "name": obj.name, "code": code}))
+        if isinstance(obj, (Promise, Stream)):
+            # Their code is a Python closure, and a Stream may read a file.
+            raise error.ImageError(f"Cannot save {obj}")
+        return NotImplemented
+
+
+class Unpickler(pickle.Unpickler):
+    """Unpickler reads the objects written by Pickler, and remembers the Functions among them."""
+
+    def __init__(self, fh: io.BytesIO, genv: data.Environment) -> None:
+        super().__init__(fh)
+        self.genv = genv
+        self.functions: list[data.Function] = []
+
+    def persistent_load(self, pid: Any) -> Any:
+        if pid != "global":
+            raise error.ImageError(f"Invalid reference in image: {pid}")
+        return self.genv
+
+    def find_class(self, module: str, name: str) -> Any:
+        if module == __name__ and name == "new_function":
+            return self.new_function
+        return super().find_class(module, name)
+
+    def new_function(self) -> data.Function:
+        """Return an empty Function and remember it."""
+        fn = new_function()
+        self.functions.append(fn)
+        return fn
+
+
+def dumps(interp: 'LispInterpreter', obj: Any, genv: Optional[data.Environment] = None) -> bytes:
+    """
+    Return obj pickled, with references to the global Environment of interp kept as references.
+
+    If genv is a context of interp, references to it are kept as references
+    to the global Environment, too.
+    """
+    buf: Final[io.BytesIO] = io.BytesIO()
+    base: Final[data.Environment] = interp.env.get_global()
+    Pickler(buf, base if genv is None else genv, base).dump(obj)
+    return buf.getvalue()
+
+
+def loads(interp: 'LispInterpreter', raw: bytes, genv: Optional[data.Environment] = None) -> Any:
+    """Return the object pickled by dumps, with its Functions given code for interp, and bound to genv, if given."""
+    unpickler: Final[Unpickler] = Unpickler(io.BytesIO(raw), interp.env.get_global() if genv is None else genv)
+    obj: Final[Any] = unpickler.load()
+    for fn in unpickler.functions:
+        if fn.code[0] == "memo":
+            _, max_size, inner, cached = fn.code
+            fn.code = Memo(inner, max_size)
+            fn.code.cache.update(cached)
+        else:
+            fn.code = interp.function_code(fn)
+    return obj
+
+
+def install(interp: 'LispInterpreter', variables: dict[str, Any]) -> None:
+    """Add the global variables loaded from an image to the global Environment of interp."""
+    genv: Final[data.Environment] = interp.env.get_global()
+    genv.data.update(variables)
+    genv.version += 1
+    if genv.changed is not None:
+        genv.changed.update(variables)
+    memos: Final[dict[str, Memo]] = interp.memos.setdefault(genv, {})
+    for name, value in variables.items():
+        if isinstance(value, data.Function) and value.code.__class__ is Memo:
+            memos[name] = value.code
+
+
+def save(interp: 'LispInterpreter', path: str, sources: Iterable[str] = ()) -> None:
+    """Save the global Environment of interp to path. It was built by loading the files sources."""
+    header: Final[dict[str, Any]] = {
+        "version": VERSION,
+        "app": common.APP_VERSION,
+        "sources": {os.path.abspath(src): digest(src) for src in sources},
+    }
+    raw: Final[bytes] = dumps(interp, {"globals": interp.env.get_global().data,
+                                       "gensym": interp.gensym_counter})
+    tmp: Final[str] = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(MAGIC)
+        pickle.dump(header, fh, pickle.HIGHEST_PROTOCOL)
+        fh.write(zlib.compress(raw, 1))
+    os.replace(tmp, path)
+
+
+def load(interp: 'LispInterpreter', path: str, sources: Iterable[str] = ()) -> None:
+    """
+    Load the image at path into the global Environment of interp.
+
+    If the image was written by a different version, or any of the files
+    sources has changed since, or was not used to build the image, raise
+    an ImageError.
+    """
+    with open(path, "rb") as fh:
+        if fh.read(len(MAGIC)) != MAGIC:
+            raise error.ImageError(f"{path} is not an image")
+        try:
+            header = pickle.load(fh)
+            if header.get("version") != VERSION or header.get("app") != common.APP_VERSION:
+                raise error.ImageError(f"{path} was written by another version")
+            for src in sources:
+                if header["sources"].get(os.path.abspath(src)) != digest(src):
+                    raise error.ImageError(f"{path} is older than {src}")
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError,
+                ValueError, KeyError, TypeError) as err:
+            raise error.ImageError(f"{path} has a damaged header: {err}") from err
+        payload = fh.read()
+    try:
+        state = loads(interp, zlib.decompress(payload))
+        variables, counter = state["globals"], state["gensym"]
+    except (zlib.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError,
+            ValueError, KeyError, TypeError) as err:
+        raise error.ImageError(f"{path} is damaged: {err}") from err
+    install(interp, variables)
+    interp.gensym_counter = max(interp.gensym_counter, counter)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-# Time-stamp: <2025-03-07 22:24:06 krylon>
+# Time-stamp: <2026-10-18 03:05:00 krylon>
 #
 # /data/code/python/krylisp/lisp.py
 # created on 20. 05. 2024
@@ -20,14 +20,25 @@ krylisp.lisp
 import math
 import operator
 import sys
+import threading
 import time
 import traceback
+import weakref
+from collections import OrderedDict
 from functools import reduce
-from typing import Any, Final, Union
+from typing import Any, Callable, Final, Iterable, Optional, Union
 
 from krylib import even, moan
 
-from krylisp import data, error, parser
+from krylisp import common, compiler, data, error, image, memo, parallel, parser, streams
+from krylisp.budget import Budget
+from krylisp.containers import SELF_EVALUATING, HashTable, Vector
+from krylisp.formcache import FormCache
+from krylisp.optimizer import Optimizer
+from krylisp.profiler import Profiler
+from krylisp.sampler import Sampler
+from krylisp.streams import ConsStream, Promise, Stream
+from krylisp.tracer import DebugTracer, Tracer
 
 # Donnerstag, 07. 10. 2010, 22:03
 # Damit ich richtige Makros schreiben kann, brauche ich gensym, und damit DAS
@@ -46,21 +57,789 @@ def get_num(v):
     raise error.LispError(f"{v} is not a numerical value!")
 
 
-class LispInterpreter:
+# Samstag, 17. 10. 2026
+# Special forms and builtins used to be one long chain of
+# "if lst.car() == '...'" tests in eval_list, so a call to a user-defined
+# function had to fail every single one of them first. Now they live in
+# tables keyed by the (lower-case) symbol name, and dispatching a form is
+# a single dict lookup.
+#
+# Builtins are plain Python functions that receive their arguments already
+# evaluated. Special forms receive the interpreter, the unevaluated form, and
+# the current Environment.
+Handler = Callable[['LispInterpreter', data.ConsCell, data.Environment], Any]
+
+BUILTINS: Final[dict[str, Callable[..., Any]]] = {}
+SPECIAL_FORMS: Final[dict[str, Handler]] = {}
+
+# Cheaper replacements for builtins that are called with a fixed number of
+# arguments, keyed by the builtin and the number of arguments. The Compiler
+# uses them, because it knows how many arguments a call site passes.
+SPECIALIZED: Final[dict[tuple[Callable[..., Any], int], Callable[..., Any]]] = {}
+
+T: Final[data.Atom] = data.Atom('t')
+LAMBDA: Final[data.Atom] = data.Atom('lambda')
+MACRO: Final[data.Atom] = data.Atom('macro')
+RETURN: Final[data.Atom] = data.Atom('return')
+REST: Final[data.Atom] = data.Atom('&rest')
+DEFUN: Final[data.Atom] = data.Atom('defun')
+
+# How many call sites the MacroCache keeps the expansions of.
+MACRO_CACHE_SIZE: Final[int] = 4096
+
+# How many call sites the CallCache remembers the Functions of.
+CALL_CACHE_SIZE: Final[int] = 4096
+
+# How many lambda lists and Functions the interpreter keeps the Procedures
+# of, see LispInterpreter.procedure.
+PROCEDURE_CACHE_SIZE: Final[int] = 1024
+
+
+def builtin(*names: str) -> Callable:
+    """Register the decorated function as a builtin under the given names."""
+    def register(fn: Callable[..., Any]) -> Callable[..., Any]:
+        for name in names:
+            BUILTINS[sys.intern(name.lower())] = fn
+        return fn
+    return register
+
+
+def special_form(*names: str) -> Callable:
+    """Register the decorated function as the handler for the given special forms."""
+    def register(handler: Handler) -> Handler:
+        for name in names:
+            SPECIAL_FORMS[sys.intern(name.lower())] = handler
+        return handler
+    return register
+
+
+def specialize(fn: Callable[..., Any], arity: int, replacement: Callable[..., Any]) -> None:
+    """Register replacement to be used for calls of the builtin fn with arity arguments."""
+    SPECIALIZED[(fn, arity)] = replacement
+
+
+def builtin_handler(fn: Callable[..., Any]) -> Handler:
+    """Wrap a builtin so it can be called like a special form handler."""
+    def handler(interp: 'LispInterpreter', lst: data.ConsCell, env: data.Environment) -> Any:
+        return fn(*interp.eval_args(lst, env))
+    return handler
+
+
+def compare_chain(cmp: Callable[[Any, Any], bool], args) -> Union[data.Atom, data.ConsCell]:
+    """Return t if cmp holds for every pair of adjacent arguments, nil otherwise."""
+    for idx in range(1, len(args)):
+        if not cmp(args[idx-1], args[idx]):
+            return data.EMPTY_LIST
+    return T
+
+
+def compare_pair(cmp: Callable[[Any, Any], bool]) -> Callable[[Any, Any], Union[data.Atom, data.ConsCell]]:
+    """Return a function that compares exactly two arguments like compare_chain."""
+    def compare(a, b):
+        return T if cmp(a, b) else data.EMPTY_LIST
+    return compare
+
+
+@builtin('+')
+def lisp_add(*args):
+    """Add up the arguments."""
+    return sum(args)
+
+
+@builtin('-')
+def lisp_sub(first, *rest):
+    """Subtract the remaining arguments from the first one."""
+    for val in rest:
+        first -= val
+    return first
+
+
+@builtin('*')
+def lisp_mul(*args):
+    """Multiply the arguments."""
+    return reduce(operator.mul, args)
+
+
+@builtin('**')
+def lisp_pow(base, exp):
+    """Raise base to the power of exp."""
+    return base ** exp
+
+
+@builtin('/')
+def lisp_div(*args):
+    """Divide the first argument by the remaining ones."""
+    return reduce(operator.truediv, args)
+
+
+@builtin('mod')
+def lisp_mod(a, b):
+    """Return the remainder of dividing a by b."""
+    return a % b
+
+
+@builtin('sqrt')
+def lisp_sqrt(x):
+    """Return the square root of x."""
+    return math.sqrt(get_num(x))
+
+
+@builtin('<')
+def lisp_lt(*args):
+    """Return t if the arguments are strictly increasing."""
+    return compare_chain(operator.lt, args)
+
+
+@builtin('>')
+def lisp_gt(*args):
+    """Return t if the arguments are strictly decreasing."""
+    return compare_chain(operator.gt, args)
+
+
+@builtin('=')
+def lisp_num_eq(*args):
+    """Return t if all arguments are equal."""
+    return compare_chain(operator.eq, args)
+
+
+@builtin('eq')
+def lisp_eq(a, b):
+    """Return t if a and b are equal."""
+    if a == b:
+        return data.Atom('t')
+    return data.Atom('nil')
+
+
+@builtin('print')
+def lisp_print(val):
+    """Print val and return it."""
+    print(val)
+    return val
+
+
+@builtin('not')
+def lisp_not(val):
+    """Return t if val is nil, nil otherwise."""
+    return data.Atom('nil') if not data.nullp(val) else data.Atom('t')
+
+
+@builtin('cons')
+def lisp_cons(head, tail):
+    """Cons head onto tail."""
+    # (cons 1 ()) ergibt im Moment (1 None)!!!
+    if not data.nullp(tail):
+        return data.cons(head, tail)
+    return data.ConsCell(head, None)
+
+
+@builtin('car')
+def lisp_car(arg):
+    """Return the first element of a list."""
+    if not data.listp(arg):
+        raise error.LispError("Argument to car must be a list!")
+    if data.nullp(arg):
+        return data.ConsCell(None, None)
+    return arg[0]
+
+
+@builtin('cdr')
+def lisp_cdr(arg):
+    """Return the rest of a list."""
+    if not data.listp(arg):
+        raise error.LispError("Argument to cdr must be a list!")
+    if data.nullp(arg):
+        return data.ConsCell(None, None)
+    return arg.cdr()
+
+
+@builtin('listp')
+def lisp_listp(arg):
+    """Return t if arg is a list."""
+    return data.Atom('t') if data.listp(arg) else data.Atom('nil')
+
+
+@builtin('null')
+def lisp_null(arg):
+    """Return t if arg is nil."""
+    return data.Atom('t') if data.nullp(arg) else data.Atom('nil')
+
+
+@builtin('list')
+def lisp_list(*args):
+    """Return a list of the arguments."""
+    return data.ConsCell.fromList(args)
+
+
+@builtin('atom')
+def lisp_atom(arg):
+    """Return t if arg is an atom."""
+    if isinstance(arg, (data.Atom, int, float)) or data.nullp(arg):
+        return data.Atom('t')
+    return data.Atom('nil')
+
+
+def as_hash_table(value: Any) -> HashTable:
+    """Return value if it is a hash table, or raise a LispError."""
+    if value.__class__ is not HashTable:
+        raise error.LispError(f"{value} is not a hash table!")
+    return value
+
+
+def as_vector(value: Any) -> Vector:
+    """Return value if it is a vector, or raise a LispError."""
+    if value.__class__ is not Vector:
+        raise error.LispError(f"{value} is not a vector!")
+    return value
+
+
+def as_function(value: Any) -> data.Function:
+    """Return value if it is a Function, or raise a LispError."""
+    if not isinstance(value, data.Function):
+        raise error.LispError(f"{value} is not a function!")
+    return value
+
+
+@builtin('make-hash-table')
+def lisp_make_hash_table():
+    """Return a new, empty hash table."""
+    return HashTable()
+
+
+@builtin('gethash')
+def lisp_gethash(key, table, default=data.EMPTY_LIST):
+    """Return the value stored under key in table, or default if there is none."""
+    return as_hash_table(table).get(key, default)
+
+
+@builtin('puthash')
+def lisp_puthash(key, value, table):
+    """Store value under key in table and return it."""
+    return as_hash_table(table).put(key, value)
+
+
+@builtin('remhash')
+def lisp_remhash(key, table):
+    """Remove the value stored under key in table. Return t if there was one."""
+    return T if as_hash_table(table).remove(key) else data.EMPTY_LIST
+
+
+@builtin('maphash')
+def lisp_maphash(fn, table):
+    """Call fn with each key and value in table, and return nil."""
+    as_function(fn)
+    for key, value in as_hash_table(table).items():
+        fn(key, value)
+    return data.EMPTY_LIST
+
+
+@builtin('hash-table-count')
+def lisp_hash_table_count(table):
+    """Return the number of entries in table."""
+    return len(as_hash_table(table))
+
+
+@builtin('make-vector')
+def lisp_make_vector(size, init=data.EMPTY_LIST):
+    """Return a vector of size elements, all set to init."""
+    if size.__class__ is not int or size < 0:
+        raise error.LispError(f"The size of a vector must be a non-negative integer, not {size}")
+    return Vector([init] * size)
+
+
+@builtin('vector')
+def lisp_vector(*args):
+    """Return a vector of the arguments."""
+    return Vector(args)
+
+
+@builtin('aref')
+def lisp_aref(vec, idx):
+    """Return the element of vec at idx."""
+    return as_vector(vec).ref(idx)
+
+
+@builtin('aset')
+def lisp_aset(vec, idx, value):
+    """Set the element of vec at idx to value and return it."""
+    return as_vector(vec).set(idx, value)
+
+
+@builtin('vector-push')
+def lisp_vector_push(value, vec):
+    """Append value to vec and return its index."""
+    return as_vector(vec).push(value)
+
+
+@builtin('vector-length')
+def lisp_vector_length(vec):
+    """Return the number of elements in vec."""
+    return len(as_vector(vec))
+
+
+@builtin('force')
+def lisp_force(value):
+    """Return the value of the promise value, computing it if needed. Other values are returned as they are."""
+    if value.__class__ is Promise:
+        return value.force()
+    return value
+
+
+@builtin('stream-car')
+def lisp_stream_car(stream):
+    """Return the first element of stream, or nil if it is empty."""
+    return next(streams.iterate(stream), data.EMPTY_LIST)
+
+
+@builtin('stream-cdr')
+def lisp_stream_cdr(stream):
+    """Return the stream of the elements of stream after the first."""
+    if stream.__class__ is ConsStream:
+        return stream.tail.force()
+    return streams.stream_drop(1, stream)
+
+
+@builtin('stream-null')
+def lisp_stream_null(stream):
+    """Return t if stream has no elements."""
+    return T if next(streams.iterate(stream), Stream) is Stream else data.EMPTY_LIST
+
+
+@builtin('stream-range')
+def lisp_stream_range(start, end=data.EMPTY_LIST, step=1):
+    """Return the stream of the integers from start up to end, or without end if end is nil."""
+    return streams.stream_range(start, None if data.nullp(end) else end, step)
+
+
+@builtin('stream-lines')
+def lisp_stream_lines(path):
+    """Return the stream of the lines in the file at path."""
+    return streams.lines(path)
+
+
+@builtin('stream-map')
+def lisp_stream_map(fn, stream):
+    """Return the stream of the results of calling fn on each element of stream."""
+    return streams.stream_map(as_function(fn), stream)
+
+
+@builtin('stream-filter')
+def lisp_stream_filter(fn, stream):
+    """Return the stream of the elements of stream fn returns true for."""
+    return streams.stream_filter(as_function(fn), stream)
+
+
+@builtin('stream-take')
+def lisp_stream_take(count, stream):
+    """Return the stream of the first count elements of stream."""
+    return streams.stream_take(count, stream)
+
+
+@builtin('stream-drop')
+def lisp_stream_drop(count, stream):
+    """Return the stream of the elements of stream after the first count."""
+    return streams.stream_drop(count, stream)
+
+
+@builtin('stream-reduce')
+def lisp_stream_reduce(fn, init, stream):
+    """Combine init and the elements of stream by calling fn on the result so far and the next element."""
+    as_function(fn)
+    res = init
+    for item in streams.iterate(stream):
+        res = fn(res, item)
+    return res
+
+
+@builtin('stream-to-list')
+def lisp_stream_to_list(stream):
+    """Return a list of the elements of stream."""
+    return data.ConsCell.fromList(list(streams.iterate(stream)))
+
+
+specialize(lisp_add, 2, operator.add)
+specialize(lisp_sub, 2, operator.sub)
+specialize(lisp_mul, 2, operator.mul)
+specialize(lisp_div, 2, operator.truediv)
+specialize(lisp_lt, 2, compare_pair(operator.lt))
+specialize(lisp_gt, 2, compare_pair(operator.gt))
+specialize(lisp_num_eq, 2, compare_pair(operator.eq))
+
+
+class TailCall:  # pylint: disable-msg=R0903
+    """
+    TailCall is returned by a special form to have its value computed by evaluating expr in env.
+
+    Evaluating an expression in tail position this way, instead of calling
+    eval_expr on it, leaves the Python stack as deep as it was before the
+    special form was entered, so loops written as tail recursion can run
+    for as long as they like.
+
+    If pushed is True, an entry for the call expr belongs to has been pushed
+    onto the interpreter's call stack, and whoever evaluates expr pops it.
+    """
+
+    __slots__ = ['expr', 'env', 'pushed']
+
+    expr: Any
+    env: data.Environment
+    pushed: bool
+
+    def __init__(self, expr: Any, env: data.Environment, pushed: bool = False) -> None:
+        self.expr = expr
+        self.env = env
+        self.pushed = pushed
+
+
+class Procedure:
+    """
+    Procedure is what the tree walker needs to call a Function.
+
+    The parameter list is taken apart once, when the Procedure is
+    created, and the body is kept as a tuple of the forms up to the
+    first top-level return form.
+    """
+
+    __slots__ = ['interp', 'names', 'rest', 'body']
+
+    interp: 'LispInterpreter'
+    names: tuple[str, ...]
+    rest: Optional[str]
+    body: tuple
+
+    def __init__(self, interp: 'LispInterpreter', formals: Any, body: Any) -> None:
+        self.interp = interp
+        self.names, self.rest = compiler.parse_formals(formals)
+        interp.shadow(self.names + ((self.rest,) if self.rest is not None else ()))
+        exprs = compiler.forms(body)
+        for idx, expr in enumerate(exprs):
+            if isinstance(expr, data.ConsCell) and expr.head is RETURN:
+                exprs = exprs[:idx+1]
+                break
+        self.body = tuple(exprs)
+
+    def bind(self, env: data.Environment, args: list) -> data.Environment:
+        """Return a new Environment below env with the parameters bound to args."""
+        count: Final[int] = len(self.names)
+        if len(args) < count:
+            raise error.LispError(
+                "arg list is shorter than the list of formal arguments!")
+        frame: Final[data.Environment] = data.Environment(env)
+        frame.data = dict(zip(self.names, args))
+        if self.rest is not None:
+            frame.data[self.rest] = data.ConsCell.fromList(args[count:])
+        return frame
+
+    def enter(self, env: data.Environment, args: list, call: Any = None) -> Any:
+        """
+        Run the body with args bound to the parameters, up to the form in tail position.
+
+        call is pushed onto the call stack while the body runs, and the
+        TailCall that is returned has to pop it.
+        """
+        if self.interp.budget is not None:
+            self.interp.budget.tick()
+        if not self.body:
+            return None
+        frame: Final[data.Environment] = self.bind(env, args)
+        calls: Final[list] = self.interp.calls
+        calls.append(call)
+        try:
+            for expr in self.body[:-1]:
+                self.interp.walk(expr, frame)
+        except BaseException:
+            calls.pop()
+            raise
+        return TailCall(self.body[-1], frame, True)
+
+    def invoke(self, env: data.Environment, args: list, call: Any = None) -> Any:
+        """Run the body with args bound to the parameters, in an Environment below env, and return its value."""
+        res = self.enter(env, args, call)
+        if res.__class__ is TailCall:
+            try:
+                return self.interp.walk(res.expr, res.env)
+            finally:
+                self.interp.calls.pop()
+        return res
+
+
+class MacroCache:
+    """
+    MacroCache remembers what each macro call expanded to.
+
+    Expansions are keyed by the call site, i.e. the list that calls the
+    macro, and are only valid as long as the macro they were made with is
+    still the one that was used. So a call site sees a new definition of
+    the macro the next time it is run, and entries for the old definition
+    are dropped when it is replaced via defmacro.
+
+    Expanding a macro is assumed to depend only on the call, not on
+    the values of any variables. Macros for which that does not hold
+    see the variables as they were when the call was first expanded.
+
+    The cache keeps at most max_size call sites, and drops the one used
+    least recently to make room for a new one, so forms that are evaluated
+    once, like those typed into the REPL, are not kept alive forever.
+    """
+
+    __slots__ = ['sites', 'max_size', 'expansions', 'hits', 'lock']
+
+    sites: OrderedDict[int, tuple[data.ConsCell, data.ConsCell, Any]]
+    max_size: int
+    expansions: int
+    hits: int
+
+    def __init__(self, max_size: int = MACRO_CACHE_SIZE) -> None:
+        # Keyed by the id of the call site. The call site and the macro are
+        # kept alongside the expansion, so an id that is reused by a new
+        # list is not mistaken for the old one.
+        self.sites = OrderedDict()
+        self.max_size = max_size
+        self.expansions = 0
+        self.hits = 0
+        # Taken to change which entries there are, so an expansion with a
+        # macro that is being invalidated is not stored after all.
+        self.lock: Final[threading.Lock] = threading.Lock()
+
+    def lookup(self, op: data.ConsCell, lst: data.ConsCell) -> Optional[Any]:
+        """Return the cached expansion of the call lst to the macro op, or None."""
+        key: Final[int] = id(lst)
+        entry = self.sites.get(key)
+        if entry is not None and entry[0] is lst and entry[1] is op:
+            self.hits += 1
+            try:
+                self.sites.move_to_end(key)
+            except KeyError:
+                # Another thread has just dropped it.
+                pass
+            return entry
+        return None
+
+    def store(self, op: data.ConsCell, lst: data.ConsCell, expansion: Any) -> None:
+        """Remember that the call lst to the macro op expanded to expansion."""
+        self.expansions += 1
+        with self.lock:
+            self.sites[id(lst)] = (lst, op, expansion)
+            if len(self.sites) > self.max_size:
+                self.sites.popitem(last=False)
+
+    def invalidate(self, op: Any) -> None:
+        """Forget all expansions made with the macro op."""
+        # A lookup in another thread may move an entry meanwhile, so this
+        # works on a copy of the entries.
+        with self.lock:
+            self.sites = OrderedDict((key, entry) for key, entry in list(self.sites.items()) if entry[1] is not op)
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of expansions, cache hits and cached call sites."""
+        return {
+            "expansions": self.expansions,
+            "hits": self.hits,
+            "sites": len(self.sites),
+        }
+
+
+class CallCache:
+    """
+    CallCache remembers which global Function, lambda list or macro each call site called.
+
+    Entries are keyed by the call site, and are only valid as long as the
+    global Environment the call site runs in has not changed what any of
+    its names that were bound to something callable are bound to, which
+    its version tells. A name that is bound by a parameter, a let, a do, a
+    macro or a local setq anywhere can be shadowed by a local variable, so
+    calls to it are not cached at all, and entries for it are dropped when
+    a local variable of that name first appears.
+
+    The cache keeps at most max_size call sites. When it is full, the one
+    stored first is dropped to make room; a hit does not move an entry, so
+    looking up a call site stays a single dict lookup. A call site that is
+    still in use is simply stored again the next time it runs.
+    """
+
+    __slots__ = ['sites', 'max_size', 'shadowed', 'hits', 'misses', 'lock']
+
+    sites: dict[int, tuple[data.ConsCell, data.Environment, int, Any]]
+    max_size: int
+    shadowed: set[str]
+    hits: int
+    misses: int
+
+    def __init__(self, max_size: int = CALL_CACHE_SIZE) -> None:
+        # Keyed by the id of the call site. The call site is kept alongside,
+        # with the global Environment and its version the entry is valid for.
+        self.sites = {}
+        self.max_size = max_size
+        self.shadowed = set()
+        self.hits = 0
+        self.misses = 0
+        # Taken to change which entries there are, so a call to a name that
+        # is being shadowed is not stored after all. Lookups do without it.
+        self.lock: Final[threading.Lock] = threading.Lock()
+
+    def store(self, lst: data.ConsCell, root: data.Environment, op: Any) -> None:
+        """Remember that the call lst called op, which it found in the global Environment root."""
+        self.misses += 1
+        if not data.callablep(op):
+            return
+        with self.lock:
+            if lst.head.value in self.shadowed:
+                return
+            sites: Final[dict] = self.sites
+            if len(sites) >= self.max_size:
+                del sites[next(iter(sites))]
+            sites[id(lst)] = (lst, root, root.version, op)
+
+    def shadow(self, names: Iterable[str]) -> None:
+        """Note that names are bound by a local Environment, and forget the calls to any of them."""
+        for name in names:
+            if name not in self.shadowed:
+                with self.lock:
+                    self.shadowed.add(name)
+                    self.sites = {key: entry for key, entry in self.sites.items() if entry[0].head.value != name}
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of cache hits and misses, and of cached call sites."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "sites": len(self.sites),
+        }
+
+
+class CallStack(threading.local):
+    """
+    CallStack is a Lisp call stack of its own for each thread.
+
+    It supports the list operations the interpreter uses on the call
+    stack, so it can take the place of a list in interpreters that are
+    used by several threads at once.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.stack: list = []
+
+    def __len__(self) -> int:
+        return len(self.stack)
+
+    def __iter__(self):
+        return iter(self.stack)
+
+    def __getitem__(self, idx: int) -> Any:
+        return self.stack[idx]
+
+    def __setitem__(self, idx: int, value: Any) -> None:
+        self.stack[idx] = value
+
+    def __delitem__(self, idx: int) -> None:
+        del self.stack[idx]
+
+    def append(self, call: Any) -> None:
+        """Push call onto the stack of the current thread."""
+        self.stack.append(call)
+
+    def pop(self) -> Any:
+        """Pop the innermost call off the stack of the current thread."""
+        return self.stack.pop()
+
+
+class LispInterpreter:  # pylint: disable-msg=R0904
     """LispInterpreter interprets Lisp code."""
 
-    __slots__ = ['debug', 'gensym_counter', 'env']
+    __slots__ = ['tracer', 'gensym_counter', 'env', 'forms', 'builtins', 'compiler', 'macros',
+                 'procedures', 'calls', 'sampler', 'memos', 'form_cache', 'pool', 'gensym_lock',
+                 'budget', 'optimizer', 'call_cache']
 
-    def __init__(self, env=None, counter=0):
+    def __init__(self, env=None, counter=0, compiled=False, form_cache=False,  # pylint: disable-msg=R0913,R0917
+                 threadsafe=False, optimize=False):
         assert env is None or isinstance(env, data.Environment)
-        self.debug = False
+        # If a Tracer is installed, walk reports each step of the evaluation
+        # to it, see krylisp.tracer.
+        self.tracer: Optional[Tracer] = None
+        # The Lisp call stack: for every function or macro call that is
+        # running, the form it was called with, innermost last. Calls in
+        # tail position replace their caller. If threadsafe is True, each
+        # thread has a call stack of its own, see context.
+        self.calls: Union[list, CallStack] = CallStack() if threadsafe else []
+        self.sampler: Optional[Sampler] = None
+        # The Memos of the global Functions that have been memoized, by name,
+        # for each global Environment, so every context has its own.
+        self.memos: weakref.WeakKeyDictionary[data.Environment, dict[str, memo.Memo]] = weakref.WeakKeyDictionary()
         self.env = data.Environment() if env is None else env
         self.gensym_counter = counter
+        self.gensym_lock: Final[threading.Lock] = threading.Lock()
+        self.builtins: dict[str, Callable[..., Any]] = dict(BUILTINS)
+        self.forms: dict[str, Handler] = {name: builtin_handler(fn) for name, fn in BUILTINS.items()}
+        self.forms.update(SPECIAL_FORMS)
+        self.macros = MacroCache()
+        # Procedures for lambda lists that are called without having been
+        # evaluated, and for compiled Functions that are walked while
+        # tracing, keyed by the id of the list or Function. That object is
+        # stored alongside, so an id that is reused by a new one is not
+        # mistaken for the old one. At most PROCEDURE_CACHE_SIZE are kept,
+        # the oldest is dropped to make room for a new one.
+        self.procedures: dict[int, tuple[Union[data.ConsCell, data.Function], Procedure]] = {}
+        # If compiled is True, forms are compiled to closures before they are
+        # evaluated instead of being walked by eval_list.
+        self.compiler = compiler.Compiler(self) if compiled else None
+        # What the call sites walked by eval_list call, see CallCache.
+        # Compiled code resolves global names when it is compiled, and
+        # keeps local variables in Frames the CallCache knows nothing
+        # about, so it has none.
+        self.call_cache: Optional[CallCache] = None if compiled else CallCache()
+        # If form_cache is True, load_file caches the forms it reads in the
+        # cache folder, see krylisp.formcache. It is off unless asked for,
+        # since the cache folder fills up with every file that is loaded.
+        self.form_cache: Optional[FormCache] = FormCache(common.path.cache()) if form_cache else None
+        # The worker processes for pmap and preduce, started when they are
+        # first needed.
+        self.pool: Optional[parallel.Pool] = None
+        # The Budget of the evaluation that is running, if it has one, see
+        # eval_budget.
+        self.budget: Optional[Budget] = None
+        # If optimize is True, the forms read by load_file and the REPL have
+        # their constant parts computed before they are evaluated, see
+        # krylisp.optimizer. Set optimizer to None to turn that off.
+        self.optimizer: Optional[Optimizer] = Optimizer(self) if optimize else None
+
+    def register_form(self, name: str, handler: Handler) -> None:
+        """Install handler as the special form name in this interpreter."""
+        name = sys.intern(name.lower())
+        self.forms[name] = handler
+        self.builtins.pop(name, None)
+
+    def register_builtin(self, name: str, fn: Callable[..., Any]) -> None:
+        """Install fn as the builtin function name in this interpreter."""
+        name = sys.intern(name.lower())
+        self.forms[name] = builtin_handler(fn)
+        self.builtins[name] = fn
+
+    def gensym(self) -> str:
+        """Return a new symbol name that is different from all others, even if several threads ask at once."""
+        with self.gensym_lock:
+            self.gensym_counter += 1
+            counter = self.gensym_counter
+        return f"#:{counter:-012d}"
+
+    def freeze(self) -> None:
+        """Make the global Environment read-only, so contexts can share it."""
+        self.env.get_global().freeze()
 
-    def dbg(self, *args):
-        """Print a debug message if the debug flag is set."""
-        if self.debug:
-            moan(*args)
+    def context(self) -> data.Environment:
+        """
+        Return a new global Environment to evaluate forms in, on top of the frozen global Environment.
+
+        A context sees every definition of the global Environment, which is
+        frozen if it is not already, without copying any of them. Whatever
+        is defined or set in the context stays there. Contexts can be used
+        by different threads at the same time if the interpreter was
+        created with threadsafe=True, as long as each one is only used by
+        one thread at a time.
+        """
+        genv: Final[data.Environment] = self.env.get_global()
+        if not genv.frozen:
+            genv.freeze()
+        return genv.overlay()
 
     def warn(self, *args):
         """Print a warning."""
@@ -73,8 +852,6 @@ class LispInterpreter:
         if env is None:
             env = self.env
 
-        self.dbg("Evaluating atom {0}", atom)
-
         at_val = None
 
         if isinstance(atom, data.Atom):
@@ -89,14 +866,23 @@ class LispInterpreter:
             return data.EMPTY_LIST
         # Da ein Atom ja kein String ist, sollte ich überlegen, ob ich nicht
         # schon beim Erzeugen eines Atoms prüfen sollte, ob das eine Zahl ist...
+        if isinstance(at_val, (int, float)):
+            return at_val
         if at_val == 't':
             return data.Atom('t')
         if at_val.startswith(":"):
             return atom
-        if isinstance(at_val, (int, float)):
-            return at_val
         return env[at_val]
 
+    def eval_args(self, lst: data.ConsCell, env: data.Environment) -> list:
+        """Evaluate the arguments of the form lst from left to right."""
+        args = []
+        node = lst.tail
+        while node is not None:
+            args.append(self.eval_expr(node.head, env))
+            node = node.tail
+        return args
+
     # Ich muss mir noch überlegen, wie viel von der Sprache ich fest in den
     # Interpreter einbauen bzw. auf der reinen Lisp-Ebene implementieren will.
     # Aus Performance-Gründen wäre es wohl sinnvoller, so viel wie möglich in Python
@@ -116,240 +902,34 @@ class LispInterpreter:
     #
     # Freitag, 08. 10. 2010, 01:36
     # Ich glaube, ich muss progn als special form implementieren!!!
-    def eval_list(self, lst, env=None) -> Union[data.Atom, data.ConsCell, data.Function, float, str]:  # pylint: disable-msg=R0911,R0912 # noqa: E501
+    def eval_list(self, lst, env=None) -> Union[data.Atom, data.ConsCell, data.Function, float, str]:
         """Evaluate a list."""
         assert env is None or isinstance(env, data.Environment)
-        self.dbg("Evaluating list {0}", lst)
 
         if env is None:
             env = self.env
 
+        if not (data.nullp(lst) or isinstance(lst, data.ConsCell)):
+            raise error.LispError(f"List is neither nil nor a Lisp List: {lst}")
+        return self.walk(lst, env)
+
+    def step_list(self, lst, env) -> Any:  # pylint: disable-msg=R0911,R0912
+        """
+        Evaluate a list, except for the expression in tail position.
+
+        If the value of lst is that of another expression, return a TailCall
+        for that expression instead of evaluating it.
+        """
+
         if data.nullp(lst):
             return data.EMPTY_LIST
 
         if isinstance(lst, data.ConsCell):
-            if lst.car() == '+':
-                return sum(self.eval_expr(x, env) for x in lst.cdr())
-            if lst.car() == '-':
-                lst = lst.cdr()
-                res = self.eval_expr(lst.car(), env)
-                for val in lst.cdr():
-                    res -= self.eval_expr(val, env)
-                return res
-            if lst.car() == '*':
-                return reduce(operator.mul, [self.eval_expr(x, env) for x in lst.cdr()])
-            if lst.car() == '**':
-                return self.eval_expr(lst[1], env) ** self.eval_expr(lst[2], env)
-            if lst.car() == '/':
-                return reduce(operator.truediv, [self.eval_expr(x, env) for x in lst.cdr()])
-            if lst.car() == 'mod':
-                return self.eval_expr(lst[1], env) % self.eval_expr(lst[2], env)
-            if lst.car() == 'sqrt':
-                num_value = get_num(self.eval_expr(lst[1], env))
-                return math.sqrt(num_value)
-            if lst.car() == '<':
-                lst = lst.cdr()
-                while not data.nullp(lst.cdr()):
-                    if self.eval_expr(lst.car(), env) >= self.eval_expr(data.cadr(lst), env):
-                        return data.ConsCell(None, None)
-                    lst = lst.cdr()
-                return data.Atom('t')
-            if lst.car() == '>':
-                lst = lst.cdr()
-                while not data.nullp(lst.cdr()):
-                    if self.eval_expr(lst.car(), env) <= self.eval_expr(data.cadr(lst), env):
-                        return data.ConsCell(None, None)
-                    lst = lst.cdr()
-                return data.Atom('t')
-            if lst.car() == '=':
-                lst = lst.cdr()
-                while not data.nullp(lst.cdr()):
-                    if self.eval_expr(lst.car(), env) != self.eval_expr(data.cadr(lst), env):
-                        return data.ConsCell(None, None)
-                    lst = lst.cdr()
-                return data.Atom('t')
-            if lst.car() == 'eq':
-                if self.eval_expr(lst[1], env) == self.eval_expr(lst[2], env):
-                    return data.Atom('t')
-                return data.Atom('nil')
-            if lst.car() == 'if':
-                if len(lst) != 4:
-                    raise error.LispError(
-                        "'if' needs exactly three parameters: condition, then-part, else-part!")
-
-                self.dbg("Evaluating condition of if-expression.")
-                cond = not data.nullp(self.eval_expr(lst[1], env))
-                self.dbg("--> {0}", cond)
-                if cond:
-                    self.dbg("if-condition is true.")
-                    return self.eval_expr(lst[2], env)
-                self.dbg("if-condition is false.")
-                return self.eval_expr(lst[3], env)
-            if lst.car() == 'return':
-                assert len(lst) == 2
-                return self.eval_expr(lst[1], env)
-            if lst.car() == 'print':
-                assert len(lst) == 2
-                val = self.eval_expr(lst[1], env)
-                print(val)
-                return val
-            # and und or sollte ich vielleicht besser mit einer for-Schleife implementieren...
-            if lst.car() == 'and':
-                val = data.EMPTY_LIST
-                for expr in lst.cdr():
-                    val = self.eval_expr(expr, env)
-                    if data.nullp(val):
-                        return data.EMPTY_LIST
-                return val
-            if lst.car() == 'or':
-                val = data.EMPTY_LIST
-                for expr in lst.cdr():
-                    val = self.eval_expr(expr, env)
-                    if not data.nullp(val):
-                        return val
-                return data.EMPTY_LIST
-            if lst.car() == 'not':
-                return data.Atom('nil') \
-                    if not data.nullp(self.eval_expr(lst[1], env)) \
-                    else data.Atom('t')
-            if lst.car() == 'quote':
-                return lst[1]
-            if lst.car() in ('quit', 'exit'):
-                sys.exit(0)
-            if lst.car() == 'cons':
-                # (cons 1 ()) ergibt im Moment (1 None)!!!
-                arg1 = self.eval_expr(lst[1], env)
-                arg2 = self.eval_expr(lst[2], env)
-                if not data.nullp(arg2):
-                    return data.cons(arg1, arg2)
-                return data.ConsCell(arg1, None)
-            if lst.car() == 'car':
-                arg = self.eval_expr(lst[1], env)
-                if not data.listp(arg):
-                    raise error.LispError("Argument to car must be a list!")
-                if data.nullp(arg):
-                    return data.ConsCell(None, None)
-                return arg[0]
-            if lst.car() == 'cdr':
-                arg = self.eval_expr(lst[1], env)
-                if not data.listp(arg):
-                    raise error.LispError("Argument to cdr must be a list!")
-                if data.nullp(arg):
-                    return data.ConsCell(None, None)
-                return arg.cdr()
-            if lst.car() == 'listp':
-                return data.Atom('t') if data.listp(self.eval_expr(lst[1], env)) \
-                    else data.Atom('nil')
-            if lst.car() == 'null':
-                return data.Atom('t') if data.nullp(self.eval_expr(lst[1], env)) \
-                    else data.Atom('nil')
-            if lst.car() == 'list':
-                return data.ConsCell.fromList([self.eval_expr(x, env) for x in lst.cdr()])
-            if lst.car() == 'atom':
-                arg = self.eval_expr(lst[1], env)
-                if isinstance(arg, (data.Atom, int, float)) or data.nullp(arg):
-                    return data.Atom('t')
-                return data.Atom('nil')
-            if lst.car() == 'lambda':
-                return lst
-            if lst.car() == 'defun':
-                assert len(lst.cdr()) >= 3, \
-                    "A Function definition needs at least three arguments (name, arglist, body)"
-                lst = lst.cdr()
-                env.get_global()[lst[0]] = data.ConsCell(data.Atom("lambda"), lst.cdr())
-                return lst[0]
-            if lst.car() == 'defmacro':
-                assert len(lst.cdr()) >= 3, \
-                    "A Macro definition needs at least three arguments (name, arglist, body)"
-                macro = lst.cdr()
-                env.get_global()[macro[0]] = data.ConsCell(data.Atom('macro'), macro.cdr())
-                # warn("Macros are not implemented yet!")
-                return macro[0]
-            if lst.car() == 'backquote':
-                return self.eval_backquote(lst, env)
-            if lst.car() == 'gensym':
-                self.gensym_counter += 1
-                return f"#:{self.gensym_counter:-012d}"
-            if lst.car() == 'let':
-                let_env = {}
-                for symbol, value in lst[1]:
-                    assert isinstance(symbol, (data.Atom, str)), \
-                        "A let-variable must be a symbol!"
-                    let_env[symbol] = self.eval_expr(value, env)
-                lenv = data.Environment(env, let_env)
-                res = data.NIL
-                for expr in lst.cdr().cdr():
-                    res = self.eval_expr(expr, lenv)
-                return res
-            if lst.car() == 'setq':
-                assert even(len(lst.cdr())), \
-                    "The parameters to setq must be a list of symbols and values."
-                lst = lst.cdr()
-                val = None
-                while not data.nullp(lst):
-                    sym = lst.car()
-                    lst = lst.cdr()
-                    val = lst.car()
-                    lst = lst.cdr()
-                    if not isinstance(sym, data.Atom):
-                        raise error.LispError(f"{sym} is not a symbol!")
-                    env[sym] = self.eval_expr(val, env)
-                return val
-            if lst.car() == 'apply':
-                assert len(lst) == 3, "Apply takes exactly two arguments (function and arglist)!"
-                # Wenn lst[2] eine Liste ist, darf ich lst[1] nicht einfach davor consen... ;-/
-                return self.eval_expr(data.cons(lst[1], self.eval_expr(lst[2], env)), env)
-            if lst.car() == 'do':
-                if len(lst) < 3:
-                    raise error.LispError(
-                        "do needs at least two arguments (init-list and end-list)!")
-                var_dict = {}
-                update_forms = {}
-                body = lst.cdr().cdr().cdr()
-
-                self.dbg("Evaluating do-loop: {0}", lst)
-
-                end_expr = lst[2][0]
-                result_expr = lst[2][1]
-
-                if not data.nullp(lst[1]):
-                    for var_def in lst[1]:
-                        sym = var_def[0]
-                        init_val = var_def[1]
-                        update = var_def[2]
-
-                        if isinstance(sym, data.Atom):
-                            sym = sym.value
-
-                        var_dict[sym] = self.eval_expr(init_val, env)
-                        update_forms[sym] = update
-
-                loop_env = data.Environment(env, var_dict)
-
-                while data.nullp(self.eval_expr(end_expr, loop_env)):
-                    for expr in body:
-                        self.eval_expr(expr, loop_env)
-                    for sym, expr in update_forms.items():
-                        loop_env[sym] = self.eval_expr(expr, loop_env)
-
-                return self.eval_expr(result_expr, loop_env)
-            if lst.car() == 'eval':
-                return self.eval_expr(lst[2], env)
-            if lst.car() == 'time':
-                before: Final[float] = time.time()
-                res = self.eval_expr(lst[1], env)
-                after: Final[float] = time.time()
-                delta: Final[float] = after - before
-                print(f"Evaluating {lst[1]} took {delta} seconds.")
-                return res
-            if lst.car() == 'load':
-                path = lst[1]
-                return load_file(path, env)
-            if lst.car() == 'dbg':
-                arg = self.eval_expr(lst[1], env)
-                self.dbg("Setting debug flag to {0}", arg)
-                self.debug = not data.nullp(arg)
-                return data.Atom('t') if self.debug else data.Atom('nil')
+            head = lst.head
+            if isinstance(head, data.Atom):
+                handler = self.forms.get(head.value)
+                if handler is not None:
+                    return handler(self, lst, env)
 
             # Ich habe so die Idee, dass ich eine Kombination aus den
             # Konventionen für Common Lisp und Scheme verwende:
@@ -362,76 +942,35 @@ class LispInterpreter:
             # Das könnte ich natürlich erstmal faken...
             # Mmmh, damit Makros richtig funktionieren, darf ich nicht alle
             # Argumente evaluieren, bevor dingsen...
-            op = self.eval_expr(lst[0], env)
-            if not (isinstance(op, data.ConsCell) and isinstance(op[0], data.Atom)):
+            cache = self.call_cache
+            if cache is not None and head.__class__ is data.Atom:
+                entry = cache.sites.get(id(lst))
+                root = env.root
+                if entry is not None and entry[0] is lst and entry[1] is root and entry[2] == root.version:
+                    cache.hits += 1
+                    op = entry[3]
+                else:
+                    op = self.eval_expr(head, env)
+                    cache.store(lst, root, op)
+            else:
+                op = self.eval_expr(lst[0], env)
+            if isinstance(op, data.Function):
+                args = self.eval_args(lst, env)
+                if op.code.__class__ is Procedure:
+                    return op.code.enter(op.env, args, lst)
+                if self.tracer is not None and op.code.__class__ is compiler.Lambda:
+                    # Walk compiled Functions as well, so the tracer sees
+                    # what happens inside them.
+                    return self.procedure(op).enter(op.env, args, lst)
+                return op.code.invoke(op.env, args, lst)
+            if not (isinstance(op, data.ConsCell) and isinstance(op.head, data.Atom)):
                 return lst
-            if op[0] == 'lambda':
-                arg_list = data.ConsCell.fromList(
-                    [self.eval_expr(x, env) for x in lst.cdr()]) \
-                    if not data.nullp(lst.cdr()) \
-                    else data.ConsCell(None, None)
-                # Okay, arg_list ist also die Liste der formalen Parameter.
-                formal_args = op[1]
-                arg_dict = {}
-                # Ich müsste hier irgendwie mit &rest-Argumenten zurecht kommen...
-                # Dafür müsste ich aber meine Schleife anders gestalten...
-                # for arg_name, arg_val in map(lambda x,y: (x,y), formal_args, arg_list):
-                #     #if arg_name == '&rest':
-                #     arg_dict[arg_name] = eval_expr(arg_val, env)
-                while not (data.nullp(formal_args) or data.nullp(arg_list)):
-                    arg_name = formal_args.car()
-                    if arg_name == '&rest':
-                        arg_dict[formal_args[1]] = arg_list
-                        formal_args = None
-                        break
-                    arg_dict[arg_name] = arg_list.car()
-                    arg_list = arg_list.cdr()
-                    formal_args = formal_args.cdr()
-
-                # Dann muss ich jetzt das neue Environment aus den Parametern
-                # erzeugen und dann den Funktionskörper auswerten...
-                funcall_env = data.Environment(env, arg_dict)
-                if not data.nullp(formal_args):
-                    raise error.LispError(
-                        "arg list is shorter than the list of formal arguments!")
-                self.dbg("Function call environment is {0}", funcall_env)
-                self.dbg("Local environment for function call: {0}", funcall_env.data)
-                res = None
-                for expr in op.cdr().cdr():
-                    res = self.eval_expr(expr, funcall_env)
-                    self.dbg("Sub-expression {0} evaluates to {1}", expr, res)
-                    if isinstance(expr, data.ConsCell) and expr[0] == 'return':
-                        break
-                return res
-            if op[0] == 'macro':
-                # Hier muss ich zwei Mal evaluieren, einmal, um das Macro zu
-                # expandieren, und einmal, um den resultierenden Code zu
-                # evaluieren. Mmmmh...
-                expand_dict = {}
-                formal_args = op[1]
-                arg_list = lst.cdr()
-                while not data.nullp(formal_args):
-                    arg_name = formal_args.car()
-                    if arg_name in ('&rest', '&body'):
-                        expand_dict[formal_args[1]] = arg_list
-                        break
-                    expand_dict[arg_name] = arg_list.car()
-                    arg_list = arg_list.cdr()
-                    formal_args = formal_args.cdr()
-                macro_env = data.Environment(env, expand_dict)
-                res = []
-
-                # Jaaaa, hier muss ich wieder darauf auchten, dass die
-                # evaluierten Ausdrücke vermutlich Listen sind, und dass ich
-                # die nicht ohne weiteres an einander consen kann...
-                # for stmt in reversed(op.cdr().cdr()):
-                #     res = data.ConsCell(eval_macro_expr(stmt, macro_env), res)
-                for subexpr in op.cdr().cdr():
-                    res.append(self.eval_macro_expr(subexpr, macro_env))
-
-                res = data.ConsCell.fromList(res) if len(res) != 1 else res[0]
-
-                self.dbg("MMM Macro\n\t{0}\nexpands to\n\t--> {1}", op, res)
+            if op.head is LAMBDA:
+                # A lambda list that was not evaluated, e.g. a quoted one, does
+                # not know where it was created, so it runs below the caller.
+                return self.procedure(op).enter(env, self.eval_args(lst, env), lst)
+            if op.head is MACRO:
+                res = self.macroexpand(op, lst, env)
 
                 # Wenn alles läuft, wie ich mir das vorstelle, ist res an
                 # dieser Stelle das expandierte Makro. Dann müsste ich den
@@ -439,11 +978,220 @@ class LispInterpreter:
                 # wirklich im Parser statt finden, oder ich müsste Reader und
                 # Evaluator eleganter verknüpfen.
                 # raise error.LispError, "Macros are not implemented, yet."
-                return self.eval_expr(res, env)
+                self.calls.append(lst)
+                return TailCall(res, env, True)
             return lst
 
         raise error.LispError(f"List is neither nil nor a Lisp List: {lst}")
 
+    def procedure(self, op: Union[data.ConsCell, data.Function]) -> Procedure:
+        """Return the Procedure for the lambda list or Function op."""
+        entry = self.procedures.get(id(op))
+        if entry is None or entry[0] is not op:
+            if isinstance(op, data.Function):
+                entry = (op, Procedure(self, op.args, op.body))
+            else:
+                entry = (op, Procedure(self, op[1], op.tail.tail))
+            procedures: Final[dict] = self.procedures
+            if len(procedures) >= PROCEDURE_CACHE_SIZE:
+                try:
+                    del procedures[next(iter(procedures))]
+                except (KeyError, StopIteration, RuntimeError):
+                    # Another thread has changed them meanwhile.
+                    pass
+            procedures[id(op)] = entry
+        return entry[1]
+
+    def macroexpand(self, op: data.ConsCell, lst: data.ConsCell, env: data.Environment) -> Any:
+        """Return the expansion of the call lst to the macro op, expanding it only once."""
+        entry = self.macros.lookup(op, lst)
+        if entry is not None:
+            return entry[2]
+        res = self.expand_macro(op, lst, env)
+        self.macros.store(op, lst, res)
+        if self.tracer is not None:
+            self.tracer.expand(op, lst, res)
+        return res
+
+    def define_function(self, name: Any, fn: data.Function, env: data.Environment) -> None:
+        """Bind name to the Function fn."""
+        # A memoized Function may call the one that is being redefined, so
+        # none of the values they remember can be trusted any more.
+        genv: Final[data.Environment] = env.get_global()
+        memos: Final[Optional[dict[str, memo.Memo]]] = self.memos.get(genv)
+        if memos is not None:
+            memos.pop(compiler.symbol_name(name), None)
+            for entry in memos.values():
+                entry.clear()
+        genv[name] = fn
+
+    def function_code(self, fn: data.Function) -> Union[Procedure, compiler.Lambda]:
+        """Return the code this interpreter runs fn with, as if fn had been created by it."""
+        if self.compiler is None:
+            return Procedure(self, fn.args, fn.body)
+        return compiler.Lambda(self.compiler, fn.args, fn.body, self.compiler.scope_of(fn.env))
+
+    def save_image(self, path: str, sources: Iterable[str] = ()) -> None:
+        """Save the global Environment to the image path. It was built by loading the files sources."""
+        image.save(self, path, sources)
+
+    def load_image(self, path: str, sources: Iterable[str] = ()) -> bool:
+        """
+        Load the global Environment from the image path.
+
+        If there is no usable image, because it is missing or stale, load
+        the files sources instead and save a new image to path. Return True
+        if the image was loaded.
+        """
+        sources = tuple(sources)
+        try:
+            image.load(self, path, sources)
+            return True
+        except (OSError, error.ImageError):
+            if not sources:
+                raise
+        for src in sources:
+            load_file(self, src)
+        image.save(self, path, sources)
+        return False
+
+    def memoize(self, name: Any, max_size: Optional[int] = memo.DEFAULT_SIZE,
+                env: Optional[data.Environment] = None) -> data.Function:
+        """Replace the global Function name of the global Environment of env by a memoized one, and return that."""
+        sym: Final[str] = compiler.symbol_name(name)
+        genv: Final[data.Environment] = (self.env if env is None else env).get_global()
+        fn = genv[sym]
+        if not isinstance(fn, data.Function):
+            raise error.LispError(f"{sym} is not a function!")
+        if fn.code.__class__ is memo.Memo:
+            fn = fn.code.fn
+        fn = memo.memoize(fn, max_size)
+        genv[sym] = fn
+        self.memos.setdefault(genv, {})[sym] = fn.code
+        return fn
+
+    def memo_stats(self, name: Any, env: Optional[data.Environment] = None) -> dict[str, Any]:
+        """Return the statistics of the memoized Function name in the global Environment of env."""
+        sym: Final[str] = compiler.symbol_name(name)
+        fn: Final[Any] = (self.env if env is None else env).get_global().data.get(sym)
+        if not (isinstance(fn, data.Function) and fn.code.__class__ is memo.Memo):
+            raise error.LispError(f"{sym} is not memoized!")
+        return fn.code.stats()
+
+    def parallel_pool(self) -> parallel.Pool:
+        """Return the pool of worker processes, starting it if necessary."""
+        if self.pool is None:
+            self.pool = parallel.Pool(self)
+        return self.pool
+
+    def close_pool(self) -> None:
+        """Stop the worker processes, if there are any."""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
+    def pmap(self, fn: Any, items: Iterable, chunk_size: Optional[int] = None,
+             env: Optional[data.Environment] = None) -> list:
+        """Return the list of fn applied to each of items, computed by the worker processes in the global Environment of env."""
+        return self.parallel_pool().map(fn, list(items), chunk_size, env)
+
+    def preduce(self, fn: Any, items: Iterable, initial: Any = None, chunk_size: Optional[int] = None,  # pylint: disable-msg=R0913,R0917
+                env: Optional[data.Environment] = None) -> Any:
+        """Return items combined with the associative function fn, computed by the worker processes in the global Environment of env."""
+        return self.parallel_pool().reduce(fn, list(items), initial, chunk_size, env)
+
+    def parallel_args(self, lst: data.ConsCell, env: data.Environment, optional: int) -> tuple:
+        """
+        Return the function, the list, the optional arguments and the chunk size pmap or preduce was called with.
+
+        A builtin is passed to the workers by name, like apply calls it.
+        """
+        items: Final[list] = list(lst)
+        if len(items) < 3:
+            raise error.LispError(f"{items[0]} takes a function and a list!")
+        name: Final[Any] = items[1]
+        fn = name.value if isinstance(name, data.Atom) and name.value in self.builtins \
+            else self.eval_expr(name, env)
+        seq = self.eval_expr(items[2], env)
+        rest: Final[list] = items[3:]
+        extra = []
+        while rest and len(extra) < optional and rest[0] != ':chunk-size':
+            extra.append(self.eval_expr(rest.pop(0), env))
+        chunk_size = None
+        if len(rest) == 2 and rest[0] == ':chunk-size':
+            chunk_size = get_num(self.eval_expr(rest[1], env))
+        elif rest:
+            raise error.LispError(f"Invalid arguments for {items[0]}: {data.ConsCell.fromList(rest)}")
+        return fn, [] if data.nullp(seq) else list(seq), extra, chunk_size
+
+    def define_macro(self, name: Any, definition: data.ConsCell, env: data.Environment) -> None:
+        """Bind name to a macro with the given argument list and body."""
+        genv = env.get_global()
+        if name in genv:
+            self.macros.invalidate(genv[name])
+        genv[name] = data.ConsCell(data.Atom('macro'), definition)
+
+    def expand_macro(self, op: data.ConsCell, lst: data.ConsCell, env: data.Environment) -> Any:
+        """Expand the call lst to the macro op and return the resulting form."""
+        # Hier muss ich zwei Mal evaluieren, einmal, um das Macro zu
+        # expandieren, und einmal, um den resultierenden Code zu
+        # evaluieren. Mmmmh...
+        expand_dict = {}
+        formal_args = op[1]
+        arg_list = lst.cdr()
+        while not data.nullp(formal_args):
+            arg_name = formal_args.car()
+            if arg_name in ('&rest', '&body'):
+                expand_dict[formal_args[1]] = arg_list
+                break
+            expand_dict[arg_name] = arg_list.car()
+            arg_list = arg_list.cdr()
+            formal_args = formal_args.cdr()
+        macro_env = data.Environment(env, expand_dict)
+        self.shadow(macro_env.data)
+        res = []
+
+        # Jaaaa, hier muss ich wieder darauf auchten, dass die
+        # evaluierten Ausdrücke vermutlich Listen sind, und dass ich
+        # die nicht ohne weiteres an einander consen kann...
+        # for stmt in reversed(op.cdr().cdr()):
+        #     res = data.ConsCell(eval_macro_expr(stmt, macro_env), res)
+        for subexpr in op.cdr().cdr():
+            res.append(self.eval_macro_expr(subexpr, macro_env))
+
+        res = data.ConsCell.fromList(res) if len(res) != 1 else res[0]
+
+        return res
+
+    def profile(self, expr: Any, env: Optional[data.Environment] = None) -> tuple[Any, Profiler]:
+        """Evaluate expr with a Profiler installed, return its value and the Profiler."""
+        prof: Final[Profiler] = Profiler(self)
+        saved: Final[Optional[Tracer]] = self.tracer
+        self.tracer = prof
+        try:
+            res = self.eval_expr(expr, env)
+        finally:
+            self.tracer = saved
+        return res, prof
+
+    def start_sampler(self, interval: float = 0.001) -> Sampler:
+        """Start sampling the call stack every interval seconds of CPU time and return the Sampler."""
+        if self.sampler is not None:
+            raise error.LispError("The sampler is already running")
+        smp: Final[Sampler] = Sampler(self, interval)
+        smp.start()
+        self.sampler = smp
+        return smp
+
+    def stop_sampler(self) -> Sampler:
+        """Stop the sampler and return it."""
+        smp: Final[Optional[Sampler]] = self.sampler
+        if smp is None:
+            raise error.LispError("The sampler is not running")
+        smp.stop()
+        self.sampler = None
+        return smp
+
     def eval_expr(self, expr, env=None):
         """Evaluate an expression of arbitrary kind or complexity."""
         assert env is None or isinstance(env, data.Environment)
@@ -451,22 +1199,115 @@ class LispInterpreter:
         if env is None:
             env = self.env
 
-        res = data.EMPTY_LIST
-        if isinstance(expr, data.ConsCell):
-            self.dbg("Evaluating list: {0}", expr)
-            res = self.eval_list(expr, env)
-        elif isinstance(expr, data.Atom):
-            self.dbg("Evaluating atom: {0}", expr)
-            res = self.eval_atom(expr, env)
-        elif isinstance(expr, (str, int, float)):
-            self.dbg("Evaluating literal: {0}", expr)
-            res = expr
-        elif expr is None:
-            res = data.EMPTY_LIST
-        else:
-            raise error.LispError(f"Unexpected type for expression ({expr.__class__}): {expr}")
-        self.dbg("Expression {0} evaluates to {1}", expr, res)
-        return res
+        # Compiled code has no forms left to report, so a tracer makes the
+        # interpreter walk instead.
+        if self.compiler is not None and self.tracer is None:
+            return self.compiler.compile_toplevel(expr, env)(env)
+        return self.walk(expr, env)
+
+    def shadow(self, names: Iterable[str]) -> None:
+        """Note that names are bound by a local Environment, so calls to them cannot be cached."""
+        if self.call_cache is not None:
+            self.call_cache.shadow(names)
+
+    def optimize(self, expr: Any, env: Optional[data.Environment] = None) -> Any:
+        """Return expr with its constant parts computed for evaluation in env, if the optimizer is on."""
+        if self.optimizer is None:
+            return expr
+        return self.optimizer.optimize(expr, self.env if env is None else env)
+
+    def eval_budget(self, expr: Any, budget: Budget, env: Optional[data.Environment] = None) -> Any:
+        """
+        Evaluate expr in env, counting its steps against budget.
+
+        If the evaluation exceeds a limit of budget, it raises
+        BudgetExceeded, unless the budget pauses it, see krylisp.budget.
+        """
+        previous: Final[Optional[Budget]] = self.budget
+        self.budget = budget
+        try:
+            return self.eval_expr(expr, env)
+        finally:
+            self.budget = previous
+
+    # Samstag, 17. 10. 2026
+    # Special forms and function calls return a TailCall for the expression
+    # in tail position, and walk evaluates it in the same loop, so a Lisp
+    # loop written as tail recursion does not grow the Python stack.
+    def walk(self, expr: Any, env: data.Environment) -> Any:
+        """Evaluate expr in env by walking it, with proper tail calls."""
+        if self.tracer is not None:
+            return self.walk_traced(expr, env, self.tracer)
+        # Whether the entry on top of the call stack belongs to this loop,
+        # because a call's tail expression is being evaluated.
+        pushed = False
+        try:  # pylint: disable-msg=R1702
+            while True:
+                if isinstance(expr, data.ConsCell):
+                    res = self.step_list(expr, env)
+                    if res.__class__ is TailCall:
+                        if res.pushed:
+                            if pushed:
+                                del self.calls[-2]
+                            pushed = True
+                        expr = res.expr
+                        env = res.env
+                        continue
+                elif isinstance(expr, data.Atom):
+                    res = self.eval_atom(expr, env)
+                elif isinstance(expr, (str, int, float)):
+                    res = expr
+                elif expr is None:
+                    res = data.EMPTY_LIST
+                elif isinstance(expr, SELF_EVALUATING):
+                    res = expr
+                else:
+                    raise error.LispError(f"Unexpected type for expression ({expr.__class__}): {expr}")
+                return res
+        finally:
+            if pushed:
+                self.calls.pop()
+
+    def walk_traced(self, expr: Any, env: data.Environment, tracer: Tracer) -> Any:
+        """Evaluate expr in env like walk, reporting each step to tracer."""
+        # Expressions that were replaced by the one in their tail position
+        # have the same value, so they are exited together with it.
+        pending = []
+        pushed = False
+        try:  # pylint: disable-msg=R1702
+            while True:
+                tracer.enter(expr, env)
+                if isinstance(expr, data.ConsCell):
+                    res = self.step_list(expr, env)
+                    if res.__class__ is TailCall:
+                        if res.pushed:
+                            if pushed:
+                                del self.calls[-2]
+                            pushed = True
+                        pending.append(expr)
+                        expr = res.expr
+                        env = res.env
+                        continue
+                elif isinstance(expr, data.Atom):
+                    res = self.eval_atom(expr, env)
+                    if isinstance(expr.value, str) and expr.value not in ('nil', 't') \
+                       and not expr.value.startswith(':'):
+                        tracer.lookup(expr, res)
+                elif isinstance(expr, (str, int, float)):
+                    res = expr
+                elif expr is None:
+                    res = data.EMPTY_LIST
+                elif isinstance(expr, SELF_EVALUATING):
+                    res = expr
+                else:
+                    raise error.LispError(f"Unexpected type for expression ({expr.__class__}): {expr}")
+                tracer.exit(expr, res)
+                for outer in reversed(pending):
+                    tracer.exit(outer, res)
+                return res
+        finally:
+            if pushed:
+                self.calls.pop()
 
     def eval_macro_expr(self, expr, env=None):
         """Evaluate a macro expression."""
@@ -475,7 +1316,6 @@ class LispInterpreter:
         if env is None:
             env = self.env
 
-        self.dbg("Evaluating macro: {0}", expr)
         res = None
         if isinstance(expr, data.ConsCell):
             # Hier muss ich eine Reihe von Spezialfällen berücksichtigen, die im
@@ -491,7 +1331,6 @@ class LispInterpreter:
         else:
             res = self.eval_expr(expr, env)
 
-        self.dbg("Evaluated macro {0} --> {1}", expr, res)
         return res
 
     def eval_backquote(self, expr, env=None):
@@ -501,7 +1340,6 @@ class LispInterpreter:
         if env is None:
             env = self.env
 
-        self.dbg("Evaluating back-quoted expression {0}", expr)
         # assert isinstance(expr, data.ConsCell), "Backquote expression must be a linked list!"
         # assert len(expr) == 2, "A Backquote can only refer to a single item."
         # assert expr[0] == 'backquote', \
@@ -509,7 +1347,6 @@ class LispInterpreter:
         if isinstance(expr, data.ConsCell):  # pylint: disable-msg=R1702
             exlst = []
             for subexpr in expr:
-                self.dbg("Evaluating back-quoted sub-expression: {0}", subexpr)
                 # Hier muss ich jetzt anhand des Typs und der Gestalt dispatchen...
                 if isinstance(subexpr, data.ConsCell):
                     if subexpr.car() == 'backquote':
@@ -528,7 +1365,7 @@ class LispInterpreter:
 
                         if isinstance(res, data.Atom):
                             exlst.append(self.eval_atom(res, env) if res in env else res)
-                        elif isinstance(res, data.ConsCell):
+                        elif isinstance(res, data.ConsCell) and not data.nullp(res):
                             for item in res:
                                 exlst.append(item)
                     elif subexpr.car() == 'comma':
@@ -549,6 +1386,349 @@ class LispInterpreter:
         raise error.LispError(
             f"Invalid type for backquote expression: {expr.__class__} - {expr}")
 
+    # Special forms
+
+    @special_form('if')
+    def _form_if(self, lst, env):
+        """(if condition then-part else-part)"""
+        if len(lst) != 4:
+            raise error.LispError(
+                "'if' needs exactly three parameters: condition, then-part, else-part!")
+
+        cond = not data.nullp(self.eval_expr(lst[1], env))
+        if cond:
+            return TailCall(lst[2], env)
+        return TailCall(lst[3], env)
+
+    @special_form('return')
+    def _form_return(self, lst, env):
+        """(return value)"""
+        assert len(lst) == 2
+        return TailCall(lst[1], env)
+
+    # and und or sollte ich vielleicht besser mit einer for-Schleife implementieren...
+    @special_form('and')
+    def _form_and(self, lst, env):
+        """(and expr...)"""
+        node = lst.tail
+        if node is None:
+            return data.EMPTY_LIST
+        while node.tail is not None:
+            if data.nullp(self.eval_expr(node.head, env)):
+                return data.EMPTY_LIST
+            node = node.tail
+        return TailCall(node.head, env)
+
+    @special_form('or')
+    def _form_or(self, lst, env):
+        """(or expr...)"""
+        node = lst.tail
+        if node is None:
+            return data.EMPTY_LIST
+        while node.tail is not None:
+            val = self.eval_expr(node.head, env)
+            if not data.nullp(val):
+                return val
+            node = node.tail
+        return TailCall(node.head, env)
+
+    @special_form('quote')
+    def _form_quote(self, lst, _env):
+        """(quote expr)"""
+        return lst[1]
+
+    @special_form('delay')
+    def _form_delay(self, lst, env):
+        """(delay expr)"""
+        if len(lst) != 2:
+            raise error.LispError("'delay' needs exactly one parameter!")
+        expr = lst[1]
+        return Promise(lambda: self.eval_expr(expr, env))
+
+    @special_form('cons-stream')
+    def _form_cons_stream(self, lst, env):
+        """(cons-stream head tail)"""
+        if len(lst) != 3:
+            raise error.LispError("'cons-stream' needs exactly two parameters: head, tail!")
+        expr = lst[2]
+        return ConsStream(self.eval_expr(lst[1], env), Promise(lambda: self.eval_expr(expr, env)))
+
+    @special_form('quit', 'exit')
+    def _form_quit(self, _lst, _env):
+        """(quit)"""
+        sys.exit(0)
+
+    @special_form('lambda')
+    def _form_lambda(self, lst, env):
+        """(lambda args body...)"""
+        return data.Function(lst[1], lst.tail.tail, env, code=Procedure(self, lst[1], lst.tail.tail))
+
+    @special_form('defun')
+    def _form_defun(self, lst, env):
+        """(defun name args body...)"""
+        assert len(lst.cdr()) >= 3, \
+            "A Function definition needs at least three arguments (name, arglist, body)"
+        lst = lst.cdr()
+        self.define_function(lst[0], data.Function(lst[1], lst.tail.tail, env, compiler.symbol_name(lst[0]),
+                                                   Procedure(self, lst[1], lst.tail.tail)), env)
+        return lst[0]
+
+    @special_form('defun-memo')
+    def _form_defun_memo(self, lst, env):
+        """(defun-memo name args body...)"""
+        name = self.eval_expr(data.ConsCell(DEFUN, lst.tail), env)
+        self.memoize(name, env=env)
+        return name
+
+    @special_form('memoize')
+    def _form_memoize(self, lst, env):
+        """(memoize name [:max-size n])"""
+        max_size = memo.DEFAULT_SIZE
+        if len(lst) == 4 and lst[2] == ':max-size':
+            size = self.eval_expr(lst[3], env)
+            max_size = None if data.nullp(size) else get_num(size)
+        elif len(lst) != 2:
+            raise error.LispError("memoize takes a function name and optionally :max-size n!")
+        name = self.eval_expr(lst[1], env)
+        self.memoize(name, max_size, env)
+        return name
+
+    @special_form('memo-stats')
+    def _form_memo_stats(self, lst, env):
+        """(memo-stats name)"""
+        if len(lst) != 2:
+            raise error.LispError("memo-stats takes exactly one argument (the function name)!")
+        res = []
+        for key, value in self.memo_stats(self.eval_expr(lst[1], env), env).items():
+            res.extend((data.Atom(':' + key), data.EMPTY_LIST if value is None else value))
+        return data.ConsCell.fromList(res)
+
+    @special_form('form-cache-stats')
+    def _form_form_cache_stats(self, lst, _env):
+        """(form-cache-stats)"""
+        if len(lst) != 1:
+            raise error.LispError("form-cache-stats takes no arguments!")
+        if self.form_cache is None:
+            return data.EMPTY_LIST
+        res = []
+        for key, value in self.form_cache.stats().items():
+            res.extend((data.Atom(':' + key), value))
+        return data.ConsCell.fromList(res)
+
+    @special_form('pmap')
+    def _form_pmap(self, lst, env):
+        """(pmap function list [:chunk-size n])"""
+        fn, items, _, chunk_size = self.parallel_args(lst, env, 0)
+        return data.ConsCell.fromList(self.pmap(fn, items, chunk_size, env))
+
+    @special_form('preduce')
+    def _form_preduce(self, lst, env):
+        """(preduce function list [initial] [:chunk-size n])"""
+        fn, items, extra, chunk_size = self.parallel_args(lst, env, 1)
+        return self.preduce(fn, items, extra[0] if extra else None, chunk_size, env)
+
+    @special_form('defmacro')
+    def _form_defmacro(self, lst, env):
+        """(defmacro name args body...)"""
+        assert len(lst.cdr()) >= 3, \
+            "A Macro definition needs at least three arguments (name, arglist, body)"
+        macro = lst.cdr()
+        self.define_macro(macro[0], macro.cdr(), env)
+        return macro[0]
+
+    @special_form('backquote')
+    def _form_backquote(self, lst, env):
+        """(backquote template)"""
+        return self.eval_backquote(lst[1], env)
+
+    @special_form('gensym')
+    def _form_gensym(self, _lst, _env):
+        """(gensym)"""
+        return self.gensym()
+
+    @special_form('let')
+    def _form_let(self, lst, env):
+        """(let ((var value)...) body...)"""
+        let_env = {}
+        for symbol, value in lst[1]:
+            assert isinstance(symbol, (data.Atom, str)), \
+                "A let-variable must be a symbol!"
+            let_env[symbol] = self.eval_expr(value, env)
+        lenv = data.Environment(env, let_env)
+        self.shadow(lenv.data)
+        node = lst.tail.tail
+        if data.nullp(node):
+            return data.NIL
+        while node.tail is not None:
+            self.eval_expr(node.head, lenv)
+            node = node.tail
+        return TailCall(node.head, lenv)
+
+    @special_form('setq')
+    def _form_setq(self, lst, env):
+        """(setq symbol value...)"""
+        assert even(len(lst.cdr())), \
+            "The parameters to setq must be a list of symbols and values."
+        lst = lst.cdr()
+        val = None
+        while not data.nullp(lst):
+            sym = lst.car()
+            lst = lst.cdr()
+            if not isinstance(sym, data.Atom):
+                raise error.LispError(f"{sym} is not a symbol!")
+            val = self.eval_expr(lst.car(), env)
+            if env.parent is not None and sym.value not in env:
+                # A name that is not bound anywhere yet becomes a local
+                # variable, which call sites must not mistake for a global.
+                self.shadow((sym.value,))
+            env[sym] = val
+            lst = lst.cdr()
+        return val
+
+    @special_form('apply')
+    def _form_apply(self, lst, env):
+        """(apply function arglist)"""
+        assert len(lst) == 3, "Apply takes exactly two arguments (function and arglist)!"
+        args = self.eval_expr(lst[2], env)
+        args = [] if data.nullp(args) else list(args)
+        if isinstance(lst[1], data.Atom) and lst[1].value in self.builtins:
+            return self.builtins[lst[1].value](*args)
+        fn = self.eval_expr(lst[1], env)
+        if isinstance(fn, data.Function):
+            if fn.code.__class__ is Procedure:
+                return fn.code.enter(fn.env, args, lst)
+            return fn.code.invoke(fn.env, args, lst)
+        if isinstance(fn, data.ConsCell) and fn.head is LAMBDA:
+            return self.procedure(fn).enter(env, args, lst)
+        raise error.LispError(f"{lst[1]} is not a function!")
+
+    @special_form('do')
+    def _form_do(self, lst, env):
+        """(do ((var init update)...) (end-test result) body...)"""
+        if len(lst) < 3:
+            raise error.LispError(
+                "do needs at least two arguments (init-list and end-list)!")
+        var_dict = {}
+        update_forms = {}
+        body = lst.cdr().cdr().cdr()
+
+        end_expr = lst[2][0]
+        result_expr = lst[2][1]
+
+        if not data.nullp(lst[1]):
+            for var_def in lst[1]:
+                sym = var_def[0]
+                init_val = var_def[1]
+                update = var_def[2]
+
+                if isinstance(sym, data.Atom):
+                    sym = sym.value
+
+                var_dict[sym] = self.eval_expr(init_val, env)
+                update_forms[sym] = update
+
+        loop_env = data.Environment(env, var_dict)
+        self.shadow(loop_env.data)
+
+        while data.nullp(self.eval_expr(end_expr, loop_env)):
+            if self.budget is not None:
+                self.budget.tick()
+            for expr in body:
+                self.eval_expr(expr, loop_env)
+            for sym, expr in update_forms.items():
+                loop_env[sym] = self.eval_expr(expr, loop_env)
+
+        return self.eval_expr(result_expr, loop_env)
+
+    @special_form('eval')
+    def _form_eval(self, lst, env):
+        """(eval expr)"""
+        return self.eval_expr(self.eval_expr(lst[1], env), env)
+
+    @special_form('time')
+    def _form_time(self, lst, env):
+        """(time expr)"""
+        before: Final[float] = time.time()
+        res = self.eval_expr(lst[1], env)
+        after: Final[float] = time.time()
+        delta: Final[float] = after - before
+        print(f"Evaluating {lst[1]} took {delta} seconds.")
+        return res
+
+    @special_form('profile')
+    def _form_profile(self, lst, env):
+        """(profile expr [:sort column] [:collapsed path] [:pstats path])"""
+        if len(lst) < 2 or len(lst) % 2 != 0:
+            raise error.LispError("profile needs an expression and pairs of options and values!")
+        options = {}
+        for key, value in zip(list(lst)[2::2], list(lst)[3::2]):
+            if not (isinstance(key, data.Atom) and isinstance(key.value, str) and key.value.startswith(":")):
+                raise error.LispError(f"Invalid option for profile: {key}")
+            options[key.value[1:]] = self.eval_expr(value, env)
+        res, prof = self.profile(lst[1], env)
+        sort = options.get("sort", "cumulative")
+        print(prof.table(sort.value.lstrip(":") if isinstance(sort, data.Atom) else str(sort)))
+        if "collapsed" in options:
+            prof.write_collapsed(options["collapsed"])
+        if "pstats" in options:
+            prof.dump_stats(options["pstats"])
+        return res
+
+    @special_form('start-sampler')
+    def _form_start_sampler(self, lst, env):
+        """(start-sampler [interval])"""
+        if len(lst) > 2:
+            raise error.LispError("start-sampler takes at most one argument (the interval in seconds)!")
+        if len(lst) == 2:
+            self.start_sampler(get_num(self.eval_expr(lst[1], env)))
+        else:
+            self.start_sampler()
+        return data.Atom('t')
+
+    @special_form('stop-sampler')
+    def _form_stop_sampler(self, lst, env):
+        """(stop-sampler [path])"""
+        if len(lst) > 2:
+            raise error.LispError("stop-sampler takes at most one argument (the file for the stacks)!")
+        smp = self.stop_sampler()
+        if len(lst) == 2:
+            smp.write_collapsed(self.eval_expr(lst[1], env))
+        return smp.samples
+
+    @special_form('save-image')
+    def _form_save_image(self, lst, env):
+        """(save-image path)"""
+        if len(lst) != 2:
+            raise error.LispError("save-image takes exactly one argument (the path of the image)!")
+        self.save_image(self.eval_expr(lst[1], env))
+        return data.Atom('t')
+
+    @special_form('load-image')
+    def _form_load_image(self, lst, env):
+        """(load-image path)"""
+        if len(lst) != 2:
+            raise error.LispError("load-image takes exactly one argument (the path of the image)!")
+        self.load_image(self.eval_expr(lst[1], env))
+        return data.Atom('t')
+
+    @special_form('load')
+    def _form_load(self, lst, env):
+        """(load path)"""
+        path = lst[1]
+        return load_file(self, path, env)
+
+    @special_form('dbg')
+    def _form_dbg(self, lst, env):
+        """(dbg flag)"""
+        arg = self.eval_expr(lst[1], env)
+        if data.nullp(arg):
+            if isinstance(self.tracer, DebugTracer):
+                self.tracer = None
+            return data.Atom('nil')
+        if not isinstance(self.tracer, DebugTracer):
+            self.tracer = DebugTracer()
+        return data.Atom('t')
+
 
 def load_file(self, path, env=None) -> Any:
     """Load a source file."""
@@ -559,22 +1739,16 @@ def load_file(self, path, env=None) -> Any:
 
     res = None
     try:
+        if self.form_cache is not None:
+            for form in self.form_cache.forms(path):
+                res = self.eval_expr(self.optimize(form, env), env)
+            return res
         with open(path, 'r', encoding="utf-8") as fh:
-            expr = ""
-            complete = False
-            for line in fh:
-                if complete:
-                    complete = False
-                    expr = line
-                else:
-                    expr += line
-                try:
-                    form = parser.parse_string(expr)
-                except parser.IncompleteException:
-                    pass
-                else:
-                    complete = True
-                    res = self.eval_expr(form, env)
+            # Each form is evaluated as soon as it has been read, before the
+            # rest of the file is, so definitions made by a form are in
+            # place for the forms that follow it.
+            for form in parser.read_file(fh):
+                res = self.eval_expr(self.optimize(form, env), env)
     except IOError as ioerror:
         msg: Final[str] = "\n".join(traceback.format_exception(ioerror))
         print(f"Error reading {path}: {msg}")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 15:40:00 krylon>
+#
+# /data/code/python/krylisp/memo.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.memo
+
+Memoized Functions remember the values they returned for the arguments
+they were called with.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from collections import OrderedDict
+from typing import Any, Final, Hashable, Optional
+
+from krylisp import data, error
+
+DEFAULT_SIZE: Final[int] = 128
+
+# Samstag, 17. 10. 2026
+# A Memo takes the place of the code of a Function, so both engines call
+# it the way they call any other Function, through its invoke method.
+# ConsCells are compared by identity, and an Atom is equal to the string
+# it is named after, so arguments are turned into keys that compare by
+# structure and keep symbols, strings and numbers of different types apart.
+
+
+def key(value: Any) -> Hashable:
+    """Return a hashable key for value that is equal for structurally equal values."""
+    if value is None:
+        return None
+    cls = value.__class__
+    if cls is data.ConsCell:
+        if not value:
+            return None
+        items = []
+        node = value
+        while node.__class__ is data.ConsCell:
+            items.append(key(node.head))
+            node = node.tail
+        return (data.ConsCell, tuple(items), key(node))
+    if cls is data.Atom:
+        return None if value.value == 'nil' else (data.Atom, value.value.__class__, value.value)
+    if cls in (int, float, str, bool):
+        return (cls, value)
+    return value
+
+
+class Memo:
+    """Memo is the code of a memoized Function. It calls the original Function on a cache miss."""
+
+    __slots__ = ['fn', 'max_size', 'cache', 'hits', 'misses', 'evictions']
+
+    fn: data.Function
+    max_size: Optional[int]
+    cache: OrderedDict
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, fn: data.Function, max_size: Optional[int] = DEFAULT_SIZE) -> None:
+        if max_size is not None and max_size < 1:
+            raise error.LispError(f"The size of a memo must be positive, not {max_size}")
+        self.fn = fn
+        # If max_size is None, the cache grows without bounds. Otherwise, the
+        # least recently used value is dropped when it would grow too large.
+        self.max_size = max_size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def invoke(self, _env: data.Environment, args: list, call: Any = None) -> Any:
+        """Return the value of the Function for args, calling it only if it is not cached."""
+        cache: Final[OrderedDict] = self.cache
+        try:
+            k = tuple(key(arg) for arg in args)
+            res = cache[k]
+        except KeyError:
+            pass
+        except TypeError:
+            # Some argument cannot be hashed, so there is nothing to cache.
+            self.misses += 1
+            return self.fn.code.invoke(self.fn.env, args, call)
+        else:
+            self.hits += 1
+            try:
+                cache.move_to_end(k)
+            except KeyError:
+                # Another thread has just evicted it.
+                pass
+            return res
+        self.misses += 1
+        res = self.fn.code.invoke(self.fn.env, args, call)
+        cache[k] = res
+        if self.max_size is not None and len(cache) > self.max_size:
+            try:
+                cache.popitem(last=False)
+                self.evictions += 1
+            except KeyError:
+                pass
+        return res
+
+    def clear(self) -> None:
+        """Forget all cached values."""
+        self.cache.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of hits, misses and evictions, and the size of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.cache),
+            "max-size": self.max_size,
+        }
+
+
+def memoize(fn: data.Function, max_size: Optional[int] = DEFAULT_SIZE) -> data.Function:
+    """Return a memoized Function that computes its values by calling fn."""
+    return data.Function(fn.args, fn.body, fn.env, fn.name, Memo(fn, max_size))
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
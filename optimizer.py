@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 19:50:00 krylon>
+#
+# /data/code/python/krylisp/optimizer.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.optimizer
+
+A pass over the forms the reader returns that computes what can be
+computed before they are evaluated.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from typing import TYPE_CHECKING, Any, Callable, Final
+
+from krylisp import data, error
+
+if TYPE_CHECKING:
+    from krylisp.lisp import LispInterpreter
+
+# The builtins whose value only depends on their arguments, and which
+# neither allocate nor print.
+PURE: Final[frozenset[str]] = frozenset(
+    ('+', '-', '*', '**', '/', 'mod', 'sqrt', '<', '>', '=', 'eq', 'not', 'null'))
+# A power with a larger exponent is left for run time, rather than
+# computing a huge number for a branch that may never be taken.
+MAX_EXPONENT: Final[int] = 1024
+
+QUOTE: Final[data.Atom] = data.Atom('quote')
+
+# Samstag, 17. 10. 2026
+# The Optimizer rewrites a form into one that has the same value and the
+# same effects, but does less work:
+#
+# - (quote 5) and (quote "s") become 5 and "s".
+# - A call to a pure builtin whose arguments are all constants becomes its
+#   value, unless the builtin raises; then the error is left for run time.
+# - (if c a b) with a constant condition becomes a or b.
+#
+# A builtin is only folded if the interpreter still has the builtin it was
+# born with under that name, since register_builtin and register_form can
+# replace it. Variables and defuns cannot shadow a builtin, because the
+# interpreter looks up forms before anything else.
+#
+# The Optimizer only descends into the parts of a form it knows will be
+# evaluated as code: the arguments of builtins and of Functions, and the
+# code in the special forms in FORMS. The arguments of a macro are data,
+# and so are those of a call to a name that is not yet bound to a Function
+# when the form is optimized, because it may turn out to be a macro that
+# is defined later; both are left alone, as are all other special forms.
+# Forms that are not changed are returned as they are, not copied.
+
+
+def constantp(form: Any) -> bool:
+    """Return True if form always evaluates to the same value."""
+    cls = form.__class__
+    if cls in (int, float, str):
+        return True
+    if cls is data.Atom:
+        return form.value.__class__ is not str or form.value in ('t', 'nil') or form.value.startswith(':')
+    if cls is data.ConsCell:
+        return not form or (form.head is QUOTE and form.tail is not None and form.tail.tail is None)
+    return form is None
+
+
+def value_of(form: Any) -> Any:
+    """Return the value of the constant form."""
+    cls = form.__class__
+    if cls is data.Atom:
+        if form.value == 'nil':
+            return data.EMPTY_LIST
+        return form.value if form.value.__class__ is not str else form
+    if cls is data.ConsCell:
+        return form.tail.head if form else data.EMPTY_LIST
+    return data.EMPTY_LIST if form is None else form
+
+
+def literal(value: Any) -> Any:
+    """Return a form that evaluates to value."""
+    if value.__class__ in (int, float, str):
+        return value
+    if value.__class__ is data.Atom and (value.value == 't' or str(value.value).startswith(':')):
+        return value
+    return data.ConsCell(QUOTE, data.ConsCell(value, None))
+
+
+def build(items: list, tail: Any = None) -> data.ConsCell:
+    """Return the list of items, ending in tail."""
+    res = tail
+    for item in reversed(items):
+        res = data.ConsCell(item, res)
+    return res
+
+
+class Optimizer:
+    """Optimizer folds constant expressions in the forms it is given."""
+
+    __slots__ = ['interp', 'builtins', 'forms', 'folded']
+
+    interp: 'LispInterpreter'
+    builtins: dict[str, Callable[..., Any]]
+    forms: dict[str, Any]
+    folded: int
+
+    def __init__(self, interp: 'LispInterpreter') -> None:
+        # Avoid a circular import, lisp imports this module.
+        from krylisp.lisp import BUILTINS, SPECIAL_FORMS  # pylint: disable-msg=C0415
+        self.interp = interp
+        # The builtins and special forms every interpreter starts out with.
+        self.builtins = BUILTINS
+        self.forms = SPECIAL_FORMS
+        # How many calls, conditions and quotes have been replaced.
+        self.folded = 0
+
+    def optimize(self, form: Any, env: data.Environment) -> Any:
+        """Return form with its constant parts computed, for evaluation in env."""
+        if form.__class__ is not data.ConsCell or not form:
+            return form
+        head: Final[Any] = form.head
+        if head.__class__ is data.Atom and head.value.__class__ is str:
+            name: Final[str] = head.value
+            handler = FORMS.get(name)
+            if handler is not None and self.interp.forms.get(name) is self.forms.get(name):
+                return handler(self, form, env)
+            if name in self.interp.builtins:
+                return self.optimize_builtin(name, form, env)
+            if name in self.interp.forms:
+                return form
+            try:
+                op = env[head]
+            except error.LispError:
+                return form
+            if op.__class__ is not data.Function:
+                return form
+        elif head.__class__ is not data.ConsCell:
+            return form
+        return self.optimize_list(form, env)
+
+    def optimize_list(self, lst: Any, env: data.Environment, start: int = 0) -> Any:
+        """Optimize the elements of lst, from the index start on, and return lst if none of them changed."""
+        items: Final[list] = []
+        node = lst
+        while node.__class__ is data.ConsCell and node:
+            items.append(node.head)
+            node = node.tail
+        new: Final[list] = items[:start] + [self.optimize(item, env) for item in items[start:]]
+        if all(a is b for a, b in zip(items, new)):
+            return lst
+        return build(new, node)
+
+    def optimize_builtin(self, name: str, form: data.ConsCell, env: data.Environment) -> Any:
+        """Optimize a call to a builtin, and compute it if it is pure and its arguments are constant."""
+        form = self.optimize_list(form, env, 1)
+        fn: Final[Callable[..., Any]] = self.interp.builtins[name]
+        if name not in PURE or fn is not self.builtins.get(name):
+            return form
+        args: Final[list] = []
+        node = form.tail
+        while node is not None:
+            if not constantp(node.head):
+                return form
+            args.append(value_of(node.head))
+            node = node.tail
+        if name == '**' and len(args) == 2 and isinstance(args[1], int) and abs(args[1]) > MAX_EXPONENT:
+            return form
+        try:
+            value = fn(*args)
+        except Exception:  # pylint: disable-msg=W0703
+            return form
+        self.folded += 1
+        return literal(value)
+
+
+def optimize_quote(opt: Optimizer, form: data.ConsCell, _env: data.Environment) -> Any:
+    """(quote expr)"""
+    if form.tail is not None and form.tail.tail is None and form.tail.head.__class__ in (int, float, str):
+        opt.folded += 1
+        return form.tail.head
+    return form
+
+
+def optimize_if(opt: Optimizer, form: data.ConsCell, env: data.Environment) -> Any:
+    """(if condition then-part else-part)"""
+    if len(form) != 4:
+        return form
+    form = opt.optimize_list(form, env, 1)
+    cond: Final[Any] = form[1]
+    if not constantp(cond):
+        return form
+    opt.folded += 1
+    return form[3] if data.nullp(value_of(cond)) else form[2]
+
+
+def optimize_args(opt: Optimizer, form: data.ConsCell, env: data.Environment) -> Any:
+    """Forms that evaluate all of their arguments, like and and or."""
+    return opt.optimize_list(form, env, 1)
+
+
+def optimize_body(start: int) -> Callable[[Optimizer, data.ConsCell, data.Environment], Any]:
+    """Return an optimizer for forms whose body starts at the index start, like defun and lambda."""
+    def optimize(opt: Optimizer, form: data.ConsCell, env: data.Environment) -> Any:
+        return opt.optimize_list(form, env, start)
+    return optimize
+
+
+def optimize_setq(opt: Optimizer, form: data.ConsCell, env: data.Environment) -> Any:
+    """(setq symbol value...)"""
+    items: Final[list] = list(form)
+    new: Final[list] = [opt.optimize(item, env) if idx % 2 == 0 and idx > 0 else item
+                        for idx, item in enumerate(items)]
+    if all(a is b for a, b in zip(items, new)):
+        return form
+    return build(new)
+
+
+def optimize_bindings(opt: Optimizer, bindings: Any, env: data.Environment, start: int) -> Any:
+    """Optimize the forms in a list of bindings like ((var init update)...), from the index start on."""
+    if bindings.__class__ is not data.ConsCell:
+        return bindings
+    items: Final[list] = [opt.optimize_list(binding, env, start) if binding.__class__ is data.ConsCell
+                          else binding for binding in bindings]
+    if all(a is b for a, b in zip(bindings, items)):
+        return bindings
+    return build(items)
+
+
+def optimize_let(opt: Optimizer, form: data.ConsCell, env: data.Environment) -> Any:
+    """(let ((var value)...) body...)"""
+    if len(form) < 2:
+        return form
+    bindings: Final[Any] = optimize_bindings(opt, form[1], env, 1)
+    body: Final[Any] = opt.optimize_list(form.tail.tail, env) if form.tail.tail else form.tail.tail
+    if bindings is form[1] and body is form.tail.tail:
+        return form
+    return data.ConsCell(form.head, data.ConsCell(bindings, body))
+
+
+def optimize_do(opt: Optimizer, form: data.ConsCell, env: data.Environment) -> Any:
+    """(do ((var init update)...) (end-test result) body...)"""
+    if len(form) < 3:
+        return form
+    bindings: Final[Any] = optimize_bindings(opt, form[1], env, 1)
+    end: Final[Any] = opt.optimize_list(form[2], env) if form[2].__class__ is data.ConsCell else form[2]
+    body: Final[Any] = form.tail.tail.tail
+    if body:
+        body = opt.optimize_list(body, env)
+    if bindings is form[1] and end is form[2] and body is form.tail.tail.tail:
+        return form
+    return build([form.head, bindings, end], body)
+
+
+# How the Optimizer treats the special forms it knows.
+FORMS: Final[dict[str, Callable[[Optimizer, data.ConsCell, data.Environment], Any]]] = {
+    'quote': optimize_quote,
+    'if': optimize_if,
+    'and': optimize_args,
+    'or': optimize_args,
+    'return': optimize_args,
+    'delay': optimize_args,
+    'cons-stream': optimize_args,
+    'setq': optimize_setq,
+    'let': optimize_let,
+    'do': optimize_do,
+    'lambda': optimize_body(2),
+    'defun': optimize_body(3),
+    'defun-memo': optimize_body(3),
+}
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
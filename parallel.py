@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-18 02:10:00 krylon>
+#
+# /data/code/python/krylisp/parallel.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.parallel
+
+Map and reduce Lisp functions over lists in a pool of worker processes.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import reduce
+from typing import TYPE_CHECKING, Any, Callable, Final, Optional
+
+from krylisp import data, error, image
+
+if TYPE_CHECKING:
+    from krylisp.lisp import LispInterpreter
+
+# How many chunks per worker a list is split into, unless the caller says
+# how large the chunks should be. More chunks even out the load if some
+# items take longer than others, fewer cost less in pickling.
+CHUNKS_PER_WORKER: Final[int] = 4
+
+# How many global variables may change before the workers are started
+# again, instead of being sent the new values along with each chunk.
+MAX_CHANGES: Final[int] = 64
+
+# Samstag, 17. 10. 2026
+# Each worker process runs an interpreter of its own, which is warmed up
+# with the global variables of the caller when it starts, the same way an
+# image is loaded. Work is sent to the workers in chunks of the list, and
+# pickled the way an image is, so lists are flattened and references to
+# the global Environment stay references to the global Environment of
+# whichever process unpickles them. The pool is kept between calls.
+#
+# Pickling all global variables for each call to find out whether they have
+# changed would cost as much as starting the workers again. Instead, the
+# global Environment notes the names of the variables that are set after
+# the workers were started, and their values are sent along with each chunk,
+# for the worker to install before it starts on it. Only when more than
+# MAX_CHANGES variables have changed are the workers started over, with all
+# global variables. A vector or hash table that is changed in place, without
+# setting the variable it is bound to, is not noticed. Builtins that were
+# registered with one interpreter only are not known to the workers.
+#
+# The workers know the variables of one global Environment at a time: that
+# of the form that called pmap or preduce, which may be a context. A call
+# from another global Environment starts them over with its variables.
+# The pool is used by one call at a time, so calls from several threads
+# wait for each other rather than start and stop the workers under them.
+
+# The interpreter of a worker process.
+_worker: Optional['LispInterpreter'] = None  # pylint: disable-msg=C0103
+
+# The changed global variables the worker has installed last.
+_changes: bytes = b""  # pylint: disable-msg=C0103
+
+
+def warm(cls: type, payload: bytes, compiled: bool) -> None:
+    """Set up the interpreter of a worker process with the global variables in payload."""
+    global _worker, _changes  # pylint: disable-msg=W0603
+    _worker = cls(compiled=compiled, form_cache=False)
+    image.install(_worker, image.loads(_worker, payload))
+    _changes = b""
+
+
+def function(interp: 'LispInterpreter', fn: Any, env: Optional[data.Environment] = None) -> Callable:
+    """Return a Python callable that calls the Lisp function fn in interp, a lambda list in env."""
+    if isinstance(fn, str):
+        return interp.builtins[fn]
+    if isinstance(fn, data.Function):
+        return fn
+    if isinstance(fn, data.ConsCell) and fn.head == 'lambda':
+        proc = interp.procedure(fn)
+        return lambda *args: proc.invoke(interp.env if env is None else env, list(args))
+    raise error.LispError(f"{fn} is not a function!")
+
+
+def run(task: tuple[bytes, bytes]) -> bytes:
+    """Do one chunk of work in a worker process, and return the result, pickled."""
+    global _changes  # pylint: disable-msg=W0603
+    assert _worker is not None
+    changes, work = task
+    # The changes are those since the worker was started, so the ones it
+    # installed for an earlier chunk are a part of them.
+    if changes and changes != _changes:
+        image.install(_worker, image.loads(_worker, changes))
+        _changes = changes
+    op, fn, chunk = image.loads(_worker, work)
+    call: Final[Callable] = function(_worker, fn)
+    if op == "map":
+        res = [call(item) for item in chunk]
+    else:
+        res = reduce(call, chunk)
+    return image.dumps(_worker, res)
+
+
+def variables(genv: data.Environment) -> dict[str, Any]:
+    """Return all variables genv sees, those of the global Environment it shares, if it is a context, included."""
+    if isinstance(genv.data, data.Overlay):
+        res: Final[dict[str, Any]] = dict(genv.data.shared)
+        res.update(genv.data)
+        return res
+    return genv.data
+
+
+class Pool:
+    """Pool is a pool of worker processes that know the global variables of an interpreter."""
+
+    __slots__ = ['interp', 'workers', 'executor', 'genv', 'changed', 'starts', 'lock']
+
+    interp: 'LispInterpreter'
+    workers: int
+    executor: Optional[ProcessPoolExecutor]
+    genv: Optional[data.Environment]
+    changed: Optional[set[str]]
+    starts: int
+
+    def __init__(self, interp: 'LispInterpreter', workers: Optional[int] = None) -> None:
+        self.interp = interp
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = None
+        # The global Environment the workers were started with, and the
+        # names of its variables set since, shared with it.
+        self.genv = None
+        self.changed = None
+        # How often the workers have been started.
+        self.starts = 0
+        self.lock: Final[threading.RLock] = threading.RLock()
+
+    def ready(self, genv: data.Environment) -> tuple[ProcessPoolExecutor, bytes]:
+        """
+        Return the executor and the variables of genv that changed since it was started, pickled.
+
+        If the executor is not running, was started for another global
+        Environment, or too many variables have changed, it is started
+        again, with all variables of genv.
+        """
+        if self.executor is None or genv is not self.genv or genv.changed is not self.changed \
+           or len(self.changed) > MAX_CHANGES:
+            self.close()
+            payload: Final[bytes] = image.dumps(self.interp, variables(genv), genv)
+            self.executor = ProcessPoolExecutor(self.workers, initializer=warm,
+                                                initargs=(self.interp.__class__, payload,
+                                                          self.interp.compiler is not None))
+            self.genv = genv
+            self.changed = genv.changed = set()
+            self.starts += 1
+            return self.executor, b""
+        if not self.changed:
+            return self.executor, b""
+        return self.executor, image.dumps(self.interp, {name: genv.data[name] for name in self.changed
+                                                        if name in genv.data}, genv)
+
+    def chunks(self, items: list, chunk_size: Optional[int] = None) -> list[list]:
+        """Split items into chunks of chunk_size, or into a few per worker if chunk_size is None."""
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(items) / (self.workers * CHUNKS_PER_WORKER)))
+        elif chunk_size < 1:
+            raise error.LispError(f"The chunk size must be positive, not {chunk_size}")
+        return [items[idx:idx + chunk_size] for idx in range(0, len(items), chunk_size)]
+
+    def submit(self, op: str, fn: Any, items: list, chunk_size: Optional[int], genv: data.Environment) -> list:
+        """Do op with fn on each chunk of items in the workers, who know the variables of genv, and return the results in order."""
+        with self.lock:
+            executor, changes = self.ready(genv)
+            tasks: Final[list[tuple[bytes, bytes]]] = [(changes, image.dumps(self.interp, (op, fn, chunk), genv))
+                                                       for chunk in self.chunks(items, chunk_size)]
+            try:
+                return [image.loads(self.interp, res, genv) for res in executor.map(run, tasks)]
+            except BrokenProcessPool as err:
+                self.close()
+                raise error.LispError(f"A worker process died: {err}") from err
+
+    def map(self, fn: Any, items: list, chunk_size: Optional[int] = None,
+            env: Optional[data.Environment] = None) -> list:
+        """Return the list of fn applied to each of items, in the global Environment of env."""
+        res: Final[list] = []
+        for part in self.submit("map", fn, items, chunk_size, (self.interp.env if env is None else env).get_global()):
+            res.extend(part)
+        return res
+
+    def reduce(self, fn: Any, items: list, initial: Any = None, chunk_size: Optional[int] = None,  # pylint: disable-msg=R0913,R0917
+               env: Optional[data.Environment] = None) -> Any:
+        """
+        Return items combined with fn, starting with initial, if it is not None, in the global Environment of env.
+
+        Each chunk is combined by a worker, and the results of the chunks
+        are combined by the caller, so fn must be associative.
+        """
+        genv: Final[data.Environment] = (self.interp.env if env is None else env).get_global()
+        partials: Final[list] = self.submit("reduce", fn, items, chunk_size, genv) if items else []
+        if initial is not None:
+            partials.insert(0, initial)
+        if not partials:
+            return None
+        return reduce(function(self.interp, fn, genv), partials)
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+                if self.genv is not None and self.genv.changed is self.changed:
+                    self.genv.changed = None
+                self.genv = None
+                self.changed = None
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
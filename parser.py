@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-# Time-stamp: <2025-03-08 16:16:55 krylon>
+# Time-stamp: <2026-10-18 00:20:00 krylon>
 #
 # /data/code/python/krylisp/parser.py
 # created on 19. 05. 2024
@@ -17,84 +17,64 @@ krylisp.parser
 (c) 2024 Benjamin Walkenhorst
 """
 
-from typing import Final, Optional, Union
-
-from pyparsing import (Forward, Literal, ParseException, ParseResults,
-                       QuotedString, Regex, Suppress, Word, ZeroOrMore, alphas,
-                       nums)
+import re
+from typing import Any, Final, Iterator, Optional, TextIO, Union
 
 from krylisp import data
-
-DEBUG_GRAMMAR: Final[bool] = False
-
-open_paren = Suppress(Literal("("))
-close_paren = Suppress(Literal(")"))
-
-expr = Forward()
-string = QuotedString('"')
-integer = Regex(r"-?\d+").setParseAction(lambda string, loc, tok: int(tok[0]))
-floating_point_number = Regex(r"-?\d+[.]\d+(?:e-?\d+)?").setParseAction(
-    lambda string, loc, tok: float(tok[0]))
-word_chars = alphas + nums + "-!$%&/=+-_*<>|"
-symbol = Word(word_chars).setParseAction(lambda string, loc, tok: data.Atom(tok[0]))
-comment = Suppress(Regex(";[^\n]*"))
-token = Forward()
-
-lisp_list = open_paren + ZeroOrMore(expr) + close_paren
-lisp_list.setParseAction(
-    lambda st, loc, tok: result_to_list(tok) if len(tok) > 0 else data.ConsCell(None, None))
-quote_expr = (Suppress(Literal("'")) + expr).setParseAction(
-    lambda st, loc, tok: quote_body(data.Atom("quote"), result_to_list(tok)))
-
-# Eigentlich brauche ich hier eine Regel für Backquoted-Listen, damit
-# der Parser da auch rekursiv durchsteigen kann.  Und ich muss dafür
-# sorgen, dass aus `(peter horst karl) (backquote (peter horst karl))
-# wird, und nicht (backquote peter horst karl)!!!
-splice_expr = (Suppress(Literal(",@")) + expr).setParseAction(
-    lambda st, loc, tok: data.ConsCell(data.Atom("comma-at"), result_to_list(tok)))
-unquote_expr = (Suppress(Literal(",")) + expr).setParseAction(
-    lambda st, loc, tok: data.ConsCell(data.Atom("comma"), result_to_list(tok)))
-# backquote = Forward
-backquote_content = Forward()
-backquote_list = open_paren + ZeroOrMore(backquote_content) + close_paren
-backquote_list.setParseAction(lambda st, loc, tok: result_to_list(tok))
-backquote_content << (expr |    # pylint: disable-msg=W0104
-                      splice_expr |
-                      unquote_expr |
-                      backquote_list)
-backquote_expr = (Suppress(Literal("`")) + backquote_content).setParseAction(
-    lambda st, loc, tok: quote_body(data.Atom("backquote"), result_to_list(tok)))
-token << (floating_point_number |  # pylint: disable-msg=W0104
-          integer |
-          string |
-          symbol |
-          comment |
-          quote_expr |
-          backquote_expr)
-
-# for x in (backquote_content, backquote_list, backquote_expr):
-#     x.setDebug(True)
-
-expr << (token | lisp_list)  # pylint: disable-msg=W0104
-
-program = ZeroOrMore(expr)
-
-if DEBUG_GRAMMAR:
-    for xpr in (open_paren,
-                close_paren,
-                string,
-                # number,
-                symbol,
-                token,
-                lisp_list,
-                expr,
-                program):
-        xpr.setDebug(True)
+from krylisp.containers import Vector
+
+# Samstag, 17. 10. 2026
+# The reader used to be a pyparsing grammar, which was easy to write, but
+# slow, and every list went through ParseResults and ConsCell.fromList
+# before it was done. The Reader splits the input into tokens with a
+# single regular expression and builds the ConsCells as it goes. Nested
+# lists are kept on an explicit stack, so deeply nested data does not run
+# into the recursion limit.
+
+# Every character that is not white space is part of some token, so
+# findall only skips white space. A lone double quote is a string that
+# is not terminated.
+TOKEN_RE: Final[re.Pattern] = re.compile(r"""
+  ;[^\n]*                   # comment
+| \#\(                      # start of a vector
+| [()'`]                    # parentheses and quotes
+| ,@?                       # comma and comma-at
+| "(?:[^"\\]|\\.)*"         # string
+| "                         # unterminated string
+| [^\s()'`,";]+             # number or symbol
+""", re.VERBOSE | re.DOTALL)
+# Inside a string, a backslash escapes a double quote or another
+# backslash, and \n stands for a newline.
+ESCAPE_RE: Final[re.Pattern] = re.compile(r'\\(["\\n])')
+ESCAPES: Final[dict[str, str]] = {'"': '"', "\\": "\\", "n": "\n"}
+
+# Increment this whenever the Reader returns something different for the
+# same text, so forms cached by an older Reader are not used.
+VERSION: Final[int] = 3
+
+NUMBER_START: Final[frozenset[str]] = frozenset("-0123456789")
+
+QUOTES: Final[dict[str, data.Atom]] = {
+    "'": data.Atom("quote"),
+    "`": data.Atom("backquote"),
+    ",": data.Atom("comma"),
+    ",@": data.Atom("comma-at"),
+}
 
 
 class ParseError(Exception):
     """Base class for errors that occur in the parser"""
 
+    line: int
+    column: int
+
+    def __init__(self, msg: str = "", line: int = 0, column: int = 0) -> None:
+        if line > 0:
+            msg = f"{line}:{column}: {msg}"
+        super().__init__(msg)
+        self.line = line
+        self.column = column
+
 
 class SyntaxException(ParseError):
     """A SyntaxException is raised when the parsers encounters a malformed program"""
@@ -108,34 +88,6 @@ class IncompleteException(ParseError):
     """
 
 
-def result_to_list(r: ParseResults) -> data.ConsCell:
-    """
-    Return the argument r as a Lisp list.
-
-    Atoms and numbers are returned verbatim.
-    """
-    # print "result_to_list({0.__class__}({0}))".format(r)
-    lst = []
-    if isinstance(r, (list, tuple)):
-        return data.ConsCell.fromList(r)
-    if isinstance(r, data.ConsCell):
-        return r
-    if isinstance(r, data.Atom):
-        return data.ConsCell(r, None)
-    if isinstance(r, (int, float, str)):
-        a = data.Atom(r)
-        return data.ConsCell(a, None)
-
-    for x in r:
-        if isinstance(x, ParseResults):
-            lst.append(result_to_list(x))
-        elif isinstance(x, (list, tuple)):
-            lst.append(data.ConsCell.fromList(x))
-        else:
-            lst.append(x)
-    return data.ConsCell.fromList(lst)
-
-
 def quote_body(head, body) -> data.ConsCell:
     """Return a list consisting of the head verbatim and the body quoted"""
     return data.ConsCell(head,
@@ -144,6 +96,171 @@ def quote_body(head, body) -> data.ConsCell:
                          else body)
 
 
+def atom(token: str) -> Union[data.Atom, int, float]:
+    """Return the number or symbol token stands for."""
+    if token[0] in NUMBER_START:
+        if data.int_re.match(token) is not None:
+            return int(token)
+        if data.float_re.match(token) is not None:
+            return float(token)
+    return data.Atom(token)
+
+
+def offset(text: str, index: int) -> int:
+    """Return the offset of the index'th token in text."""
+    for idx, match in enumerate(TOKEN_RE.finditer(text)):
+        if idx == index:
+            return match.start()
+    return len(text)
+
+
+class Reader:
+    """
+    Reader turns source text into Lisp forms.
+
+    Numbers and strings are returned as Python ints, floats and strs,
+    symbols as Atoms, lists as ConsCells and #(...) as Vectors, with 'x,
+    `x, ,x and ,@x read as (quote x), (backquote x), (comma x) and
+    (comma-at x).
+
+    The text can be fed to the Reader in pieces, as long as each piece
+    ends with a complete line. Forms are returned as soon as they are
+    complete, so a Reader can read a file of any size while only holding
+    on to the form it is currently reading.
+    """
+
+    __slots__ = ['stack', 'carry', 'line', 'column']
+
+    stack: list[list]
+    carry: str
+    line: int
+    column: int
+
+    def __init__(self) -> None:
+        # Each entry on the stack is either a list that has been opened, as
+        # [None, first cell, last cell, where], a vector, as the same with
+        # True appended, or a quote waiting for the
+        # form it applies to, as [name, where], with where being the piece
+        # of text, the index of the token that opened it and the line and
+        # column the piece of text starts at.
+        self.stack = []
+        # The start of a string that continues in the next piece of text.
+        self.carry = ""
+        # The number of lines in the pieces read so far, and the column the
+        # next piece starts at, which is only not 0 if it starts with carry.
+        self.line = 0
+        self.column = 0
+
+    def error(self, cls: type, msg: str, where: tuple[str, int, int, int]) -> ParseError:
+        """Return an exception of class cls for the token at where."""
+        text, index, line, column = where
+        pos: Final[int] = offset(text, index)
+        start: Final[int] = text.rfind("\n", 0, pos)
+        if start < 0:
+            return cls(msg, line + 1, column + pos + 1)
+        return cls(msg, line + text.count("\n", 0, pos) + 1, pos - start)
+
+    def feed(self, text: str) -> Iterator[Any]:  # pylint: disable-msg=R0912
+        """Return an iterator over the forms that are complete once text has been read."""
+        if self.carry:
+            text = self.carry + text
+            self.carry = ""
+        tokens = TOKEN_RE.findall(text)
+        line: Final[int] = self.line
+        column: Final[int] = self.column
+        if '"' in tokens:
+            # A string that is not terminated in this piece of text may be in
+            # the next one, so it is read again along with it.
+            cut = tokens.index('"')
+            self.carry = text[offset(text, cut):]
+            text = text[:len(text) - len(self.carry)]
+            del tokens[cut:]
+        self.line += text.count("\n")
+        start: Final[int] = text.rfind("\n")
+        self.column = column + len(text) if start < 0 else len(text) - start - 1
+
+        stack: Final[list[list]] = self.stack
+        for idx, token in enumerate(tokens):
+            char = token[0]
+            if char == "(":
+                stack.append([None, None, None, (text, idx, line, column)])
+                continue
+            if token == "#(":
+                stack.append([None, None, None, (text, idx, line, column), True])
+                continue
+            if char == ";":
+                continue
+            if char in "'`,":
+                stack.append([QUOTES[token], (text, idx, line, column)])
+                continue
+            if char == ")":
+                if not stack:
+                    raise self.error(SyntaxException, "unexpected ')'", (text, idx, line, column))
+                frame = stack.pop()
+                if frame[0] is not None:
+                    raise self.error(SyntaxException, f"{frame[0].value} of nothing", frame[1])
+                if len(frame) == 5:
+                    form = Vector(frame[1] if frame[1] is not None else ())
+                else:
+                    form = frame[1] if frame[1] is not None else data.ConsCell(None, None)
+            elif char == '"':
+                form = token[1:-1]
+                if "\\" in form:
+                    form = ESCAPE_RE.sub(lambda m: ESCAPES[m[1]], form)
+            else:
+                form = atom(token)
+
+            # A complete form is done, so it belongs to whatever is on top
+            # of the stack, after it has been wrapped by the quotes that
+            # apply to it.
+            while stack and stack[-1][0] is not None:
+                form = data.ConsCell(stack.pop()[0], data.ConsCell(form, None))
+            if not stack:
+                yield form
+                continue
+            frame = stack[-1]
+            cell = data.ConsCell(form, None)
+            if frame[1] is None:
+                frame[1] = cell
+            else:
+                frame[2].tail = cell
+            frame[2] = cell
+
+    def close(self) -> None:
+        """Check that there is no form left unfinished at the end of the text."""
+        if self.carry:
+            raise self.error(IncompleteException, "unterminated string", (self.carry, 0, self.line, self.column))
+        if self.stack:
+            frame = self.stack[-1]
+            if frame[0] is None:
+                raise self.error(IncompleteException, "unmatched '#('" if len(frame) == 5 else "unmatched '('",
+                                 frame[3])
+            raise self.error(IncompleteException, f"{frame[0].value} of nothing", frame[1])
+
+
+def read(text: str) -> Iterator[Any]:
+    """Return an iterator over the top-level forms in text."""
+    reader: Final[Reader] = Reader()
+    yield from reader.feed(text)
+    reader.close()
+
+
+def read_file(fh: TextIO, size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Return an iterator over the top-level forms in the file fh.
+
+    The file is read in pieces of about size characters, each of which
+    is only read when the forms from the previous one have been used up.
+    """
+    reader: Final[Reader] = Reader()
+    while True:
+        lines = fh.readlines(size)
+        if not lines:
+            break
+        yield from reader.feed("".join(lines))
+    reader.close()
+
+
 # Als nächstes möchte ich gern auch Makros schreiben und einsetzen können,
 # damit ich nicht so viele Special Forms schreiben kann.
 # Dafür bräuchte ich im Parser ein Environment mit Makros und müsste beim
@@ -165,44 +282,28 @@ def quote_body(head, body) -> data.ConsCell:
 # Symbol auszuwerten oder so, und das dann in den übergebordneten Ausdruck
 # zu splicen, das muss ich zwangsläufig im Interpreter tun.
 def parse_string(s: str, dbg: bool = False) -> Optional[Union[data.Atom, data.ConsCell, data.Function]]:
-    """Attempt to parse a string and return the result"""
+    """
+    Attempt to parse a string and return the result.
+
+    A single list is returned as is, any other single form as an Atom.
+    Several forms are returned as a list of forms, no forms at all as the
+    Atom nil.
+    """
     assert isinstance(s, str)
-    res = None
-    try:
-        res = program.parseString(s)
-    except ParseException as err:
-        print(err.line)
-        print(" "*(err.column-1) + "^")
-        print(err)
-        raise SyntaxException() from err
-
-    if data.listp(res):
-        return result_to_list(res)
+    res: Final[list] = list(read(s))
 
+    if len(res) == 0:
+        return data.Atom('nil')
     if len(res) == 1:
         if dbg:
             print(f"{res[0].__class__}: {res[0]}")
+        if isinstance(res[0], (data.ConsCell, Vector)):
+            return res[0]
         return data.Atom(res[0])
 
-    if isinstance(res, (str, data.ConsCell, data.Atom)):
-        if dbg:
-            print(f"Return a single value: {res}")
-        return res
-    if len(res) == 0:
-        # raise IncompleteException("Incomplete expression!")
-        return data.Atom('nil')
-
     if dbg:
         print(res.__class__, "(", len(res), ") ->", res)
-
-    try:
-        # return result_to_list(res if len(res) > 1 else res[0])
-        if len(res) <= 1:
-            return data.Atom(res[0])
-        return result_to_list(res)
-    except TypeError as terr:
-        print("TypeError:", terr)
-        return result_to_list(res) if len(res) > 1 else res[0]
+    return data.ConsCell.fromList(res)
 
 
 # Local Variables: #
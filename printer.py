@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-18 00:20:00 krylon>
+#
+# /data/code/python/krylisp/printer.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.printer
+
+Print Lisp values the way they would be written in source code.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from typing import Any, Final
+
+from krylisp import data
+from krylisp.containers import Vector
+
+
+# The characters a string must escape to be read back as it is.
+ESCAPES: Final[dict[int, str]] = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n"})
+
+
+def source(expr: Any) -> str:
+    """Return expr the way it would be written in Lisp source, so the Reader reads it back as it is."""
+    if isinstance(expr, data.ConsCell):
+        if not expr:
+            return "nil"
+        return "(" + " ".join(source(x) for x in expr) + ")"
+    if isinstance(expr, data.Atom):
+        return str(expr.value)
+    if isinstance(expr, str):
+        return '"' + expr.translate(ESCAPES) + '"'
+    if isinstance(expr, Vector):
+        return "#(" + " ".join(source(x) for x in expr) + ")"
+    return "nil" if expr is None else str(expr)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 13:25:00 krylon>
+#
+# /data/code/python/krylisp/profiler.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.profiler
+
+A deterministic profiler that times every call to a named Lisp function
+or macro.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import marshal
+import time
+from typing import TYPE_CHECKING, Any, Final, Optional
+
+from krylisp import data, error
+from krylisp.tracer import Tracer
+
+if TYPE_CHECKING:
+    from krylisp.lisp import LispInterpreter
+
+MACRO: Final[data.Atom] = data.Atom('macro')
+
+# The columns the report can be sorted by, mapped to the key for sorted().
+SORT_KEYS: Final[dict[str, Any]] = {
+    "cumulative": lambda entry: -entry.total_ns,
+    "self": lambda entry: -entry.self_ns,
+    "calls": lambda entry: -entry.calls,
+    "name": lambda entry: entry.name,
+}
+
+# Samstag, 17. 10. 2026
+# The Profiler is a Tracer, so it sees every form the interpreter enters and
+# exits. A form is a call if its head names a Function made by defun or a
+# macro; for those, the time between enter and exit is charged to the
+# function, and whatever its callees took is subtracted to get its self
+# time. Calls in tail position are exited together with their caller, so
+# the profile shows them below it, as they were written.
+
+
+def label(key: tuple[str, str]) -> str:
+    """Return the name the function or macro key appears under in reports."""
+    return key[1] if key[0] == "defun" else f"{key[1]}[macro]"
+
+
+class Entry:  # pylint: disable-msg=R0903
+    """Entry holds the statistics for one function or macro."""
+
+    __slots__ = ['kind', 'name', 'calls', 'primitive', 'self_ns', 'total_ns', 'callers']
+
+    kind: str
+    name: str
+    calls: int
+    primitive: int
+    self_ns: int
+    total_ns: int
+    callers: dict[tuple[str, str], list[int]]
+
+    def __init__(self, kind: str, name: str) -> None:
+        self.kind = kind
+        self.name = name
+        self.calls = 0
+        # Calls that were not made while another call to the same function
+        # was running, as pstats counts them.
+        self.primitive = 0
+        self.self_ns = 0
+        self.total_ns = 0
+        # For each caller, the number of calls, self and cumulative time.
+        self.callers = {}
+
+    def label(self) -> str:
+        """Return the name of the entry as it appears in reports."""
+        return label((self.kind, self.name))
+
+    def pstats_key(self) -> tuple[str, int, str]:
+        """Return the (file, line, function) triple pstats identifies the entry by."""
+        return (f"<{self.kind}>", 0, self.name)
+
+
+class Node:  # pylint: disable-msg=R0903
+    """Node is one call path in the tree of calls, for the collapsed stacks."""
+
+    __slots__ = ['label', 'parent', 'children', 'self_ns']
+
+    def __init__(self, name: str, parent: Optional['Node']) -> None:
+        self.label = name
+        self.parent = parent
+        self.children: dict[str, Node] = {}
+        self.self_ns = 0
+
+
+class Profiler(Tracer):
+    """Profiler records call counts and times for Lisp functions and macros."""
+
+    __slots__ = ['forms', 'entries', 'stack', 'active', 'root']
+
+    def __init__(self, interp: 'LispInterpreter') -> None:
+        self.forms = interp.forms
+        self.entries: dict[tuple[str, str], Entry] = {}
+        # The calls that are running: the form, the key of its Entry, its
+        # Node, when it started and how long its callees took so far.
+        self.stack: list[list] = []
+        # How many calls to each function are running.
+        self.active: dict[tuple[str, str], int] = {}
+        self.root = Node("", None)
+
+    def enter(self, expr: Any, env: data.Environment) -> None:
+        if expr.__class__ is not data.ConsCell:
+            return
+        head = expr.head
+        if head.__class__ is not data.Atom or not isinstance(head.value, str) \
+           or head.value in self.forms:
+            return
+        try:
+            op = env[head]
+        except error.LispError:
+            return
+        if isinstance(op, data.Function):
+            if op.name is None:
+                return
+            key = ("defun", op.name)
+        elif isinstance(op, data.ConsCell) and op.head is MACRO:
+            key = ("macro", head.value)
+        else:
+            return
+        parent = self.stack[-1][2] if self.stack else self.root
+        name: Final[str] = label(key)
+        node = parent.children.get(name)
+        if node is None:
+            node = parent.children[name] = Node(name, parent)
+        self.active[key] = self.active.get(key, 0) + 1
+        self.stack.append([expr, key, node, time.perf_counter_ns(), 0])
+
+    def exit(self, expr: Any, value: Any) -> None:
+        if not self.stack or self.stack[-1][0] is not expr:
+            return
+        now: Final[int] = time.perf_counter_ns()
+        _, key, node, start, inner = self.stack.pop()
+        elapsed: Final[int] = now - start
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = Entry(*key)
+        entry.calls += 1
+        entry.self_ns += elapsed - inner
+        node.self_ns += elapsed - inner
+        self.active[key] -= 1
+        # A recursive call is already part of the cumulative time of the
+        # outermost call.
+        if self.active[key] == 0:
+            entry.primitive += 1
+            entry.total_ns += elapsed
+        caller = ("", "") if not self.stack else self.stack[-1][1]
+        stats = entry.callers.get(caller)
+        if stats is None:
+            stats = entry.callers[caller] = [0, 0, 0]
+        stats[0] += 1
+        stats[1] += elapsed - inner
+        stats[2] += elapsed
+        if self.stack:
+            self.stack[-1][4] += elapsed
+
+    def table(self, sort: str = "cumulative") -> str:
+        """Return the statistics as a table, sorted by the column sort."""
+        if sort not in SORT_KEYS:
+            raise error.LispError(f"Cannot sort profile by {sort}, use one of {', '.join(SORT_KEYS)}")
+        lines = [f"{'calls':>9} {'self ms':>10} {'cum ms':>10} {'percall µs':>12}  name"]
+        for entry in sorted(self.entries.values(), key=SORT_KEYS[sort]):
+            lines.append(f"{entry.calls:9d} {entry.self_ns / 1e6:10.3f} {entry.total_ns / 1e6:10.3f}"
+                         f" {entry.total_ns / max(entry.primitive, 1) / 1e3:12.1f}  {entry.label()}")
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        """
+        Return the call paths in the collapsed stack format flamegraph tools read.
+
+        Each line is a path of names separated by semicolons, followed by the
+        self time of that path in nanoseconds.
+        """
+        lines = []
+        todo = list(self.root.children.values())
+        while todo:
+            node = todo.pop()
+            todo.extend(node.children.values())
+            if node.self_ns == 0:
+                continue
+            path = []
+            step: Optional[Node] = node
+            while step is not None and step is not self.root:
+                path.append(step.label)
+                step = step.parent
+            lines.append(f"{';'.join(reversed(path))} {node.self_ns}")
+        lines.sort()
+        return "\n".join(lines)
+
+    def pstats(self) -> dict:
+        """Return the statistics in the form pstats.Stats loads."""
+        keys = {key: entry.pstats_key() for key, entry in self.entries.items()}
+        res = {}
+        for entry in self.entries.values():
+            callers = {keys[caller]: (stats[0], stats[0], stats[1] / 1e9, stats[2] / 1e9)
+                       for caller, stats in entry.callers.items() if caller in keys}
+            res[entry.pstats_key()] = (entry.primitive, entry.calls, entry.self_ns / 1e9,
+                                       entry.total_ns / 1e9, callers)
+        return res
+
+    def dump_stats(self, path: str) -> None:
+        """Write the statistics to path, so they can be read with pstats.Stats(path)."""
+        with open(path, "wb") as fh:
+            marshal.dump(self.pstats(), fh)
+
+    def write_collapsed(self, path: str) -> None:
+        """Write the collapsed stacks to path."""
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(self.collapsed())
+            fh.write("\n")
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-# Time-stamp: <2025-03-08 16:04:35 krylon>
+# Time-stamp: <2026-10-17 18:05:00 krylon>
 #
 # /data/code/python/krylisp/repl.py
 # created on 08. 03. 2025
@@ -74,7 +74,7 @@ Type 'help' or '?' for a list of commands.
                     break
 
                 ast = parser.parse_string(txt, common.DEBUG)
-                result = self.interpreter.eval_expr(ast)
+                result = self.interpreter.eval_expr(self.interpreter.optimize(ast))
 
                 print(result)
             except EOFError:
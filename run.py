@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-18 01:10:00 krylon>
+#
+# /data/code/python/krylisp/run.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.run
+
+Evaluate many files, or many expressions, in worker processes, and write
+the results as JSON lines, e.g.
+
+    python -m krylisp.run --prelude rules.lisp --workers 8 rules/*.lisp
+    python -m krylisp.run --prelude rules.lisp - < expressions.txt
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Final, Iterator, Optional, TextIO
+
+from krylisp import common, image, lisp, parser
+from krylisp.formcache import FormCache
+from krylisp.printer import source
+
+# Samstag, 17. 10. 2026
+# The prelude is loaded once, by the parent process, and handed to each
+# worker the way pmap warms up its workers. A worker freezes the global
+# Environment it gets, and evaluates each job in a context of its own, so
+# what one job defines is not seen by the next. A job is either a file,
+# whose forms are evaluated in order, or a single line of input. Whatever
+# a job prints is captured and returned along with its value, so it does
+# not get mixed up with the JSON lines of the results.
+#
+# Jobs are handed to the workers as they are read, and no more than
+# --workers times --chunk-size of them are out at once. The result of
+# each job is written as soon as it and all jobs before it are done, so
+# the results of lines read from stdin come out while more lines are
+# still coming in, and a long input is never held in memory as a whole.
+
+# The interpreter of a worker process.
+_interp: Optional[lisp.LispInterpreter] = None  # pylint: disable-msg=C0103
+
+
+def warm(payload: bytes, compiled: bool, cache: Optional[str]) -> None:
+    """Set up the interpreter of a worker process with the prelude in payload."""
+    global _interp  # pylint: disable-msg=W0603
+    _interp = lisp.LispInterpreter(compiled=compiled, form_cache=False)
+    image.install(_interp, image.loads(_interp, payload))
+    _interp.freeze()
+    if cache is not None:
+        _interp.form_cache = FormCache(cache)
+
+
+def forms(interp: lisp.LispInterpreter, kind: str, arg: str) -> Iterator[Any]:
+    """Return an iterator over the forms of a job, which reads a file only as far as its forms are used."""
+    if kind == "expr":
+        yield from parser.read(arg)
+    elif interp.form_cache is not None:
+        yield from interp.form_cache.forms(arg)
+    else:
+        with open(arg, "r", encoding="utf-8") as fh:
+            yield from parser.read_file(fh)
+
+
+def run_job(job: tuple[int, str, str]) -> dict[str, Any]:
+    """Run one job in a worker process and return its result."""
+    assert _interp is not None
+    idx, kind, arg = job
+    res: Final[dict[str, Any]] = {"job": idx, kind: arg}
+    out: Final[io.StringIO] = io.StringIO()
+    env: Final = _interp.context()
+    before: Final[float] = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(out):
+            value = None
+            for form in forms(_interp, kind, arg):
+                value = _interp.eval_expr(form, env)
+        res["value"] = source(value)
+    except (Exception, SystemExit) as err:  # pylint: disable-msg=W0718
+        # A job that calls (quit) ends itself, not the worker, which would
+        # take the results of all other jobs with it.
+        res["error"] = f"{err.__class__.__name__}: {err}"
+    res["ms"] = round((time.perf_counter() - before) * 1000, 3)
+    if out.getvalue():
+        res["output"] = out.getvalue()
+    return res
+
+
+def jobs(files: list[str], stdin: TextIO) -> Iterator[tuple[int, str, str]]:
+    """Return the jobs for files, where - stands for one job per line read from stdin."""
+    idx = 0
+    for path in files:
+        if path != "-":
+            yield idx, "file", path
+            idx += 1
+            continue
+        for line in stdin:
+            if line.strip():
+                yield idx, "expr", line.rstrip("\n")
+                idx += 1
+
+
+class Results:
+    """Results writes the results of the jobs as JSON lines, in the order of the jobs, as soon as they are done."""
+
+    __slots__ = ['out', 'pending', 'count', 'errors', 'job_ms', 'lock']
+
+    out: TextIO
+    pending: deque[Future]
+    count: int
+    errors: int
+    job_ms: float
+
+    def __init__(self, out: TextIO) -> None:
+        self.out = out
+        self.pending = deque()
+        self.count = 0
+        self.errors = 0
+        self.job_ms = 0.0
+        # Results are written by whichever thread finds them done.
+        self.lock: Final[threading.Lock] = threading.Lock()
+
+    def add(self, future: Future) -> None:
+        """Write the result of future once it and all jobs added before are done."""
+        with self.lock:
+            self.pending.append(future)
+        future.add_done_callback(self.write)
+
+    def write(self, _future: Optional[Future] = None) -> None:
+        """Write the results of the oldest jobs that are done."""
+        with self.lock:
+            while self.pending and self.pending[0].done():
+                res = self.pending.popleft().result()
+                self.count += 1
+                self.errors += "error" in res
+                self.job_ms += res["ms"]
+                self.out.write(json.dumps(res) + "\n")
+            self.out.flush()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the jobs and return the exit status, which is 1 if any of them failed."""
+    argp = argparse.ArgumentParser(description="Evaluate Lisp files or expressions in worker processes")
+    argp.add_argument("files", nargs="+", help="The files to evaluate, - to read one expression per line from stdin")
+    argp.add_argument("--prelude", action="append", default=[], metavar="PATH",
+                      help="A file to load before any job, can be given more than once")
+    argp.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    argp.add_argument("--chunk-size", type=int, default=16,
+                      help="How many jobs each worker may have waiting for it")
+    argp.add_argument("--engine", choices=["walk", "compiled"], default="compiled")
+    cache_args = argp.add_mutually_exclusive_group()
+    cache_args.add_argument("--cache", action="store_true", help="Cache the parsed forms of the files")
+    cache_args.add_argument("--no-cache", dest="cache", action="store_false",
+                            help="Do not use the cache of parsed forms, the default")
+    argp.add_argument("--output", metavar="PATH", help="Write the results to PATH instead of stdout")
+    args = argp.parse_args(argv)
+
+    compiled: Final[bool] = args.engine == "compiled"
+    cache: Final[Optional[str]] = common.path.cache() if args.cache else None
+    interp: Final[lisp.LispInterpreter] = lisp.LispInterpreter(compiled=compiled, form_cache=cache is not None)
+    for path in args.prelude:
+        lisp.load_file(interp, path)
+    payload: Final[bytes] = image.dumps(interp, interp.env.get_global().data)
+
+    before: Final[float] = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        out: TextIO = sys.stdout if args.output is None else \
+            stack.enter_context(open(args.output, "w", encoding="utf-8"))
+        executor = stack.enter_context(ProcessPoolExecutor(args.workers, initializer=warm,
+                                                           initargs=(payload, compiled, cache)))
+        results: Final[Results] = Results(out)
+        window: Final[deque[Future]] = deque()
+        for job in jobs(args.files, sys.stdin):
+            if len(window) >= max(1, args.workers * args.chunk_size):
+                window.popleft().result()
+            window.append(executor.submit(run_job, job))
+            results.add(window[-1])
+        for future in window:
+            future.result()
+        results.write()
+        delta: Final[float] = time.perf_counter() - before
+        out.write(json.dumps({"summary": {
+            "jobs": results.count,
+            "errors": results.errors,
+            "workers": args.workers,
+            "seconds": round(delta, 3),
+            "jobs-per-s": round(results.count / delta, 1) if delta > 0 else None,
+            "job-ms": round(results.job_ms, 3),
+        }}) + "\n")
+    return 1 if results.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
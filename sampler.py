@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 22:40:00 krylon>
+#
+# /data/code/python/krylisp/sampler.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.sampler
+
+A sampling profiler that looks at the Lisp call stack on a timer signal.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import signal
+import threading
+from typing import TYPE_CHECKING, Any, Final
+
+from krylisp import data, error
+from krylisp.printer import source
+
+if TYPE_CHECKING:
+    from krylisp.lisp import LispInterpreter
+
+# How many characters of a call form are shown as its location.
+LOCATION_WIDTH: Final[int] = 40
+
+# Samstag, 17. 10. 2026
+# The interpreter keeps a list of the calls that are running anyway, so
+# taking a sample is a matter of copying that list. The timer counts CPU
+# time (ITIMER_PROF), and Python runs the signal handler in the main thread
+# between two bytecodes, so the list is never caught halfway through a
+# change. Samples are counted per distinct stack; names are only worked out
+# when the result is asked for.
+
+
+def label(entry: Any, locations: bool = False) -> str:
+    """Return the name of the call stack entry, followed by its call form if locations is True."""
+    if isinstance(entry, data.ConsCell):
+        head = entry.head
+        # (apply f args) is a call to f.
+        if head == 'apply' and entry.tail is not None:
+            head = entry.tail.head
+        name = head.value if isinstance(head, data.Atom) and isinstance(head.value, str) else "lambda"
+        if locations:
+            form = source(entry).replace(";", ",")
+            if len(form) > LOCATION_WIDTH:
+                form = form[:LOCATION_WIDTH - 3] + "..."
+            return f"{name} {form}"
+        return name
+    return entry if isinstance(entry, str) else "lambda"
+
+
+class Sampler:
+    """Sampler counts how often each Lisp call stack is seen when SIGPROF arrives."""
+
+    __slots__ = ['calls', 'interval', 'stacks', 'samples', 'previous', 'running']
+
+    calls: list
+    interval: float
+    stacks: dict[tuple, int]
+    samples: int
+    previous: Any
+    running: bool
+
+    def __init__(self, interp: 'LispInterpreter', interval: float = 0.001) -> None:
+        if interval <= 0:
+            raise error.LispError(f"Sampling interval must be positive, not {interval}")
+        self.calls = interp.calls
+        self.interval = interval
+        self.stacks = {}
+        self.samples = 0
+        self.previous = None
+        self.running = False
+
+    def start(self) -> None:
+        """Start taking a sample every interval seconds of CPU time."""
+        if self.running:
+            return
+        if not hasattr(signal, "setitimer"):
+            raise error.LispError("Sampling needs setitimer, which this platform does not have")
+        if threading.current_thread() is not threading.main_thread():
+            raise error.LispError("The sampler can only be started from the main thread")
+        self.previous = signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        self.running = True
+
+    def stop(self) -> None:
+        """Stop taking samples."""
+        if not self.running:
+            return
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, self.previous if self.previous is not None else signal.SIG_DFL)
+        self.running = False
+
+    def sample(self, _signum: int, _frame: Any) -> None:
+        """Record the current call stack. This is the signal handler."""
+        key: Final[tuple] = tuple(self.calls)
+        self.stacks[key] = self.stacks.get(key, 0) + 1
+        self.samples += 1
+
+    def counts(self, locations: bool = False) -> dict[str, int]:
+        """Return the number of samples per call path, with the names joined by semicolons."""
+        res: dict[str, int] = {}
+        for stack, count in self.stacks.items():
+            path = ";".join(label(entry, locations) for entry in stack) if stack else "<toplevel>"
+            res[path] = res.get(path, 0) + count
+        return res
+
+    def collapsed(self, locations: bool = False) -> str:
+        """Return the samples in the collapsed stack format flamegraph tools read."""
+        return "\n".join(f"{path} {count}" for path, count in sorted(self.counts(locations).items()))
+
+    def write_collapsed(self, path: str, locations: bool = False) -> None:
+        """Write the collapsed stacks to path."""
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(self.collapsed(locations))
+            fh.write("\n")
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-18 01:25:00 krylon>
+#
+# /data/code/python/krylisp/server.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.server
+
+An asyncio server that evaluates Lisp for many clients at once, each in
+a session of its own, e.g.
+
+    python -m krylisp.server --port 4711 prelude.lisp
+    python -m krylisp.server --socket /tmp/krylisp.sock prelude.lisp
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Final, Optional
+
+from krylisp import data, error, lisp, parser
+from krylisp.printer import source
+
+# How many of the most recent requests the latency percentiles are computed from.
+LATENCY_WINDOW: Final[int] = 10000
+PERCENTILES: Final[tuple[int, ...]] = (50, 90, 99)
+# The longest request line the server accepts.
+MAX_REQUEST: Final[int] = 1 << 24
+# The forms sessions may not use: they would stop the server, change the
+# interpreter for every session, read or write the files of the server, or
+# start worker processes for one session that all of them would share.
+FORBIDDEN: Final[tuple[str, ...]] = ("quit", "exit", "dbg", "profile", "start-sampler", "stop-sampler",
+                                     "load", "load-image", "save-image", "stream-lines", "pmap", "preduce")
+
+# Samstag, 17. 10. 2026
+# Requests and responses are JSON objects, one per line, so a form that
+# spans several lines travels as a string with embedded newlines. A request
+# is {"id": ..., "src": "..."} to evaluate the forms in src, or
+# {"id": ..., "op": "stats"}; the response carries the same id, and either
+# the value of the last form, printed as Lisp, or an error message.
+#
+# The prelude is loaded into one threadsafe interpreter, whose global
+# Environment is then frozen, and each session is a context on top of it.
+# The forms are evaluated by a pool of worker threads, so the event loop
+# keeps serving other sessions while a slow form runs. A session handles
+# one request at a time, so its context is never used by two threads at
+# once. Output written by print goes to the standard output of the server.
+#
+# Since the sessions share one interpreter, the forms in FORBIDDEN are
+# replaced, once the prelude is loaded, by one that raises a LispError. An
+# error that gets past that, even a SystemExit, is reported to the client
+# whose request raised it, and the server goes on.
+
+
+def forbidden(_interp: lisp.LispInterpreter, lst: data.ConsCell, _env: data.Environment) -> Any:
+    """Refuse to evaluate the form lst, which sessions are not allowed to use."""
+    raise error.LispError(f"{lst.head} is not available in a server session")
+
+
+def percentile(values: list[float], pct: int) -> float:
+    """Return the pct'th percentile of the sorted list values, by the nearest rank."""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+class Session:  # pylint: disable-msg=R0903
+    """Session is the state of one client: its own global Environment."""
+
+    __slots__ = ['sid', 'env', 'requests']
+
+    sid: int
+    env: data.Environment
+    requests: int
+
+    def __init__(self, sid: int, env: data.Environment) -> None:
+        self.sid = sid
+        self.env = env
+        self.requests = 0
+
+
+class Server:
+    """Server evaluates the requests of its clients in a pool of worker threads."""
+
+    __slots__ = ['interp', 'executor', 'sessions', 'ids', 'latencies', 'requests', 'errors',
+                 'waiting', 'running', 'lock']
+
+    def __init__(self, prelude: tuple[str, ...] = (), compiled: bool = True, workers: int = 4) -> None:
+        self.interp = lisp.LispInterpreter(compiled=compiled, threadsafe=True)
+        for path in prelude:
+            lisp.load_file(self.interp, path)
+        self.interp.freeze()
+        for name in FORBIDDEN:
+            self.interp.register_form(name, forbidden)
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="krylisp")
+        self.sessions: dict[int, Session] = {}
+        self.ids = itertools.count(1)
+        # The time each recent request took, from reading it to writing the
+        # response, in seconds.
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.errors = 0
+        # Requests that wait for a worker, and requests being evaluated.
+        self.waiting = 0
+        self.running = 0
+        self.lock = threading.Lock()
+
+    async def start(self, path: Optional[str] = None, host: str = "127.0.0.1",
+                    port: int = 0) -> asyncio.AbstractServer:
+        """Start listening on the Unix socket path, or on host and port if path is None."""
+        if path is not None:
+            return await asyncio.start_unix_server(self.serve, path, limit=MAX_REQUEST)
+        return await asyncio.start_server(self.serve, host, port, limit=MAX_REQUEST)
+
+    def close(self) -> None:
+        """Stop the worker threads."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handle the requests of one client until it disconnects."""
+        session: Final[Session] = Session(next(self.ids), self.interp.context())
+        self.sessions[session.sid] = session
+        loop: Final[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break
+                if not line:
+                    break
+                start = time.perf_counter()
+                response = await self.respond(loop, session, line)
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+                self.latencies.append(time.perf_counter() - start)
+        except ConnectionError:
+            pass
+        finally:
+            del self.sessions[session.sid]
+            writer.close()
+
+    async def respond(self, loop: asyncio.AbstractEventLoop, session: Session, line: bytes) -> dict[str, Any]:
+        """Return the response to the request line."""
+        self.requests += 1
+        session.requests += 1
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("A request must be a JSON object")
+        except ValueError as err:
+            self.errors += 1
+            return {"id": None, "error": f"Invalid request: {err}"}
+        response: Final[dict[str, Any]] = {"id": request.get("id")}
+        if request.get("op") == "stats":
+            response["value"] = self.stats()
+        elif isinstance(request.get("src"), str):
+            with self.lock:
+                self.waiting += 1
+            try:
+                response["value"] = await loop.run_in_executor(self.executor, self.evaluate,
+                                                               session, request["src"])
+            except (Exception, SystemExit) as err:  # pylint: disable-msg=W0718
+                self.errors += 1
+                response["error"] = f"{err.__class__.__name__}: {err}"
+        else:
+            self.errors += 1
+            response["error"] = "A request needs either src or op"
+        return response
+
+    def evaluate(self, session: Session, src: str) -> str:
+        """Evaluate the forms in src in session, and return the value of the last one. This runs in a worker."""
+        with self.lock:
+            self.waiting -= 1
+            self.running += 1
+        try:
+            res = None
+            for form in parser.read(src):
+                res = self.interp.eval_expr(form, session.env)
+            return source(res)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of requests, errors and sessions, the queue depth and the latency percentiles in ms."""
+        latencies: Final[list[float]] = sorted(self.latencies)
+        res: Final[dict[str, Any]] = {
+            "requests": self.requests,
+            "errors": self.errors,
+            "sessions": len(self.sessions),
+            "waiting": self.waiting,
+            "running": self.running,
+        }
+        for pct in PERCENTILES:
+            res[f"p{pct}-ms"] = percentile(latencies, pct) * 1000
+        return res
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Run the server until it is interrupted."""
+    server: Final[Server] = Server(tuple(args.prelude), args.engine == "compiled", args.workers)
+    listener: Final[asyncio.AbstractServer] = await server.start(args.socket, args.host, args.port)
+    for sock in listener.sockets:
+        print(f"Listening on {sock.getsockname()}", file=sys.stderr)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the server and return the exit status."""
+    argp = argparse.ArgumentParser(description="Evaluate Lisp for clients connecting over a socket")
+    argp.add_argument("prelude", nargs="*", help="Files to load before the first client connects")
+    argp.add_argument("--socket", metavar="PATH", help="Listen on the Unix socket PATH instead of TCP")
+    argp.add_argument("--host", default="127.0.0.1")
+    argp.add_argument("--port", type=int, default=4711)
+    argp.add_argument("--workers", type=int, default=4, help="How many forms are evaluated at once")
+    argp.add_argument("--engine", choices=["walk", "compiled"], default="compiled")
+    args = argp.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
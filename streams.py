@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 19:50:00 krylon>
+#
+# /data/code/python/krylisp/streams.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.streams
+
+Promises, which compute a value the first time it is asked for, and
+Streams, lazy sequences whose elements are computed one at a time.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import itertools
+from typing import Any, Callable, Final, Iterable, Iterator, Optional
+
+from krylisp import data, error
+from krylisp.containers import Vector
+
+# Samstag, 17. 10. 2026
+# A function that processes a large input used to get it as a list, which
+# has to be built in full before the first element can be looked at. A
+# Stream is a recipe for a sequence instead: iterating over it runs the
+# recipe, which produces one element at a time, and nothing is kept once
+# it has been passed on. stream-map, stream-filter and stream-take return
+# new recipes without computing anything, so a pipeline over the lines of
+# a huge file runs in constant memory, as long as no one holds on to the
+# elements. The flip side is that a Stream is computed anew every time it
+# is walked, calling the functions in it again.
+#
+# cons-stream builds the other kind of stream, the one SICP describes: an
+# element and a Promise of the rest, which is computed when it is first
+# needed and then remembered, so the stream can be walked again cheaply
+# and refer to itself. Walking it follows the Promises in a loop, so an
+# infinite stream does not need a deep Python stack.
+#
+# Lists and vectors can be used wherever a stream is expected. A Stream
+# made from a Python iterator can only be walked once, because the
+# iterator cannot be rewound.
+#
+# Two threads that force the same Promise at once may both compute its
+# value; the one that finishes first wins.
+
+
+class Promise:
+    """Promise computes a value when it is forced for the first time, and remembers it."""
+
+    __slots__ = ['thunk', 'value', 'done']
+
+    thunk: Optional[Callable[[], Any]]
+    value: Any
+    done: bool
+
+    def __init__(self, thunk: Callable[[], Any]) -> None:
+        self.thunk = thunk
+        self.value = None
+        self.done = False
+
+    def __repr__(self) -> str:
+        return "#<Promise forced >" if self.done else "#<Promise >"
+
+    def force(self) -> Any:
+        """Return the value of the Promise, computing it if this is the first time."""
+        if not self.done:
+            thunk = self.thunk
+            if thunk is None:
+                # Another thread has just finished.
+                return self.value
+            value = thunk()
+            # Computing the value may have forced the Promise already.
+            if not self.done:
+                self.value = value
+                self.done = True
+                # The thunk holds on to the Environment it was made in.
+                self.thunk = None
+        return self.value
+
+
+class Stream:
+    """Stream is a lazy sequence. Iterating over it computes its elements one at a time."""
+
+    __slots__ = ['source']
+
+    source: Callable[[], Iterator[Any]]
+
+    def __init__(self, source: Callable[[], Iterator[Any]]) -> None:
+        self.source = source
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.source()
+
+    def __repr__(self) -> str:
+        return "#<Stream >"
+
+
+class ConsStream(Stream):
+    """ConsStream is a stream made of an element and a Promise of the rest of the stream."""
+
+    __slots__ = ['head', 'tail']
+
+    head: Any
+    tail: Promise
+
+    def __init__(self, head: Any, tail: Promise) -> None:
+        super().__init__(self.walk)
+        self.head = head
+        self.tail = tail
+
+    def walk(self) -> Iterator[Any]:
+        """Yield the elements of the stream."""
+        node: Any = self
+        while node.__class__ is ConsStream:
+            yield node.head
+            node = node.tail.force()
+        yield from iterate(node)
+
+
+def iterate(value: Any) -> Iterator[Any]:
+    """Return an iterator over the elements of the stream, list or vector value."""
+    if value is None:
+        return iter(())
+    if isinstance(value, data.ConsCell):
+        return iter(value) if value else iter(())
+    if isinstance(value, (Stream, Vector)):
+        return iter(value)
+    raise error.LispError(f"{value} is not a stream")
+
+
+def from_iterable(items: Iterable[Any]) -> Stream:
+    """
+    Return a Stream of the elements of items.
+
+    If items is an iterator, like a generator, the Stream can only be
+    walked once, and walking it again raises a LispError.
+    """
+    if iter(items) is not items:
+        return Stream(lambda: iter(items))
+    used: list[bool] = []
+
+    def source() -> Iterator[Any]:
+        if used:
+            raise error.LispError("A stream made from an iterator can only be walked once")
+        used.append(True)
+        return items  # type: ignore[return-value]
+    return Stream(source)
+
+
+def stream_range(start: int, end: Optional[int] = None, step: int = 1) -> Stream:
+    """Return a Stream of the integers from start up to end, or without end if end is None."""
+    if any(x.__class__ is not int for x in (start, step)) or (end is not None and end.__class__ is not int):
+        raise error.LispError(f"The bounds and step of a range must be integers: {start} {end} {step}")
+    if step == 0:
+        raise error.LispError("The step of a range must not be zero")
+    if end is None:
+        return Stream(lambda: itertools.count(start, step))
+    return from_iterable(range(start, end, step))
+
+
+def lines(path: str) -> Stream:
+    """Return a Stream of the lines in the file at path, without their line breaks."""
+    def source() -> Iterator[str]:
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                yield line.rstrip("\r\n")
+    return Stream(source)
+
+
+def stream_map(fn: Callable[[Any], Any], stream: Any) -> Stream:
+    """Return a Stream of the results of calling fn on the elements of stream."""
+    return Stream(lambda: map(fn, iterate(stream)))
+
+
+def stream_filter(fn: Callable[[Any], Any], stream: Any) -> Stream:
+    """Return a Stream of the elements of stream fn returns true for."""
+    nullp: Final = data.nullp
+    return Stream(lambda: (x for x in iterate(stream) if not nullp(fn(x))))
+
+
+def stream_take(count: int, stream: Any) -> Stream:
+    """Return a Stream of the first count elements of stream."""
+    if count.__class__ is not int or count < 0:
+        raise error.LispError(f"Cannot take {count} elements of a stream")
+    return Stream(lambda: itertools.islice(iterate(stream), count))
+
+
+def stream_drop(count: int, stream: Any) -> Stream:
+    """Return a Stream of the elements of stream after the first count."""
+    if count.__class__ is not int or count < 0:
+        raise error.LispError(f"Cannot drop {count} elements of a stream")
+    return Stream(lambda: itertools.islice(iterate(stream), count, None))
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
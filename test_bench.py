@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 13:00:00 krylon>
+#
+# /data/code/python/krylisp/test_bench.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.test_bench
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from krylisp.bench import suite
+
+
+class TestSuite(unittest.TestCase):
+    """Test the benchmark suite"""
+
+    def test_01_run(self) -> None:
+        """Test running a workload with both engines"""
+        res = suite.run_suite(["ackermann", "parse"], ["walk", "compiled"], 1)
+        self.assertEqual(sorted(res), ["ackermann/compiled", "ackermann/walk", "parse"])
+        for seconds in res.values():
+            self.assertGreater(seconds, 0)
+
+    def test_02_compare(self) -> None:
+        """Test finding regressions"""
+        baseline = {"fib/walk": 1.0, "tak/walk": 2.0}
+        results = {"fib/walk": 1.2, "tak/walk": 2.6, "new/walk": 9.0}
+        regressions = suite.compare(results, baseline, 0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("tak/walk"))
+
+    def test_03_baseline(self) -> None:
+        """Test storing and comparing with a baseline"""
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "baseline.json")
+            self.assertIsNone(suite.load_baseline(path))
+            status = suite.main(["ackermann", "--engine", "compiled", "--rounds", "1",
+                                 "--baseline", path, "--save-baseline"])
+            self.assertEqual(status, 0)
+            self.assertIn("ackermann/compiled", suite.load_baseline(path))
+
+            # Pretend the baseline was much faster, so the next run regresses.
+            with open(path, "r", encoding="utf-8") as fh:
+                stored = json.load(fh)
+            stored["results"]["ackermann/compiled"] /= 1000
+            with open(path, "w", encoding="utf-8") as fh:
+                json.dump(stored, fh)
+            status = suite.main(["ackermann", "--engine", "compiled", "--rounds", "1",
+                                 "--baseline", path])
+            self.assertEqual(status, 1)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 17:25:00 krylon>
+#
+# /data/code/python/krylisp/test_budget.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.test_budget
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import functools
+import unittest
+from typing import Any, Optional
+
+from krylisp import budget, data, error, lisp, parser
+
+PRELUDE = """
+(defun fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))
+(defun spin (n) (if (= n 0) 0 (spin (- n 1))))
+"""
+
+
+class TestBudget(unittest.TestCase):
+    """Test evaluation budgets and the Scheduler"""
+
+    def test_01_fuel(self) -> None:
+        """Test that calls and loop iterations are counted exactly, with both engines"""
+        cases = [
+            # (fib 10) makes 177 calls.
+            ("(fib 10)", 177, 55),
+            ("(spin 50)", 51, 0),
+            ("(do ((i 0 (+ i 1))) ((= i 30) i))", 30, 30),
+        ]
+        for compiled in (False, True):
+            interp = lisp.LispInterpreter(compiled=compiled)
+            evaluate(interp, PRELUDE)
+            for src, steps, value in cases:
+                with self.subTest(compiled=compiled, src=src):
+                    ev = functools.partial(evaluate, interp, src)
+                    self.assertEqual(ev(budget.Budget(fuel=steps)), value)
+                    with self.assertRaises(error.BudgetExceeded) as ctx:
+                        ev(budget.Budget(fuel=steps - 1))
+                    self.assertEqual(ctx.exception.limit, "fuel")
+                    self.assertIsNone(interp.budget)
+                    self.assertEqual(len(interp.calls), 0)
+                    # Without a budget, nothing is counted.
+                    self.assertEqual(ev(), value)
+
+    def test_02_deadline_allocation(self) -> None:
+        """Test that an endless loop stops at its deadline, and a hungry one at its allocation cap"""
+        for compiled in (False, True):
+            interp = lisp.LispInterpreter(compiled=compiled)
+            evaluate(interp, PRELUDE)
+            cases = [
+                ("(spin 1000000000)", budget.Budget(timeout=0.05), "deadline"),
+                ("(do ((i 0 (+ i 1)) (l nil (cons i l))) ((= i 100000000) 0))",
+                 budget.Budget(allocation=10000), "allocation"),
+            ]
+            for src, limits, limit in cases:
+                with self.subTest(compiled=compiled, limit=limit):
+                    with self.assertRaises(error.BudgetExceeded) as ctx:
+                        evaluate(interp, src, limits)
+                    self.assertEqual(ctx.exception.limit, limit)
+                    self.assertIsInstance(ctx.exception, error.LispError)
+            with self.subTest(compiled=compiled, limit="negative"):
+                with self.assertRaises(error.LispError):
+                    budget.Budget(fuel=-1)
+
+    def test_03_scheduler(self) -> None:
+        """Test that the Scheduler interleaves tasks, and stops those that exceed their limits"""
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                sched = budget.Scheduler(fuel=500)
+                order: list[int] = []
+                tasks = []
+                for src, fuel in (("(fib 15)", None), ("(fib 5)", None), ("(spin 100000000)", 5000)):
+                    interp = lisp.LispInterpreter(compiled=compiled)
+                    evaluate(interp, PRELUDE)
+                    tasks.append(sched.spawn(interp, parser.parse_string(src), fuel=fuel))
+                    with self.assertRaises(error.LispError):
+                        sched.spawn(interp, parser.parse_string(src))
+                while (task := sched.step()) is not None:
+                    order.append(tasks.index(task))
+                long, short, endless = tasks[0], tasks[1], tasks[2]
+                self.assertEqual((long.value, long.error, long.slices), (610, None, 4))
+                self.assertEqual((short.value, short.slices), (5, 1))
+                self.assertIsInstance(endless.error, error.BudgetExceeded)
+                self.assertEqual(endless.error.limit, "fuel")
+                self.assertEqual(endless.slices, 10)
+                # The short task finishes in the first round, and the others take turns.
+                self.assertEqual(order[:6], [0, 1, 2, 0, 2, 0])
+                self.assertTrue(all(task.done for task in tasks))
+
+    def test_04_cancel(self) -> None:
+        """Test cancelling tasks, and errors that are not about the budget"""
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                sched = budget.Scheduler(fuel=100)
+                tasks = []
+                for src in ("(spin 100000000)", "(spin 100000000)", "(car 1)"):
+                    interp = lisp.LispInterpreter(compiled=compiled)
+                    evaluate(interp, PRELUDE)
+                    tasks.append(sched.spawn(interp, parser.parse_string(src)))
+                running, waiting, failing = tasks[0], tasks[1], tasks[2]
+                sched.step()
+                sched.cancel(running)
+                sched.cancel(waiting)
+                sched.run()
+                for task in (running, waiting):
+                    self.assertTrue(task.done)
+                    self.assertIsInstance(task.error, error.BudgetExceeded)
+                    self.assertEqual(task.error.limit, "cancelled")
+                self.assertEqual(waiting.slices, 0)
+                self.assertIsInstance(failing.error, error.LispError)
+                self.assertNotIsInstance(failing.error, error.BudgetExceeded)
+
+
+def evaluate(interp: lisp.LispInterpreter, src: str, limits: Optional[budget.Budget] = None) -> Any:
+    """Evaluate the source code src in interp, within limits if they are given."""
+    value: Any = None
+    for form in parser.read(src):
+        value = interp.eval_expr(form) if limits is None else interp.eval_budget(form, limits)
+    return None if value is data.EMPTY_LIST else value
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-18 00:20:00 krylon>
+#
+# /data/code/python/krylisp/test_containers.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.test_containers
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import functools
+import os
+import tempfile
+import unittest
+from typing import Any
+
+from krylisp import error, formcache, lisp, parser, printer
+from krylisp.containers import HashTable, Vector
+
+
+class TestContainers(unittest.TestCase):
+    """Test hash tables and vectors"""
+
+    def test_01_hash_tables(self) -> None:
+        """Test storing, finding and removing values, with both engines"""
+        cases = [
+            ("(setq h (make-hash-table))", "#<HashTable 0 >"),
+            ("(puthash 'a 1 h)", "1"),
+            ("(puthash '(x (y 2)) 'nested h)", "nested"),
+            ('(puthash "a" "string" h)', '"string"'),
+            ("(puthash 1.0 'float h)", "float"),
+            ("(list (gethash 'a h) (gethash 'A h) (gethash \"a\" h) (gethash 1.0 h) (gethash 1 h))",
+             '(1 1 "string" float nil)'),
+            ("(gethash (list 'x (list 'y (+ 1 1))) h)", "nested"),
+            ("(gethash 'missing h 'default)", "default"),
+            ("(puthash 'a 2 h)", "2"),
+            ("(hash-table-count h)", "4"),
+            ("(list (remhash 'a h) (remhash 'a h) (hash-table-count h))", "(t nil 3)"),
+            ("(setq total 0)", "0"),
+            ("(maphash (lambda (k v) (setq total (+ total (if (eq k 1.0) 10 1)))) h)", "nil"),
+            ("total", "12"),
+        ]
+        for compiled in (False, True):
+            interp = lisp.LispInterpreter(compiled=compiled)
+            for src, expected in cases:
+                with self.subTest(compiled=compiled, src=src):
+                    self.assertEqual(show(evaluate(interp, src)), expected)
+
+    def test_02_vectors(self) -> None:
+        """Test making, reading and changing vectors, with both engines"""
+        cases = [
+            ("(setq v (make-vector 3 0))", "#(0 0 0)"),
+            ("(aset v 1 'b)", "b"),
+            ("(list (aref v 0) (aref v 1) (vector-length v))", "(0 b 3)"),
+            ("(vector-push (+ 1 2) v)", "3"),
+            ("v", "#(0 b 0 3)"),
+            ("(vector 1 (+ 1 1) '(a))", "#(1 2 (a))"),
+            ("(aref #(1 (+ 1 1) x) 1)", "(+ 1 1)"),
+            ("(do ((i 0 (+ i 1)) (s 0 (+ s (aref v 3)))) ((= i 4) s))", "12"),
+        ]
+        for compiled in (False, True):
+            interp = lisp.LispInterpreter(compiled=compiled)
+            for src, expected in cases:
+                with self.subTest(compiled=compiled, src=src):
+                    self.assertEqual(show(evaluate(interp, src)), expected)
+
+    def test_03_errors(self) -> None:
+        """Test that misuse raises a LispError"""
+        errors = [
+            "(aref (vector 1 2) 2)",
+            "(aref (vector 1 2) -1)",
+            "(aref (vector 1 2) 'a)",
+            "(aref (make-hash-table) 0)",
+            "(gethash 1 (vector))",
+            "(puthash (vector) 1 (make-hash-table))",
+            "(puthash (list (make-hash-table)) 1 (make-hash-table))",
+            "(maphash 'print (make-hash-table))",
+            "(make-vector -1)",
+            "(make-vector 1.5)",
+        ]
+        for compiled in (False, True):
+            interp = lisp.LispInterpreter(compiled=compiled)
+            for src in errors:
+                with self.subTest(compiled=compiled, src=src):
+                    with self.assertRaises(error.LispError):
+                        evaluate(interp, src)
+
+    def test_04_storage(self) -> None:
+        """Test that vector literals survive the form cache, and containers an image"""
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "vectors.lisp")
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write("(setq v #(1 \"s\" (a #(b)) #()))\n")
+            cache = formcache.FormCache(folder)
+            first = [printer.source(form) for form in cache.forms(path)]
+            second = [printer.source(form) for form in cache.forms(path)]
+            self.assertEqual(first, second)
+            self.assertEqual(first, ['(setq v #(1 "s" (a #(b)) #()))'])
+            self.assertEqual(cache.hits, 1)
+
+            interp = lisp.LispInterpreter(form_cache=False)
+            lisp.load_file(interp, path)
+            evaluate(interp, "(setq h (make-hash-table))")
+            evaluate(interp, "(puthash '(k) v h)")
+            image = os.path.join(folder, "containers.image")
+            interp.save_image(image)
+            other = lisp.LispInterpreter(compiled=True, form_cache=False)
+            other.load_image(image)
+            ev = functools.partial(evaluate, other)
+            self.assertIsInstance(ev("h"), HashTable)
+            self.assertIsInstance(ev("v"), Vector)
+            self.assertEqual(show(ev("(aref (gethash '(k) h) 2)")), "(a #(b))")
+            self.assertIs(ev("(gethash '(k) h)"), ev("v"))
+
+
+def evaluate(interp: lisp.LispInterpreter, src: str) -> Any:
+    """Evaluate the source code src in interp."""
+    return interp.eval_expr(parser.parse_string(src))
+
+
+def show(value: Any) -> str:
+    """Return value as Lisp source."""
+    return printer.source(value)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
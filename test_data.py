@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-# Time-stamp: <2024-05-19 18:53:57 krylon>
+# Time-stamp: <2026-10-17 12:27:00 krylon>
 #
 # /data/code/python/krylisp/test_data.py
 # created on 18. 05. 2024
@@ -17,6 +17,8 @@ krylisp.test_data
 (c) 2024 Benjamin Walkenhorst
 """
 
+import copy
+import pickle
 import unittest
 from typing import Any, Final
 
@@ -66,6 +68,21 @@ class TestAtom(unittest.TestCase):
         for c in test_cases:
             self.assertEqual(c[0] == c[1], c[2])
 
+    def test_02_intern(self) -> None:
+        """Test that there is only one Atom per symbol"""
+        sym: Final[data.Atom] = data.Atom("Interned-Symbol")
+        self.assertIs(data.Atom("interned-symbol"), sym)
+        self.assertIs(data.Atom("INTERNED-SYMBOL"), sym)
+        self.assertIs(data.Atom(sym), sym)
+        self.assertIs(copy.deepcopy(sym), sym)
+        self.assertIs(pickle.loads(pickle.dumps(sym)), sym)
+        self.assertEqual(sym.value, "interned-symbol")
+        self.assertNotEqual(sym, data.Atom("other-symbol"))
+
+        num: Final[data.Atom] = data.Atom("42")
+        self.assertEqual(num.value, 42)
+        self.assertNotIn("42", data.SYMBOLS)
+
 # Local Variables: #
 # python-indent: 4 #
 # End: #
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 22:40:00 krylon>
+#
+# /data/code/python/krylisp/test_formcache.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.test_formcache
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import os
+import tempfile
+import tracemalloc
+import unittest
+from typing import Final
+
+from krylisp import formcache, lisp, parser
+from krylisp.printer import source
+
+SRC = """
+;; A comment
+(defun greet (name) (list "Hello, \\"" name "\\"!"))
+(setq numbers '(1 -2 3.5 () (nested (list)) `(a ,b ,@c)))
+(setq answer (+ 40 2))
+"""
+
+
+class TestFormCache(unittest.TestCase):
+    """Test the cache of parsed forms"""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable-msg=R1732
+        self.src = os.path.join(self.tmp.name, "test.lisp")
+        with open(self.src, "w", encoding="utf-8") as fh:
+            fh.write(SRC)
+        self.cache = formcache.FormCache(os.path.join(self.tmp.name, "cache"))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_01_round_trip(self) -> None:
+        """Test that cached forms are the forms the Reader returns"""
+        expected = [source(form) for form in parser.read(SRC)]
+        for round_no in range(2):
+            with self.subTest(round=round_no):
+                self.assertEqual([source(form) for form in self.cache.forms(self.src)], expected)
+                self.assertEqual((self.cache.hits, self.cache.misses), (round_no, 1))
+        self.assertEqual(self.cache.stats()["hit-rate"], 0.5)
+
+    def test_02_invalidation(self) -> None:
+        """Test that the cache is rebuilt when the file or the Reader changes"""
+        list(self.cache.forms(self.src))
+        with open(self.src, "a", encoding="utf-8") as fh:
+            fh.write("(setq more t)\n")
+        self.assertEqual(len(list(self.cache.forms(self.src))), 4)
+        self.assertEqual(len(list(self.cache.forms(self.src))), 4)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+        with open(self.cache.cache_path(self.src), "wb") as fh:
+            fh.write(b"garbage")
+        self.assertEqual(len(list(self.cache.forms(self.src))), 4)
+        self.assertEqual(self.cache.misses, 3)
+
+        # A form that is only partly used is not cached.
+        os.remove(self.cache.cache_path(self.src))
+        next(self.cache.forms(self.src))
+        self.assertFalse(os.path.exists(self.cache.cache_path(self.src)))
+
+    def test_03_load_file(self) -> None:
+        """Test loading files through the cache, with both engines"""
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                interp = lisp.LispInterpreter(compiled=compiled)
+                interp.form_cache = self.cache
+                for _ in range(2):
+                    lisp.load_file(interp, self.src)
+                self.assertEqual(interp.eval_expr(parser.parse_string("answer")), 42)
+                self.assertEqual(list(interp.eval_expr(parser.parse_string('(greet "you")'))),
+                                 ['Hello, "', "you", '"!'])
+                stats = list(interp.eval_expr(parser.parse_string("(form-cache-stats)")))
+                self.assertEqual(stats[:4], [parser.atom(":hits"), 2 * compiled + 1,
+                                             parser.atom(":misses"), 1])
+
+    def test_04_streaming(self) -> None:
+        """Test that forms are cached and read one at a time, and a damaged cache is read around"""
+        count: Final[int] = 20000
+        with open(self.src, "w", encoding="utf-8") as fh:
+            for idx in range(count):
+                fh.write(f"(setq var '(a list of {idx} \"things\"))\n")
+        for round_no, kind in enumerate(("miss", "hit")):
+            tracemalloc.start()
+            try:
+                seen = sum(1 for _ in self.cache.forms(self.src))
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            with self.subTest(kind=kind):
+                self.assertEqual(seen, count)
+                self.assertEqual(self.cache.hits, round_no)
+                # Holding all forms at once would take several megabytes.
+                self.assertLess(peak, 1 << 20)
+
+        # Cut the cache file off in the middle.
+        path: Final[str] = self.cache.cache_path(self.src)
+        with open(path, "r+b") as fh:
+            fh.truncate(os.path.getsize(path) // 2)
+        forms = [source(form) for form in self.cache.forms(self.src)]
+        self.assertEqual(len(forms), count)
+        self.assertEqual(forms[-1], f'(setq var (quote (a list of {count - 1} "things")))')
+        self.assertEqual(len(set(forms)), count)
+        self.assertEqual(self.cache.misses, 2)
+        self.assertEqual(sum(1 for _ in self.cache.forms(self.src)), count)
+        self.assertEqual(self.cache.hits, 2)
+
+    def test_05_prune(self) -> None:
+        """Test that the folder keeps only the cache files used most recently"""
+        cache = formcache.FormCache(self.cache.folder, max_files=3)
+        paths = []
+        for idx in range(5):
+            path = os.path.join(self.tmp.name, f"file{idx}.lisp")
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(f"(setq x {idx})\n")
+            paths.append(path)
+            list(cache.forms(path))
+            # Make sure the files are told apart by their times.
+            os.utime(cache.cache_path(path), (idx, idx))
+        names = sorted(os.listdir(cache.folder))
+        self.assertEqual(names, sorted(os.path.basename(cache.cache_path(path)) for path in paths[-3:]))
+
+    def test_06_default(self) -> None:
+        """Test that interpreters only cache forms when asked to"""
+        self.assertIsNone(lisp.LispInterpreter().form_cache)
+        self.assertIsNotNone(lisp.LispInterpreter(form_cache=True).form_cache)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
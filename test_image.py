@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 21:00:00 krylon>
+#
+# /data/code/python/krylisp/test_image.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.test_image
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import functools
+import io
+import os
+import pickle
+import tempfile
+import unittest
+from typing import Any
+
+from krylisp import data, error, image, lisp, parser
+
+PRELUDE = """
+(defun square (x) (* x x))
+(defmacro twice (x) (list '+ x x))
+(defun fact (n) (if (< n 2) 1 (* n (fact (- n 1)))))
+(defun make-counter (start)
+  (let ((n start))
+    (list (lambda () (setq n (+ n 1)))
+          (lambda () n))))
+(setq counter (make-counter 10))
+(setq colors '(red green blue))
+(defun-memo fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))
+"""
+
+
+class TestImage(unittest.TestCase):
+    """Test saving and loading images"""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable-msg=R1732
+        self.path = os.path.join(self.tmp.name, "test.image")
+        self.src = os.path.join(self.tmp.name, "prelude.lisp")
+        with open(self.src, "w", encoding="utf-8") as fh:
+            fh.write(PRELUDE)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_01_round_trip(self) -> None:
+        """Test that an image works like the source it was built from, with both engines"""
+        for saved in (False, True):
+            for loaded in (False, True):
+                with self.subTest(saved=saved, loaded=loaded):
+                    interp = lisp.LispInterpreter(compiled=saved)
+                    lisp.load_file(interp, self.src)
+                    ev = functools.partial(evaluate, interp)
+                    ev("(apply (car counter) nil)")
+                    ev("(fib 30)")
+                    interp.save_image(self.path)
+
+                    other = lisp.LispInterpreter(compiled=loaded)
+                    ev = functools.partial(evaluate, other)
+                    self.assertEqual(ev(f'(load-image "{self.path}")'), data.Atom("t"))
+                    self.assertEqual(ev("(square 12)"), 144)
+                    self.assertEqual(ev("(twice 21)"), 42)
+                    self.assertEqual(ev("(fact 20)"), 2432902008176640000)
+                    self.assertEqual([str(x.value) for x in ev("colors")], ["red", "green", "blue"])
+                    # Both closures still share the same binding of n.
+                    ev("(apply (car counter) nil)")
+                    self.assertEqual(ev("(apply (car (cdr counter)) nil)"), 12)
+                    # The memo keeps what it has cached.
+                    self.assertEqual(ev("(fib 31)"), 1346269)
+                    self.assertEqual(other.memo_stats("fib")["misses"], 1)
+                    self.assertEqual(ev("(fib 2)"), 1)
+
+    def test_02_stale(self) -> None:
+        """Test that stale or damaged images are detected and rebuilt"""
+        interp = lisp.LispInterpreter()
+        self.assertFalse(interp.load_image(self.path, [self.src]))
+        self.assertTrue(os.path.exists(self.path))
+        self.assertTrue(lisp.LispInterpreter().load_image(self.path, [self.src]))
+
+        with open(self.src, "a", encoding="utf-8") as fh:
+            fh.write("(defun cube (x) (* x x x))\n")
+        with self.assertRaises(error.ImageError):
+            image.load(lisp.LispInterpreter(), self.path, [self.src])
+        interp = lisp.LispInterpreter()
+        self.assertFalse(interp.load_image(self.path, [self.src]))
+        self.assertEqual(evaluate(interp, "(cube 3)"), 27)
+        interp = lisp.LispInterpreter()
+        self.assertTrue(interp.load_image(self.path, [self.src]))
+        self.assertEqual(evaluate(interp, "(cube 3)"), 27)
+
+        with open(self.path, "rb") as fh:
+            raw = fh.read()
+        damaged = {
+            "magic": b"KRYLISP IMAGF\n" + raw[len(image.MAGIC):],
+            "version": raw.replace(b"version", b"versiom", 1),
+            "payload": raw[:-20],
+        }
+        for name, content in damaged.items():
+            with self.subTest(damage=name):
+                with open(self.path, "wb") as fh:
+                    fh.write(content)
+                with self.assertRaises(error.ImageError):
+                    lisp.LispInterpreter().load_image(self.path)
+                self.assertFalse(lisp.LispInterpreter().load_image(self.path, [self.src]))
+
+    def test_03_damaged_header(self) -> None:
+        """Test that an image whose header is cut off or malformed is rebuilt"""
+        lisp.LispInterpreter().load_image(self.path, [self.src])
+        with open(self.path, "rb") as fh:
+            raw = fh.read()
+        buf = io.BytesIO(raw[len(image.MAGIC):])
+        header = pickle.load(buf)
+        payload = raw[len(image.MAGIC) + buf.tell():]
+        del header["sources"]
+        damaged = {
+            "truncated": raw[:len(image.MAGIC) + 5],
+            "garbage": image.MAGIC + b"\x80\x05garbage" + payload,
+            "not a dict": image.MAGIC + pickle.dumps(["version"]) + payload,
+            "no sources": image.MAGIC + pickle.dumps(header) + payload,
+        }
+        for name, content in damaged.items():
+            with self.subTest(damage=name):
+                with open(self.path, "wb") as fh:
+                    fh.write(content)
+                with self.assertRaises(error.ImageError):
+                    image.load(lisp.LispInterpreter(), self.path, [self.src])
+                interp = lisp.LispInterpreter()
+                self.assertFalse(interp.load_image(self.path, [self.src]))
+                self.assertEqual(evaluate(interp, "(square 4)"), 16)
+
+
+def evaluate(interp: lisp.LispInterpreter, src: str) -> Any:
+    """Evaluate the source code src in interp."""
+    return interp.eval_expr(parser.parse_string(src))
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
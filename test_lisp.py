@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-18 03:20:00 krylon>
+#
+# /data/code/python/krylisp/test_lisp.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.test_lisp
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from typing import Any, Final
+
+from krylisp import compiler, data, lisp, parser
+from krylisp.tracer import DebugTracer, Tracer
+
+
+def to_py(x: Any) -> Any:
+    """Convert a Lisp value to plain Python data, so it is easier to compare."""
+    if data.nullp(x):
+        return []
+    if isinstance(x, data.ConsCell):
+        return [to_py(item) for item in x]
+    if isinstance(x, data.Atom):
+        return x.value
+    return x
+
+
+class Recorder(Tracer):
+    """Recorder keeps the events it receives in a list."""
+
+    def __init__(self) -> None:
+        self.events: list[tuple] = []
+
+    def enter(self, expr: Any, env: data.Environment) -> None:
+        self.events.append(("enter", to_py(expr)))
+
+    def exit(self, expr: Any, value: Any) -> None:
+        self.events.append(("exit", to_py(expr), to_py(value)))
+
+    def lookup(self, name: data.Atom, value: Any) -> None:
+        self.events.append(("lookup", name.value, to_py(value)))
+
+    def expand(self, macro: data.ConsCell, form: data.ConsCell, expansion: Any) -> None:
+        self.events.append(("expand", to_py(form), to_py(expansion)))
+
+
+# The test cases are evaluated in order, in the same interpreter, so later
+# cases may rely on definitions made by earlier ones.
+CORPUS: Final[list[tuple[str, Any]]] = [
+    ("(+ 1 2 3)", 6),
+    ("(- 10 1 2)", 7),
+    ("(* 2 3 4)", 24),
+    ("(/ 8 2)", 4.0),
+    ("(mod 17 5)", 2),
+    ("(< 1 2 3)", "t"),
+    ("(> 1 2)", []),
+    ("(= 2 2 2)", "t"),
+    ("(if (< 1 2) 'yes 'no)", "yes"),
+    ("(if (> 1 2) 'yes 'no)", "no"),
+    ("(and 1 2)", 2),
+    ("(or () 3)", 3),
+    ("(not ())", "t"),
+    ("(list 1 2 (+ 1 2))", [1, 2, 3]),
+    ("(car '(1 2 3))", 1),
+    ("(cdr '(1 2 3))", [2, 3]),
+    ("(cons 1 '(2))", [1, 2]),
+    ("(let ((a 1) (b 2)) (+ a b))", 3),
+    ("(setq x 5)", 5),
+    ("x", 5),
+    ("(do ((i 0 (+ i 1)) (s 0 (+ s i))) ((= i 10) s))", 55),
+    ("(defun fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))", "fib"),
+    ("(fib 15)", 610),
+    ("(defmacro incf (x) `(setq ,x (+ ,x 1)))", "incf"),
+    ("(incf x)", 6),
+    ("x", 6),
+    ("(eval '(+ 1 2))", 3),
+    ("((lambda (x) (* x x)) 4)", 16),
+    ("(defun len (l) (if (null l) 0 (+ 1 (len (cdr l)))))", "len"),
+    ("(len '(1 2 3))", 3),
+    ("(defun count-args (&rest xs) (len xs))", "count-args"),
+    ("(count-args)", 0),
+    ("(count-args 1 2 3)", 3),
+    ("(let ((a 1)) (let ((b (+ a 1))) (list a b)))", [1, 2]),
+    ("`(a ,x ,@(list 1 2))", ["a", 6, 1, 2]),
+]
+
+
+class TestInterpreter(unittest.TestCase):
+    """Test the interpreter"""
+
+    def eval_corpus(self, interp: lisp.LispInterpreter) -> None:
+        """Evaluate the test corpus and check the results."""
+        for src, expected in CORPUS:
+            with self.subTest(src=src):
+                res = interp.eval_expr(parser.parse_string(src))
+                self.assertEqual(to_py(res), expected)
+
+    def test_01_corpus(self) -> None:
+        """Evaluate the test corpus"""
+        self.eval_corpus(lisp.LispInterpreter())
+
+    def test_02_compiled(self) -> None:
+        """Evaluate the test corpus with the compiler"""
+        self.eval_corpus(lisp.LispInterpreter(compiled=True))
+
+    def test_03_register(self) -> None:
+        """Test registering new builtins and special forms"""
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                self.register(lisp.LispInterpreter(compiled=compiled))
+
+    def test_04_lexical(self) -> None:
+        """Test that functions close over the variables they see"""
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                self.closures(lisp.LispInterpreter(compiled=compiled))
+
+    def closures(self, interp: lisp.LispInterpreter) -> None:
+        """Create some closures with interp and try them out."""
+        cases: Final[list[tuple[str, Any]]] = [
+            ("(defun make-counter (n) (lambda () (setq n (+ n 1))))", "make-counter"),
+            ("(setq c1 (make-counter 10))", None),
+            ("(setq c2 (make-counter 100))", None),
+            ("(c1)", 11),
+            ("(c1)", 12),
+            ("(c2)", 101),
+            ("(defun peek () depth)", "peek"),
+            ("(setq depth 'global)", "global"),
+            ("(let ((depth 'local)) (peek))", "global"),
+            ("(let ((a 1)) (let ((b 2)) (let ((c 3)) (let ((d 4)) (list a b c d)))))",
+             [1, 2, 3, 4]),
+            ("(defun add3 (a b c) (+ a b c))", "add3"),
+            ("(apply add3 '(1 2 3))", 6),
+            ("(apply + (list 1 2 3))", 6),
+            ("(apply list '(a b))", ["a", "b"]),
+            ("(apply (lambda (&rest xs) xs) '(1 2))", [1, 2]),
+            ("(apply c2 nil)", 102),
+        ]
+        for src, expected in cases:
+            with self.subTest(src=src):
+                res = interp.eval_expr(parser.parse_string(src))
+                if expected is not None:
+                    self.assertEqual(to_py(res), expected)
+
+        add3 = interp.eval_expr(parser.parse_string("add3"))
+        self.assertIsInstance(add3, data.Function)
+        self.assertEqual(add3(1, 2, 3), 6)
+
+    def test_05_macro_cache(self) -> None:
+        """Test that macro calls are expanded once per call site"""
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                interp = lisp.LispInterpreter(compiled=compiled)
+                interp.eval_expr(parser.parse_string("(defmacro bump (x) `(setq ,x (+ ,x 1)))"))
+                loop = parser.parse_string("(do ((i 0 (+ i 1)) (n 0 n)) ((= i 10) n) (bump n))")
+                self.assertEqual(interp.eval_expr(loop), 10)
+                stats = interp.macros.stats()
+                self.assertEqual(stats["expansions"], 1)
+                self.assertEqual(stats["hits"], 9)
+                self.assertEqual(stats["sites"], 1)
+
+                interp.eval_expr(parser.parse_string("(defmacro bump (x) `(setq ,x (+ ,x 2)))"))
+                self.assertEqual(interp.macros.stats()["sites"], 0)
+                self.assertEqual(interp.eval_expr(loop), 20)
+                self.assertEqual(interp.macros.stats()["expansions"], 2)
+
+                # Forms evaluated once do not pile up in the cache.
+                interp.macros = lisp.MacroCache(16)
+                for _ in range(100):
+                    self.assertEqual(interp.eval_expr(parser.parse_string("(let ((n 0)) (bump n))")), 2)
+                self.assertEqual(interp.macros.stats()["sites"], 16)
+                self.assertEqual(interp.macros.stats()["expansions"], 100)
+                self.assertEqual(interp.eval_expr(loop), 20)
+                self.assertEqual(interp.macros.stats()["sites"], 16)
+
+    def test_06_tail_calls(self) -> None:
+        """Test that tail calls do not grow the Python stack"""
+        defs: Final[list[str]] = [
+            "(defun count-down (n acc) (if (= n 0) acc (count-down (- n 1) (+ acc 1))))",
+            "(defun ev? (n) (if (= n 0) t (od? (- n 1))))",
+            "(defun od? (n) (if (= n 0) nil (ev? (- n 1))))",
+            "(defmacro unless (c x y) `(if ,c ,y ,x))",
+            "(defun walk-down (n) (let ((k (- n 1))) (unless (< k 0) (walk-down k) 'done)))",
+            "(defun dive (n) (and t (or nil (if (= n 0) 'bottom (dive (- n 1))))))",
+        ]
+        # The tree walker is slower, so it does not get as many iterations.
+        for compiled, count in ((False, 100000), (True, 1000000)):
+            with self.subTest(compiled=compiled):
+                interp = lisp.LispInterpreter(compiled=compiled)
+                for src in defs:
+                    interp.eval_expr(parser.parse_string(src))
+                cases: list[tuple[str, Any]] = [
+                    (f"(count-down {count} 0)", count),
+                    ("(ev? 100001)", []),
+                    ("(walk-down 100000)", "done"),
+                    ("(dive 100000)", "bottom"),
+                ]
+                for src, expected in cases:
+                    res = interp.eval_expr(parser.parse_string(src))
+                    self.assertEqual(to_py(res), expected)
+
+    def test_07_load(self) -> None:
+        """Test loading a file whose forms depend on the ones before them"""
+        src: Final[str] = """
+(defmacro twice (x)
+  `(* 2 ,x))
+(defun quadruple (n)
+  (twice
+   (twice n)))
+(setq answer (quadruple 10))
+"""
+        with tempfile.TemporaryDirectory() as folder:
+            path: Final[str] = os.path.join(folder, "test.lisp")
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(src)
+            for compiled in (False, True):
+                with self.subTest(compiled=compiled):
+                    interp = lisp.LispInterpreter(compiled=compiled)
+                    res = interp.eval_expr(parser.parse_string(f'(load "{path}")'))
+                    self.assertEqual(res, 40)
+                    self.assertEqual(interp.eval_expr(parser.parse_string("answer")), 40)
+
+    def test_08_tracer(self) -> None:
+        """Test the events a tracer receives, and that (dbg t) still works"""
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                interp = lisp.LispInterpreter(compiled=compiled)
+                interp.eval_expr(parser.parse_string("(defmacro twice (x) `(* 2 ,x))"))
+                interp.eval_expr(parser.parse_string("(setq n 3)"))
+                recorder = Recorder()
+                interp.tracer = recorder
+                res = interp.eval_expr(parser.parse_string("(if t (twice n) 0)"))
+                interp.tracer = None
+                self.assertEqual(res, 6)
+                self.assertEqual(recorder.events[0], ("enter", ["if", "t", ["twice", "n"], 0]))
+                self.assertEqual(recorder.events[-1],
+                                 ("exit", ["if", "t", ["twice", "n"], 0], 6))
+                self.assertIn(("expand", ["twice", "n"], ["*", 2, "n"]), recorder.events)
+                self.assertIn(("lookup", "n", 3), recorder.events)
+                enters = sum(1 for ev in recorder.events if ev[0] == "enter")
+                exits = sum(1 for ev in recorder.events if ev[0] == "exit")
+                self.assertEqual(enters, exits)
+
+                stderr = io.StringIO()
+                with contextlib.redirect_stderr(stderr):
+                    self.assertEqual(interp.eval_expr(parser.parse_string("(dbg t)")),
+                                     data.Atom("t"))
+                    self.assertIsInstance(interp.tracer, DebugTracer)
+                    self.assertEqual(interp.eval_expr(parser.parse_string("(twice n)")), 6)
+                    self.assertEqual(interp.eval_expr(parser.parse_string("(dbg nil)")),
+                                     data.Atom("nil"))
+                self.assertIsNone(interp.tracer)
+                self.assertIn("twice", stderr.getvalue())
+
+    def test_09_call_cache(self) -> None:
+        """Test that call sites cache the global functions they call, until those are redefined or shadowed"""
+        interp = lisp.LispInterpreter()
+        interp.eval_expr(parser.parse_string("(defun step (x) (+ x 1))"))
+        loop = parser.parse_string("(do ((i 0 (+ i 1)) (n 0 (step n))) ((= i 10) n))")
+        self.assertEqual(interp.eval_expr(loop), 10)
+        stats = interp.call_cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["sites"]), (9, 1, 1))
+
+        cases: Final[list[tuple[str, Any]]] = [
+            # defun, defmacro and setq replace what the call site found.
+            ("(defun step (x) (+ x 2))", 20),
+            ("(defmacro step (x) (list '+ x 3))", 30),
+            ("(setq step (lambda (x) (+ x 4)))", 40),
+            ("(setq unrelated 1)", 40),
+            # A local variable of the same name is seen, and so is a
+            # global one again once it is gone.
+            ("(let ((step (lambda (x) (+ x 5)))) (setq local (eval loop-form)))", 40),
+            ("(defun run (step) (eval loop-form))", 40),
+            ("(defun sneaky () (setq step (lambda (x) (+ x 7))))", 40),
+        ]
+        interp.env["loop-form"] = loop
+        interp.env["local"] = 0
+        for src, expected in cases:
+            with self.subTest(src=src):
+                interp.eval_expr(parser.parse_string(src))
+                self.assertEqual(interp.eval_expr(loop), expected)
+        self.assertEqual(interp.eval_expr(parser.parse_string("local")), 50)
+        self.assertEqual(interp.eval_expr(parser.parse_string("(run (lambda (x) (+ x 6)))")), 60)
+        self.assertEqual(interp.eval_expr(loop), 40)
+        # A function that sets the global variable replaces it, too.
+        interp.eval_expr(parser.parse_string("(sneaky)"))
+        self.assertEqual(interp.eval_expr(loop), 70)
+        self.assertIn("step", interp.call_cache.shadowed)
+        self.assertIsNone(lisp.LispInterpreter(compiled=True).call_cache)
+
+        # A local variable made by setq is seen anew on every call.
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                interp = lisp.LispInterpreter(compiled=compiled)
+                interp.eval_expr(parser.parse_string("(defun k (x) (setq q (lambda () x)) (q))"))
+                self.assertEqual(list(interp.eval_expr(parser.parse_string("(list (k 1) (k 2))"))), [1, 2])
+
+        # Call sites evaluated once do not pile up in the cache.
+        interp = lisp.LispInterpreter()
+        interp.call_cache = lisp.CallCache(16)
+        interp.eval_expr(parser.parse_string("(defun double (x) (* 2 x))"))
+        for idx in range(100):
+            self.assertEqual(interp.eval_expr(parser.parse_string(f"(double {idx})")), 2 * idx)
+        self.assertEqual(interp.call_cache.stats()["sites"], 16)
+
+        # Compiled code sets global variables through the global
+        # Environment, too, so rebinding a Function is noticed.
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                interp = lisp.LispInterpreter(compiled=compiled)
+                genv = interp.env.get_global()
+                interp.eval_expr(parser.parse_string("(defun f () 1)"))
+                interp.eval_expr(parser.parse_string("(setq n 1)"))
+                version = genv.version
+                interp.eval_expr(parser.parse_string("(setq n 2)"))
+                self.assertEqual(genv.version, version)
+                interp.eval_expr(parser.parse_string("(setq f 2)"))
+                self.assertEqual(genv.version, version + 1)
+
+    def test_10_procedures(self) -> None:
+        """Test that the code for lambda lists called without being evaluated does not pile up"""
+        interp = lisp.LispInterpreter()
+        for idx in range(lisp.PROCEDURE_CACHE_SIZE + 100):
+            self.assertEqual(interp.eval_expr(parser.parse_string(f"((quote (lambda (x) (* x {idx}))) 2)")), 2 * idx)
+        self.assertEqual(len(interp.procedures), lisp.PROCEDURE_CACHE_SIZE)
+
+        # Nor do the Lambdas compiled code makes for them.
+        interp = lisp.LispInterpreter(compiled=True)
+        for idx in range(compiler.LAMBDA_CACHE_SIZE + 100):
+            self.assertEqual(interp.eval_expr(parser.parse_string(f"((quote (lambda (x) (* x {idx}))) 2)")), 2 * idx)
+        self.assertEqual(len(interp.compiler.lambdas), compiler.LAMBDA_CACHE_SIZE)
+
+    def register(self, interp: lisp.LispInterpreter) -> None:
+        """Register a builtin and a special form with interp and try them out."""
+        interp.register_builtin("twice", lambda x: 2 * x)
+        interp.register_form("first-form", lambda i, lst, env: lst[1])
+
+        self.assertEqual(interp.eval_expr(parser.parse_string("(twice 21)")), 42)
+        self.assertEqual(interp.eval_expr(parser.parse_string("(first-form foo bar)")),
+                         data.Atom("foo"))
+        self.assertNotIn("twice", lisp.LispInterpreter().forms)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 23:45:00 krylon>
+#
+# /data/code/python/krylisp/test_memo.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.test_memo
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import functools
+import unittest
+from typing import Any
+
+from krylisp import data, error, lisp, memo, parser
+
+
+class TestMemo(unittest.TestCase):
+    """Test memoized functions"""
+
+    def test_01_key(self) -> None:
+        """Test the keys arguments are cached under"""
+        same = [
+            (data.ConsCell.fromList([1, data.Atom("a")]), data.ConsCell.fromList([1, data.Atom("a")])),
+            (data.Atom("nil"), data.EMPTY_LIST),
+            (data.Atom("foo"), data.Atom("FOO")),
+        ]
+        different = [
+            (1, 1.0),
+            ("foo", data.Atom("foo")),
+            (data.ConsCell(1, 2), data.ConsCell.fromList([1, 2])),
+            (data.ConsCell.fromList([1, 2]), data.ConsCell.fromList([1, 2, 3])),
+        ]
+        for a, b in same:
+            with self.subTest(a=a, b=b):
+                self.assertEqual(memo.key(a), memo.key(b))
+                self.assertEqual(hash(memo.key(a)), hash(memo.key(b)))
+        for a, b in different:
+            with self.subTest(a=a, b=b):
+                self.assertNotEqual(memo.key(a), memo.key(b))
+
+    def test_02_memoize(self) -> None:
+        """Test caching, eviction and invalidation, with both engines"""
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                interp = lisp.LispInterpreter(compiled=compiled)
+                ev = functools.partial(evaluate, interp)
+                ev("(defun-memo fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))")
+                self.assertEqual(ev("(fib 90)"), 2880067194370816120)
+                stats = interp.memo_stats("fib")
+                self.assertEqual((stats["misses"], stats["hits"]), (91, 88))
+                self.assertEqual(ev("(fib 90)"), 2880067194370816120)
+                self.assertEqual(interp.memo_stats("fib")["hits"], 89)
+
+                ev("(defun size (l) (if (null l) 0 (+ 1 (size (cdr l)))))")
+                ev("(memoize 'size :max-size 2)")
+                self.assertEqual(ev("(size '(a b c))"), 3)
+                self.assertEqual(ev("(size (list 'a 'b 'c))"), 3)
+                self.assertEqual(to_plist(ev("(memo-stats 'size)")),
+                                 {"hits": 1, "misses": 4, "evictions": 2, "size": 2, "max-size": 2})
+
+                ev("(defun scale () 2)")
+                ev("(defun-memo scaled (n) (* n (scale)))")
+                self.assertEqual(ev("(scaled 21)"), 42)
+                ev("(defun scale () 3)")
+                self.assertEqual(interp.memo_stats("scaled")["size"], 0)
+                self.assertEqual(ev("(scaled 21)"), 63)
+
+                ev("(defun scaled (n) n)")
+                self.assertEqual(ev("(scaled 21)"), 21)
+                with self.assertRaises(error.LispError):
+                    interp.memo_stats("scaled")
+                with self.assertRaises(error.LispError):
+                    ev("(memoize 'car)")
+
+    def test_03_context(self) -> None:
+        """Test that contexts memoize Functions of their own, and keep their memos apart"""
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                interp = lisp.LispInterpreter(compiled=compiled, threadsafe=True)
+                evaluate(interp, "(defun sq (x) (* x x))")
+                first, second = interp.context(), interp.context()
+                ev = functools.partial(evaluate_in, interp, first)
+                ev("(defun-memo fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))")
+                self.assertEqual(ev("(fib 30)"), 832040)
+                self.assertEqual(to_plist(ev("(memo-stats 'fib)"))["misses"], 31)
+                ev("(memoize 'sq)")
+                self.assertEqual(ev("(sq 12)"), 144)
+                self.assertEqual(interp.memo_stats("sq", first)["misses"], 1)
+                # Neither the global Environment nor another context see them.
+                with self.assertRaises(error.LispError):
+                    interp.memo_stats("sq")
+                with self.assertRaises(error.LispError):
+                    evaluate_in(interp, second, "(fib 10)")
+                # Defining a Function in another context keeps the memos.
+                evaluate_in(interp, second, "(defun other () 1)")
+                self.assertEqual(interp.memo_stats("fib", first)["size"], 31)
+                ev("(defun other () 1)")
+                self.assertEqual(interp.memo_stats("fib", first)["size"], 0)
+
+
+def evaluate(interp: lisp.LispInterpreter, src: str) -> Any:
+    """Evaluate the source code src in interp."""
+    return interp.eval_expr(parser.parse_string(src))
+
+
+def evaluate_in(interp: lisp.LispInterpreter, env: data.Environment, src: str) -> Any:
+    """Evaluate the source code src in interp, in the global Environment env."""
+    return interp.eval_expr(parser.parse_string(src), env)
+
+
+def to_plist(lst: data.ConsCell) -> dict:
+    """Convert a property list of keywords and numbers to a dict."""
+    items = list(lst)
+    return {k.value[1:]: v for k, v in zip(items[::2], items[1::2])}
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
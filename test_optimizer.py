@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 22:40:00 krylon>
+#
+# /data/code/python/krylisp/test_optimizer.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.test_optimizer
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import unittest
+from typing import Any
+
+from krylisp import lisp, parser, printer
+
+PRELUDE = """
+(defun square (x) (* x x))
+(defmacro literally (x) (list 'quote x))
+(setq seconds 0)
+"""
+
+
+class TestOptimizer(unittest.TestCase):
+    """Test the constant folding pass"""
+
+    def test_01_folding(self) -> None:
+        """Test what is folded, and what is left alone"""
+        cases = [
+            ("(* 60 60 24)", "86400"),
+            ("(+ 1 (* 2 3) (- 10 4))", "13"),
+            ("(quote 5)", "5"),
+            ('(quote "five")', '"five"'),
+            ("(if t a b)", "a"),
+            ("(if (< 2 1) (print 1) (+ 1 1))", "2"),
+            ("(if (quote (1)) 1 2)", "1"),
+            ("(list (= 1 1) (eq 1 2) (null nil))", "(list t (quote nil) t)"),
+            ("(square (+ 1 2))", "(square 3)"),
+            ("(defun f (x) (if nil x (* x (* 2 2))))", "(defun f (x) (* x 4))"),
+            ("(let ((a (+ 1 1))) (do ((i 0 (+ i 1))) ((= i (* 2 5)) a) (setq seconds (* 60 60))))",
+             "(let ((a 2)) (do ((i 0 (+ i 1))) ((= i 10) a) (setq seconds 3600)))"),
+            # Errors are left for run time.
+            ("(/ 1 0)", "(/ 1 0)"),
+            ("(** 10 100000)", "(** 10 100000)"),
+            # Builtins that allocate or print, macros, data and unknown functions.
+            ("(list 1 2)", "(list 1 2)"),
+            ("(print (+ 1 2))", "(print 3)"),
+            ("(literally (+ 1 2))", "(literally (+ 1 2))"),
+            ("(quote (+ 1 2))", "(quote (+ 1 2))"),
+            ("(backquote (a (+ 1 2)))", "(backquote (a (+ 1 2)))"),
+            ("(undefined (+ 1 2))", "(undefined (+ 1 2))"),
+            ("(if t 1)", "(if t 1)"),
+        ]
+        interp = lisp.LispInterpreter(optimize=True)
+        evaluate(interp, PRELUDE)
+        for src, expected in cases:
+            with self.subTest(src=src):
+                form = parser.parse_string(src)
+                copy = printer.source(form)
+                self.assertEqual(printer.source(interp.optimize(form)), expected)
+                # The original form is not changed.
+                self.assertEqual(printer.source(form), copy)
+        form = parser.parse_string("(square x)")
+        self.assertIs(interp.optimize(form), form)
+
+    def test_02_same_values(self) -> None:
+        """Test that optimized code has the same values as the original, with both engines"""
+        programs = [
+            "(* 60 60 24)",
+            "(list (+ 1 2.5) (/ 7 2) (mod 7 3) (** 2 10) (sqrt 16) (- 5))",
+            "(list (< 1 2 3) (> 1 2) (= 2 2.0) (eq 1 1) (eq 'a 'b) (not nil) (not 1) (null ()))",
+            "(if (> (* 2 2) 3) 'yes 'no)",
+            "(list (quote 5) 'a \"s\" :key t nil ())",
+            "(square (+ 1 2))",
+            "(let ((n (* 10 10))) (do ((i 0 (+ i 1)) (s 0 (+ s (* 2 3)))) ((= i (- n 90)) s)))",
+            "(defun g (x) (if (= 1 1) (+ x (* 3 3)) x))",
+            "(g (square 4))",
+            "(literally (+ 1 2))",
+            "(/ 1 0)",
+        ]
+        for compiled in (False, True):
+            plain = lisp.LispInterpreter(compiled=compiled)
+            optimized = lisp.LispInterpreter(compiled=compiled, optimize=True)
+            evaluate(plain, PRELUDE)
+            evaluate(optimized, PRELUDE)
+            for src in programs:
+                with self.subTest(compiled=compiled, src=src):
+                    self.assertEqual(outcome(plain, src), outcome(optimized, src))
+            self.assertGreater(optimized.optimizer.folded, 10)
+
+    def test_03_rebound(self) -> None:
+        """Test that builtins that have been replaced are not folded, and that the optimizer can be turned off"""
+        interp = lisp.LispInterpreter(optimize=True)
+        interp.register_builtin('+', lambda *args: "replaced")
+        interp.register_form('*', lambda interp, lst, env: "special")
+        self.assertEqual(printer.source(interp.optimize(parser.parse_string("(- (+ 1 2) (* 2 3))"))),
+                         "(- (+ 1 2) (* 2 3))")
+        self.assertEqual(list(evaluate(interp, "(list (+ 1 2) (* 2 3))")), ["replaced", "special"])
+        self.assertEqual(interp.optimize(parser.parse_string("(- 3 1)")), 2)
+        interp.optimizer = None
+        self.assertEqual(printer.source(interp.optimize(parser.parse_string("(- 3 1)"))), "(- 3 1)")
+
+
+def evaluate(interp: lisp.LispInterpreter, src: str) -> Any:
+    """Optimize and evaluate the source code src in interp, and return the value of the last form."""
+    value: Any = None
+    for form in parser.read(src):
+        value = interp.eval_expr(interp.optimize(form))
+    return value
+
+
+def outcome(interp: lisp.LispInterpreter, src: str) -> str:
+    """Return the value of src in interp as Lisp source, or the class of the error it raised."""
+    try:
+        return printer.source(evaluate(interp, src))
+    except Exception as err:  # pylint: disable-msg=W0703
+        return err.__class__.__name__
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
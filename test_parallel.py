@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-18 02:10:00 krylon>
+#
+# /data/code/python/krylisp/test_parallel.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.test_parallel
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import functools
+import unittest
+from typing import Any, Optional
+
+from krylisp import data, error, lisp, parallel, parser
+
+
+class TestParallel(unittest.TestCase):
+    """Test pmap and preduce"""
+
+    def test_01_pmap(self) -> None:
+        """Test mapping functions over lists in worker processes, with both engines"""
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                interp = lisp.LispInterpreter(compiled=compiled)
+                interp.pool = parallel.Pool(interp, 2)
+                ev = functools.partial(evaluate, interp)
+                try:
+                    ev("(defun fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))")
+                    ev("(setq numbers '(10 3 15 0 7 1 12 5 9 2 11))")
+                    self.assertEqual(list(ev("(pmap fib numbers)")), [55, 2, 610, 0, 13, 1, 144, 5, 34, 1, 89])
+                    self.assertEqual(list(ev("(pmap fib numbers :chunk-size 1)")),
+                                     list(ev("(pmap fib numbers :chunk-size 100)")))
+                    self.assertEqual(str(ev("(let ((k 3)) (pmap (lambda (x) (list 'x (* k x))) '(1 2)))")),
+                                     str(ev("'((x 3) (x 6))")))
+                    self.assertEqual(list(ev("(pmap car '((a b) (c d)))")), [data.Atom("a"), data.Atom("c")])
+                    self.assertTrue(data.nullp(ev("(pmap fib nil)")))
+
+                    # Workers are sent the global variables that have changed,
+                    # rather than being started again.
+                    executor = interp.pool.executor
+                    ev("(defun fib (n) (* n 2))")
+                    self.assertEqual(list(ev("(pmap fib '(1 2 3))")), [2, 4, 6])
+                    ev("(setq k 0)")
+                    for step in range(1, 6):
+                        ev("(setq k (+ k (preduce + (pmap (lambda (x) (+ x k)) '(1 2 3)))))")
+                        self.assertEqual(ev("k"), [0, 6, 30, 126, 510, 2046][step])
+                    self.assertEqual(list(ev("(pmap fib '(4))")), [8])
+                    self.assertIs(interp.pool.executor, executor)
+                    self.assertEqual(interp.pool.starts, 1)
+
+                    # Unless there are too many of them.
+                    for idx in range(parallel.MAX_CHANGES + 1):
+                        ev(f"(setq var{idx} {idx})")
+                    self.assertEqual(list(ev(f"(pmap (lambda (x) (+ x var{parallel.MAX_CHANGES})) '(1))")),
+                                     [parallel.MAX_CHANGES + 1])
+                    self.assertIsNot(interp.pool.executor, executor)
+                    self.assertEqual(interp.pool.starts, 2)
+
+                    with self.assertRaises(error.LispError):
+                        ev("(pmap (lambda (x) (car x)) '(1 2))")
+                    with self.assertRaises(error.LispError):
+                        ev("(pmap fib '(1 2) :chunk-size 0)")
+                finally:
+                    interp.close_pool()
+
+    def test_02_preduce(self) -> None:
+        """Test combining lists in worker processes"""
+        interp = lisp.LispInterpreter()
+        interp.pool = parallel.Pool(interp, 2)
+        ev = functools.partial(evaluate, interp)
+        try:
+            ev("(setq numbers '(1 2 3 4 5 6 7 8 9 10))")
+            self.assertEqual(ev("(preduce + numbers)"), 55)
+            self.assertEqual(ev("(preduce + numbers 100 :chunk-size 3)"), 155)
+            self.assertEqual(ev("(preduce (lambda (a b) (if (> a b) a b)) numbers)"), 10)
+            self.assertEqual(ev("(preduce + nil 7)"), 7)
+            self.assertIsNone(ev("(preduce + nil)"))
+            self.assertEqual(interp.preduce("*", range(1, 8)), 5040)
+        finally:
+            interp.close_pool()
+
+    def test_03_context(self) -> None:
+        """Test that workers see the variables of the context pmap is called in"""
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                interp = lisp.LispInterpreter(compiled=compiled, threadsafe=True)
+                interp.pool = parallel.Pool(interp, 2)
+                try:
+                    evaluate(interp, "(defun scale (x) (* x 2))")
+                    first, second = interp.context(), interp.context()
+                    ev = functools.partial(evaluate, interp, env=first)
+                    ev("(defun shift (x) (+ (scale x) k))")
+                    ev("(setq k 1)")
+                    self.assertEqual(list(ev("(pmap shift '(1 2 3))")), [3, 5, 7])
+                    self.assertEqual(ev("(preduce (lambda (a b) (+ a b k)) '(1 2 3) :chunk-size 1)"), 8)
+                    # Setting a variable in the context is sent along.
+                    ev("(setq k 10)")
+                    self.assertEqual(list(ev("(pmap shift '(1 2 3))")), [12, 14, 16])
+                    self.assertEqual(interp.pool.starts, 1)
+                    # Functions that come back are bound to the context.
+                    self.assertEqual(evaluate(interp, "((car (pmap (lambda (x) shift) '(1))) 1)", first), 12)
+
+                    # Another context does not see them, and gets workers of its own.
+                    with self.assertRaises(error.LispError):
+                        evaluate(interp, "(pmap shift '(1))", second)
+                    self.assertEqual(list(evaluate(interp, "(pmap scale '(1 2))", second)), [2, 4])
+                    self.assertEqual(interp.pool.starts, 2)
+                    self.assertIsNone(first.changed)
+                finally:
+                    interp.close_pool()
+
+
+def evaluate(interp: lisp.LispInterpreter, src: str, env: Optional[data.Environment] = None) -> Any:
+    """Evaluate the source code src in interp, in the global Environment env, if it is given."""
+    return interp.eval_expr(parser.parse_string(src), env)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
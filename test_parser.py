@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-# Time-stamp: <2024-05-19 21:15:14 krylon>
+# Time-stamp: <2026-10-18 00:20:00 krylon>
 #
 # /data/code/python/krylisp/test_parser.py
 # created on 19. 05. 2024
@@ -17,11 +17,13 @@ krylisp.test_parser
 (c) 2024 Benjamin Walkenhorst
 """
 
+import io
 import traceback
 import unittest
 from typing import Final, Optional, Union
 
-from krylisp import data, parser
+from krylisp import data, lisp, parser, printer
+from krylisp.containers import Vector
 
 
 class TestParser(unittest.TestCase):
@@ -51,6 +53,117 @@ class TestParser(unittest.TestCase):
                     else:
                         self.assertEqual(res, c[1])
 
+    def test_02_lists(self) -> None:
+        """Test parsing lists and quoted forms"""
+        test_cases: Final[list[tuple[str, str]]] = [
+            ("(a 1 2.5 \"x\")", "(#<Atom a > 1 2.5 x)"),
+            ("()", "()"),
+            ("(a (b (c)))", "(#<Atom a > (#<Atom b > (#<Atom c >)))"),
+            ("'x", "(#<Atom quote > #<Atom x >)"),
+            ("'(1 2)", "(#<Atom quote > (1 2))"),
+            ("`(a ,b ,@c)",
+             "(#<Atom backquote > (#<Atom a > (#<Atom comma > #<Atom b >) "
+             "(#<Atom comma-at > #<Atom c >)))"),
+            ("(a ; comment\n b)", "(#<Atom a > #<Atom b >)"),
+            ("(x) (y)", "((#<Atom x >) (#<Atom y >))"),
+        ]
+
+        for src, expected in test_cases:
+            with self.subTest(src=src):
+                self.assertEqual(repr(parser.parse_string(src)), expected)
+
+    def test_03_strings(self) -> None:
+        """Test parsing strings"""
+        res = parser.parse_string('("a b" "say \\"hi\\"" "back\\\\slash")')
+        self.assertEqual(list(res), ["a b", 'say "hi"', "back\\slash"])
+
+    def test_04_errors(self) -> None:
+        """Test that syntax errors report where they are"""
+        test_cases: Final[list[tuple[str, type, int, int]]] = [
+            ("(a\n  (b", parser.IncompleteException, 2, 3),
+            ("(a))", parser.SyntaxException, 1, 4),
+            ("(a\n 'b '", parser.IncompleteException, 2, 5),
+            ('(a "bc', parser.IncompleteException, 1, 4),
+        ]
+
+        for src, cls, line, column in test_cases:
+            with self.subTest(src=src):
+                with self.assertRaises(cls) as ctx:
+                    parser.parse_string(src)
+                self.assertEqual((ctx.exception.line, ctx.exception.column), (line, column))
+
+    def test_05_deep(self) -> None:
+        """Test that deeply nested lists do not exhaust the stack"""
+        depth: Final[int] = 10000
+        res = parser.parse_string("(" * depth + ")" * depth)
+        for _ in range(depth - 1):
+            res = res.head
+        self.assertEqual(repr(res), "()")
+
+    def test_06_stream(self) -> None:
+        """Test feeding the reader one line at a time"""
+        src: Final[str] = '(a\n "multi\nline\nstring" (b\n c))\n; comment\n(d "e")\n'
+        expected: Final[list[str]] = [repr(x) for x in parser.read(src)]
+        reader = parser.Reader()
+        res = []
+        for line in src.splitlines(keepends=True):
+            res.extend(repr(x) for x in reader.feed(line))
+        reader.close()
+        self.assertEqual(res, expected)
+        self.assertEqual(len(res), 2)
+
+        reader = parser.Reader()
+        for line in "(a\n  (b \"c\n".splitlines(keepends=True):
+            self.assertEqual(list(reader.feed(line)), [])
+        with self.assertRaises(parser.IncompleteException) as ctx:
+            reader.close()
+        self.assertEqual((ctx.exception.line, ctx.exception.column), (2, 6))
+
+    def test_07_file(self) -> None:
+        """Test reading forms from a file in small pieces"""
+        src: Final[str] = "".join(f"(f{i} {i} \"s{i}\")\n" for i in range(100))
+        forms = list(parser.read_file(io.StringIO(src), 64))
+        self.assertEqual(len(forms), 100)
+        self.assertEqual(repr(forms[99]), "(#<Atom f99 > 99 s99)")
+
+    def test_08_vectors(self) -> None:
+        """Test reading vector literals"""
+        test_cases: Final[list[tuple[str, str]]] = [
+            ("#()", "#()"),
+            ("#(1 a \"s\")", '#(1 a "s")'),
+            ("#(1 (2 #(3)) 'x)", "#(1 (2 #(3)) (quote x))"),
+            ("(f #(1) #(2))", "(f #(1) #(2))"),
+            ("(#:g1 #(a))", "(#:g1 #(a))"),
+        ]
+        for src, expected in test_cases:
+            with self.subTest(src=src):
+                self.assertEqual(printer.source(parser.parse_string(src)), expected)
+        self.assertIsInstance(parser.parse_string("#(1)"), Vector)
+        with self.assertRaises(parser.IncompleteException) as ctx:
+            parser.parse_string("(a #(b")
+        self.assertIn("#(", str(ctx.exception))
+
+    def test_09_printer(self) -> None:
+        """Test that printed values are read back as they were"""
+        interp: Final[lisp.LispInterpreter] = lisp.LispInterpreter()
+        test_cases: Final[list[tuple[str, str]]] = [
+            ("(cdr '(1))", "nil"),
+            ("(list 1 nil '(2 ()))", "(1 nil (2 nil))"),
+            ('(car \'("a\\"b"))', '"a\\"b"'),
+            ('(car \'("back\\\\slash"))', '"back\\\\slash"'),
+            ('(list "two\\nlines" "tab\there")', '("two\\nlines" "tab\there")'),
+            ("#(1 \"x\" a)", '#(1 "x" a)'),
+        ]
+        for src, expected in test_cases:
+            with self.subTest(src=src):
+                value = interp.eval_expr(parser.parse_string(src))
+                text = printer.source(value)
+                self.assertEqual(text, expected)
+                self.assertEqual(printer.source(next(parser.read(text))), text)
+        for value in ('a"b', "back\\slash", "two\nlines", ""):
+            with self.subTest(value=value):
+                self.assertEqual(next(parser.read(printer.source(value))), value)
+
 
 # Local Variables: #
 # python-indent: 4 #
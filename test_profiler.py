@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 13:25:00 krylon>
+#
+# /data/code/python/krylisp/test_profiler.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.test_profiler
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import contextlib
+import io
+import os
+import pstats
+import tempfile
+import unittest
+from typing import Final
+
+from krylisp import lisp, parser
+
+SETUP: Final[tuple[str, ...]] = (
+    "(defun fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))",
+    "(defmacro twice (x) `(* 2 ,x))",
+    "(defun outer (n) (twice (fib n)))",
+)
+
+
+def interpreter(compiled: bool) -> lisp.LispInterpreter:
+    """Return an interpreter with the functions from SETUP defined."""
+    interp = lisp.LispInterpreter(compiled=compiled)
+    for src in SETUP:
+        interp.eval_expr(parser.parse_string(src))
+    return interp
+
+
+class TestProfiler(unittest.TestCase):
+    """Test the deterministic profiler"""
+
+    def test_01_counts(self) -> None:
+        """Test the call counts and times of a profile"""
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                interp = interpreter(compiled)
+                res, prof = interp.profile(parser.parse_string("(outer 10)"))
+                self.assertEqual(res, 110)
+                self.assertIsNone(interp.tracer)
+                calls = {name: entry.calls for (_, name), entry in prof.entries.items()}
+                self.assertEqual(calls, {"outer": 1, "twice": 1, "fib": 177})
+                fib = prof.entries[("defun", "fib")]
+                outer = prof.entries[("defun", "outer")]
+                self.assertEqual(fib.primitive, 1)
+                self.assertLessEqual(fib.total_ns, outer.total_ns)
+                self.assertLessEqual(fib.self_ns, fib.total_ns)
+                self.assertGreater(fib.self_ns, 0)
+                self.assertEqual(prof.table(sort="calls").splitlines()[1].split()[-1], "fib")
+
+    def test_02_export(self) -> None:
+        """Test the collapsed stacks and the pstats dump"""
+        interp = interpreter(False)
+        _, prof = interp.profile(parser.parse_string("(outer 3)"))
+        stacks = [line.rsplit(" ", 1)[0] for line in prof.collapsed().splitlines()]
+        self.assertEqual(stacks[:4], ["outer", "outer;twice[macro]", "outer;twice[macro];fib",
+                                      "outer;twice[macro];fib;fib"])
+        with tempfile.TemporaryDirectory() as folder:
+            path: Final[str] = os.path.join(folder, "lisp.prof")
+            prof.dump_stats(path)
+            stats = pstats.Stats(path)
+            self.assertEqual(stats.stats[("<defun>", 0, "fib")][1], 5)
+            self.assertIn(("<macro>", 0, "twice"), stats.stats[("<defun>", 0, "fib")][4])
+
+    def test_03_form(self) -> None:
+        """Test the profile special form"""
+        with tempfile.TemporaryDirectory() as folder:
+            path: Final[str] = os.path.join(folder, "stacks.txt")
+            for compiled in (False, True):
+                with self.subTest(compiled=compiled):
+                    interp = interpreter(compiled)
+                    out = io.StringIO()
+                    with contextlib.redirect_stdout(out):
+                        res = interp.eval_expr(parser.parse_string(
+                            f'(profile (outer 5) :sort :self :collapsed "{path}")'))
+                    self.assertEqual(res, 10)
+                    self.assertIn("twice[macro]", out.getvalue())
+                    with open(path, encoding="utf-8") as fh:
+                        self.assertTrue(fh.readline().startswith("outer "))
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-18 01:10:00 krylon>
+#
+# /data/code/python/krylisp/test_run.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.test_run
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from typing import Iterator
+from unittest import mock
+
+from krylisp import run
+
+PRELUDE = "(defun square (x) (* x x))\n"
+JOBS = {
+    "one.lisp": "(setq n 3)\n(print (square n))\n(list n (square n))\n",
+    "two.lisp": "(square n)\n",
+    "three.lisp": "(defun cube (x)\n  (* x (square x)))\n(cube 4)\n",
+}
+
+
+class TestRun(unittest.TestCase):
+    """Test the batch evaluation command"""
+
+    def test_01_run(self) -> None:
+        """Test evaluating files and lines of input in worker processes"""
+        with tempfile.TemporaryDirectory() as folder:
+            prelude = os.path.join(folder, "prelude.lisp")
+            with open(prelude, "w", encoding="utf-8") as fh:
+                fh.write(PRELUDE)
+            files = []
+            for name, src in JOBS.items():
+                files.append(os.path.join(folder, name))
+                with open(files[-1], "w", encoding="utf-8") as fh:
+                    fh.write(src)
+            output = os.path.join(folder, "results.jsonl")
+            for engine in ("walk", "compiled"):
+                with self.subTest(engine=engine):
+                    with mock.patch("sys.stdin", io.StringIO("(square 12)\n\n(cube 2)\n")):
+                        status = run.main(["--prelude", prelude, "--workers", "2", "--chunk-size", "1",
+                                           "--engine", engine, "--no-cache", "--output", output] + files + ["-"])
+                    with open(output, "r", encoding="utf-8") as fh:
+                        results = [json.loads(line) for line in fh]
+                    self.assertEqual(status, 1)
+                    self.assertEqual([res.get("job") for res in results], [0, 1, 2, 3, 4, None])
+                    self.assertEqual((results[0]["value"], results[0]["output"]), ("(3 9)", "9\n"))
+                    # Jobs do not see what other jobs defined.
+                    self.assertIn("error", results[1])
+                    self.assertEqual(results[2]["value"], "64")
+                    self.assertEqual((results[3]["expr"], results[3]["value"]), ("(square 12)", "144"))
+                    self.assertIn("error", results[4])
+                    summary = results[5]["summary"]
+                    self.assertEqual((summary["jobs"], summary["errors"], summary["workers"]), (5, 2, 2))
+
+    def test_02_quit(self) -> None:
+        """Test that a job that quits fails on its own, and the others still run"""
+        with tempfile.TemporaryDirectory() as folder:
+            output = os.path.join(folder, "results.jsonl")
+            for engine in ("walk", "compiled"):
+                with self.subTest(engine=engine):
+                    with mock.patch("sys.stdin", io.StringIO("(+ 1 2)\n(quit)\n(* 2 3)\n")):
+                        status = run.main(["--workers", "1", "--engine", engine, "--output", output, "-"])
+                    with open(output, "r", encoding="utf-8") as fh:
+                        results = [json.loads(line) for line in fh]
+                    self.assertEqual(status, 1)
+                    self.assertEqual([res.get("value") for res in results[:3]], ["3", None, "6"])
+                    self.assertEqual(results[1]["error"], "SystemExit: 0")
+                    self.assertEqual(results[3]["summary"]["errors"], 1)
+
+    def test_03_streaming(self) -> None:
+        """Test that results are written while more lines are still to be read"""
+        with tempfile.TemporaryDirectory() as folder:
+            output = os.path.join(folder, "results.jsonl")
+
+            def lines() -> Iterator[str]:
+                for idx in range(3):
+                    yield f"(* {idx} 2)\n"
+                    # Wait for the result before the next line comes in.
+                    deadline = time.monotonic() + 10
+                    while written() <= idx and time.monotonic() < deadline:
+                        time.sleep(0.01)
+                    self.assertEqual(written(), idx + 1)
+
+            def written() -> int:
+                with open(output, "r", encoding="utf-8") as fh:
+                    return len(fh.readlines())
+
+            with mock.patch("sys.stdin", lines()):
+                status = run.main(["--workers", "2", "--output", output, "-"])
+            with open(output, "r", encoding="utf-8") as fh:
+                results = [json.loads(line) for line in fh]
+            self.assertEqual(status, 0)
+            self.assertEqual([res.get("value") for res in results[:3]], ["0", "2", "4"])
+            self.assertEqual(results[3]["summary"]["jobs"], 3)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
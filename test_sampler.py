@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 13:40:00 krylon>
+#
+# /data/code/python/krylisp/test_sampler.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.test_sampler
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import os
+import tempfile
+import unittest
+from typing import Final
+
+from krylisp import data, error, lisp, parser
+from krylisp.sampler import label
+
+SETUP: Final[tuple[str, ...]] = (
+    "(defun inner (n) (snap))",
+    "(defun outer (n) (+ 1 (inner n)))",
+    "(defun tail (n) (inner n))",
+    "(defmacro twice (x) `(* 2 ,x))",
+    "(defun fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))",
+    "(defun spin (n) (if (= n 0) 'done (spin (- n 1))))",
+)
+
+
+class TestSampler(unittest.TestCase):
+    """Test the call stack and the sampling profiler"""
+
+    def interpreter(self, compiled: bool) -> tuple[lisp.LispInterpreter, list]:
+        """Return an interpreter with SETUP defined, and the list snap appends the call stack to."""
+        interp = lisp.LispInterpreter(compiled=compiled)
+        snaps: list = []
+        interp.register_builtin("snap", lambda: snaps.append([label(x) for x in interp.calls]) or 0)
+        for src in SETUP:
+            interp.eval_expr(parser.parse_string(src))
+        return interp, snaps
+
+    def test_01_call_stack(self) -> None:
+        """Test what the call stack looks like"""
+        cases: Final[list[tuple[str, list[str]]]] = [
+            ("(outer 1)", ["outer", "inner"]),
+            ("(tail 1)", ["inner"]),
+            ("(twice (outer 1))", ["twice", "outer", "inner"]),
+            ("(apply outer '(1))", ["outer", "inner"]),
+            ("((lambda (x) (+ 1 (inner x))) 1)", ["lambda", "inner"]),
+        ]
+        for compiled in (False, True):
+            interp, snaps = self.interpreter(compiled)
+            for src, expected in cases:
+                with self.subTest(compiled=compiled, src=src):
+                    snaps.clear()
+                    interp.eval_expr(parser.parse_string(src))
+                    self.assertEqual(snaps, [expected])
+                    self.assertEqual(interp.calls, [])
+            with self.subTest(compiled=compiled, src="error"):
+                interp.eval_expr(parser.parse_string("(defun broken (n) (+ 1 (car n)))"))
+                with self.assertRaises(error.LispError):
+                    interp.eval_expr(parser.parse_string("(outer (broken 1))"))
+                self.assertEqual(interp.calls, [])
+            with self.subTest(compiled=compiled, src="spin"):
+                self.assertEqual(interp.eval_expr(parser.parse_string("(spin 10000)")), data.Atom("done"))
+                self.assertEqual(interp.calls, [])
+
+    def test_02_sampling(self) -> None:
+        """Test sampling a busy interpreter, from Python and from Lisp"""
+        with tempfile.TemporaryDirectory() as folder:
+            path: Final[str] = os.path.join(folder, "stacks.txt")
+            for compiled in (False, True):
+                with self.subTest(compiled=compiled):
+                    interp, _ = self.interpreter(compiled)
+                    smp = interp.start_sampler(0.0005)
+                    with self.assertRaises(error.LispError):
+                        interp.start_sampler()
+                    interp.eval_expr(parser.parse_string("(fib 20)"))
+                    self.assertIs(interp.stop_sampler(), smp)
+                    self.assertGreater(smp.samples, 0)
+                    self.assertEqual(sum(smp.counts().values()), smp.samples)
+                    self.assertTrue(any(path.startswith("fib;fib") for path in smp.counts()))
+                    self.assertIn("fib (fib (- n 1))", smp.collapsed(locations=True))
+
+                    interp.eval_expr(parser.parse_string("(start-sampler 0.0005)"))
+                    interp.eval_expr(parser.parse_string("(fib 20)"))
+                    count = interp.eval_expr(parser.parse_string(f'(stop-sampler "{path}")'))
+                    self.assertIsNone(interp.sampler)
+                    with open(path, encoding="utf-8") as fh:
+                        lines = fh.read().splitlines()
+                    self.assertEqual(sum(int(line.rsplit(" ", 1)[1]) for line in lines), count)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
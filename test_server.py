@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-18 01:25:00 krylon>
+#
+# /data/code/python/krylisp/test_server.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.test_server
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+from typing import Any
+
+from krylisp import parser, printer, server
+
+PRELUDE = """
+(defun fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))
+(setq greeting "hello")
+"""
+
+
+class Client:
+    """Client sends requests to a server and reads the responses."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.count = 0
+
+    async def send(self, **request: Any) -> int:
+        """Send request and return its id."""
+        self.count += 1
+        request["id"] = self.count
+        self.writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await self.writer.drain()
+        return self.count
+
+    async def receive(self) -> dict[str, Any]:
+        """Return the next response."""
+        return json.loads(await self.reader.readline())
+
+    async def call(self, **request: Any) -> dict[str, Any]:
+        """Send request and return the response to it."""
+        rid = await self.send(**request)
+        response = await self.receive()
+        assert response["id"] == rid
+        return response
+
+    async def close(self) -> None:
+        """Disconnect from the server."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+    """Test the evaluation server"""
+
+    async def asyncSetUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable-msg=R1732
+        prelude = os.path.join(self.tmp.name, "prelude.lisp")
+        with open(prelude, "w", encoding="utf-8") as fh:
+            fh.write(PRELUDE)
+        self.server = server.Server((prelude,), workers=2)
+        self.server.interp.form_cache = None
+        self.path = os.path.join(self.tmp.name, "krylisp.sock")
+        self.listener = await self.server.start(self.path)
+
+    async def asyncTearDown(self) -> None:
+        self.listener.close()
+        await self.listener.wait_closed()
+        self.server.close()
+        self.tmp.cleanup()
+
+    async def connect(self) -> Client:
+        """Return a Client connected to the server."""
+        return Client(*await asyncio.open_unix_connection(self.path))
+
+    async def test_01_sessions(self) -> None:
+        """Test that sessions share the prelude and keep their own definitions"""
+        one = await self.connect()
+        two = await self.connect()
+        try:
+            self.assertEqual(await one.call(src="(fib 10)"), {"id": 1, "value": "55"})
+            self.assertEqual((await one.call(src="(setq greeting 'bye)\n(defun twice (x)\n  (* 2 x))"))["value"],
+                             "twice")
+            self.assertEqual((await one.call(src="(list greeting (twice 21))"))["value"], "(bye 42)")
+            self.assertEqual((await two.call(src="greeting"))["value"], '"hello"')
+            self.assertIn("error", await two.call(src="(twice 1)"))
+            self.assertIn("error", await two.call(src="(fib 10"))
+            self.assertIn("error", await two.call(op="frobnicate"))
+            stats = (await two.call(op="stats"))["value"]
+            self.assertEqual((stats["requests"], stats["errors"], stats["sessions"]), (8, 3, 2))
+            self.assertLessEqual(stats["p50-ms"], stats["p99-ms"])
+        finally:
+            await one.close()
+            await two.close()
+
+    async def test_02_slow(self) -> None:
+        """Test that a slow form does not hold up other sessions"""
+        slow = await self.connect()
+        fast = await self.connect()
+        try:
+            await slow.send(src="(fib 25)")
+            await asyncio.sleep(0.05)
+            self.assertEqual(self.server.stats()["running"], 1)
+            self.assertEqual((await fast.call(src="(fib 5)"))["value"], "5")
+            self.assertEqual(self.server.stats()["running"], 1)
+            self.assertEqual((await slow.receive())["value"], "75025")
+            self.assertEqual(self.server.stats()["running"], 0)
+        finally:
+            await slow.close()
+            await fast.close()
+
+    async def test_03_forbidden(self) -> None:
+        """Test that a session cannot stop the server or change it for the others"""
+        one = await self.connect()
+        two = await self.connect()
+        try:
+            for src in server.FORBIDDEN:
+                with self.subTest(src=src):
+                    response = await one.call(src=f'({src} "{self.path}")')
+                    self.assertIn("not available", response["error"])
+            self.assertIsNone(self.server.interp.tracer)
+            # Worker processes are not started for a session either.
+            self.assertIn("not available", (await one.call(src="(pmap fib '(1 2 3))"))["error"])
+            self.assertIn("not available", (await two.call(src="(preduce + '(1 2 3))"))["error"])
+            self.assertIsNone(self.server.interp.pool)
+            self.assertEqual((await two.call(src="(fib 10)"))["value"], "55")
+
+            # Errors that are not LispErrors are reported, too.
+            self.server.interp.register_form("bail", lambda interp, lst, env: sys.exit(3))
+            self.assertEqual((await one.call(src="(bail)"))["error"], "SystemExit: 3")
+            self.assertEqual((await one.call(src="(fib 5)"))["value"], "5")
+        finally:
+            await one.close()
+            await two.close()
+
+    async def test_04_values(self) -> None:
+        """Test that a client can read back the values it is sent"""
+        client = await self.connect()
+        try:
+            test_cases = [
+                ("(cdr '(1))", "nil"),
+                ("(list greeting nil)", '("hello" nil)'),
+                ('(car \'("say \\"hi\\""))', '"say \\"hi\\""'),
+            ]
+            for src, expected in test_cases:
+                with self.subTest(src=src):
+                    value = (await client.call(src=src))["value"]
+                    self.assertEqual(value, expected)
+                    self.assertEqual(printer.source(next(parser.read(value))), value)
+        finally:
+            await client.close()
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
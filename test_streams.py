@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-18 00:20:00 krylon>
+#
+# /data/code/python/krylisp/test_streams.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.test_streams
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import os
+import tempfile
+import tracemalloc
+import unittest
+from typing import Any
+
+from krylisp import error, lisp, parser, printer, streams
+
+INTS_SRC = "(defun ints (n) (cons-stream n (ints (+ n 1))))"
+
+
+class TestStreams(unittest.TestCase):
+    """Test promises and lazy streams"""
+
+    def test_01_promises(self) -> None:
+        """Test that a promise computes its value once, when it is first forced"""
+        cases = [
+            ("(setq n 0)", "0"),
+            ("(setq p (delay (setq n (+ n 1))))", "#<Promise >"),
+            ("n", "0"),
+            ("(list (force p) (force p) n)", "(1 1 1)"),
+            ("p", "#<Promise forced >"),
+            ("(force 42)", "42"),
+            ("(setq q nil)", "nil"),
+            ("(let ((x 2)) (setq q (delay (* x 21))))", "#<Promise >"),
+            ("(force q)", "42"),
+        ]
+        for compiled in (False, True):
+            interp = lisp.LispInterpreter(compiled=compiled)
+            for src, expected in cases:
+                with self.subTest(compiled=compiled, src=src):
+                    self.assertEqual(show(evaluate(interp, src)), expected)
+
+    def test_02_streams(self) -> None:
+        """Test building and walking streams, with both engines"""
+        cases = [
+            ("(stream-to-list (stream-take 4 (ints 1)))", "(1 2 3 4)"),
+            ("(stream-to-list (stream-take 3 (stream-filter (lambda (x) (= 0 (mod x 7))) (ints 1))))",
+             "(7 14 21)"),
+            ("(stream-to-list (stream-map (lambda (x) (* x x)) (stream-range 1 5)))", "(1 4 9 16)"),
+            ("(stream-to-list (stream-range 10 0 -3))", "(10 7 4 1)"),
+            ("(stream-to-list (stream-take 3 (stream-range 5)))", "(5 6 7)"),
+            ("(stream-reduce (lambda (a x) (+ a x)) 0 (stream-range 0 101))", "5050"),
+            ("(stream-to-list (stream-drop 2 '(a b c)))", "(c)"),
+            ("(stream-to-list (stream-map (lambda (x) x) #(1 2)))", "(1 2)"),
+            ("(list (stream-car (ints 3)) (stream-car (stream-cdr (ints 3))) (stream-car nil))", "(3 4 nil)"),
+            ("(stream-car (stream-cdr (stream-range 3 6)))", "4"),
+            ("(list (stream-null nil) (stream-null (stream-range 0 0)) (stream-null (ints 0)))", "(t t nil)"),
+            ("(stream-to-list (cons-stream 1 (cons-stream 2 '(3 4))))", "(1 2 3 4)"),
+            # Walking a long stream made by cons-stream does not need a deep stack.
+            ("(stream-car (stream-drop 20000 (ints 0)))", "20000"),
+        ]
+        for compiled in (False, True):
+            interp = lisp.LispInterpreter(compiled=compiled)
+            evaluate(interp, INTS_SRC)
+            for src, expected in cases:
+                with self.subTest(compiled=compiled, src=src):
+                    self.assertEqual(show(evaluate(interp, src)), expected)
+
+    def test_03_laziness(self) -> None:
+        """Test that streams compute only the elements that are asked for"""
+        for compiled in (False, True):
+            interp = lisp.LispInterpreter(compiled=compiled)
+            evaluate(interp, INTS_SRC)
+            evaluate(interp, "(setq calls 0)")
+            evaluate(interp, "(setq s (stream-map (lambda (x) (setq calls (+ calls 1))) (ints 0)))")
+            with self.subTest(compiled=compiled, step="map"):
+                self.assertEqual(evaluate(interp, "calls"), 0)
+            evaluate(interp, "(stream-to-list (stream-take 3 s))")
+            with self.subTest(compiled=compiled, step="take"):
+                self.assertEqual(evaluate(interp, "calls"), 3)
+            # The tail of a cons-stream is computed once.
+            evaluate(interp, "(setq n 0)")
+            evaluate(interp, "(setq c (cons-stream 1 (cons-stream (setq n (+ n 1)) nil)))")
+            evaluate(interp, "(stream-to-list c)")
+            evaluate(interp, "(stream-to-list c)")
+            with self.subTest(compiled=compiled, step="cons-stream"):
+                self.assertEqual(evaluate(interp, "n"), 1)
+
+    def test_04_sources(self) -> None:
+        """Test streams over files and Python iterables"""
+        interp = lisp.LispInterpreter()
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "records.txt")
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write("alpha\nbeta\r\ngamma")
+            interp.env["path"] = path
+            self.assertEqual(show(evaluate(interp, "(stream-to-list (stream-lines path))")),
+                             '("alpha" "beta" "gamma")')
+            # A file stream can be walked again.
+            self.assertEqual(evaluate(interp, "(stream-car (stream-drop 1 (stream-lines path)))"), "beta")
+
+        interp.env["squares"] = streams.from_iterable(x * x for x in range(4))
+        self.assertEqual(show(evaluate(interp, "(stream-to-list squares)")), "(0 1 4 9)")
+        with self.assertRaises(error.LispError):
+            evaluate(interp, "(stream-to-list squares)")
+        interp.env["numbers"] = streams.from_iterable([1, 2])
+        for _ in range(2):
+            self.assertEqual(show(evaluate(interp, "(stream-to-list numbers)")), "(1 2)")
+
+        errors = [
+            "(stream-to-list 5)",
+            "(stream-map 'car '(1))",
+            "(stream-take -1 '(1))",
+            "(stream-range 0 1.5)",
+            "(stream-range 0 10 0)",
+            "(delay)",
+            "(cons-stream 1)",
+        ]
+        for compiled in (False, True):
+            interp = lisp.LispInterpreter(compiled=compiled)
+            for src in errors:
+                with self.subTest(compiled=compiled, src=src):
+                    with self.assertRaises(error.LispError):
+                        evaluate(interp, src)
+
+        with tempfile.TemporaryDirectory() as folder:
+            evaluate(interp, "(setq p (delay 1))")
+            with self.assertRaises(error.ImageError):
+                interp.save_image(os.path.join(folder, "streams.image"))
+
+    def test_05_memory(self) -> None:
+        """Test that a pipeline over a long stream runs in constant memory"""
+        for compiled in (False, True):
+            interp = lisp.LispInterpreter(compiled=compiled)
+            expr = parser.parse_string(
+                "(stream-reduce (lambda (a x) (+ a x)) 0"
+                " (stream-filter (lambda (x) (= 0 (mod x 2)))"
+                " (stream-map (lambda (x) (* x 3)) (stream-range 0 100000))))")
+            tracemalloc.start()
+            try:
+                res = interp.eval_expr(expr)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            with self.subTest(compiled=compiled):
+                self.assertEqual(res, sum(x * 3 for x in range(100000) if x * 3 % 2 == 0))
+                # A list of the elements alone would take several megabytes.
+                self.assertLess(peak, 1 << 20)
+
+
+def evaluate(interp: lisp.LispInterpreter, src: str) -> Any:
+    """Evaluate the source code src in interp."""
+    return interp.eval_expr(parser.parse_string(src))
+
+
+def show(value: Any) -> str:
+    """Return value as Lisp source."""
+    return printer.source(value)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
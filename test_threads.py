@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-18 02:45:00 krylon>
+#
+# /data/code/python/krylisp/test_threads.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+
+"""
+krylisp.test_threads
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+import functools
+import sys
+import threading
+import unittest
+from typing import Any, Final, Optional
+
+from krylisp import data, error, lisp, parser
+
+PRELUDE = """
+(defun fib (n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))
+(defmacro twice (x) (list '+ x x))
+(setq base 100)
+(defun get-base () base)
+(defun reset-base () (setq base 0))
+"""
+
+
+class TestThreads(unittest.TestCase):
+    """Test contexts sharing a frozen global Environment"""
+
+    def test_01_overlay(self) -> None:
+        """Test that contexts see the shared variables and keep their own changes to themselves"""
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                interp = lisp.LispInterpreter(compiled=compiled, threadsafe=True)
+                ev = functools.partial(evaluate, interp)
+                ev(PRELUDE)
+                one = interp.context()
+                two = interp.context()
+                with self.assertRaises(error.LispError):
+                    ev("(setq base 1)")
+                with self.assertRaises(error.LispError):
+                    ev("(defun fib (n) n)")
+
+                ev("(setq base 1)", one)
+                ev("(defun fib (n) n)", one)
+                self.assertEqual((ev("base", one), ev("base", two), ev("base")), (1, 100, 100))
+                self.assertEqual((ev("(fib 10)", one), ev("(fib 10)", two)), (10, 55))
+                self.assertEqual(ev("(let ((x 3)) (setq base (twice x)))", two), 6)
+                self.assertEqual((ev("base", two), ev("base")), (6, 100))
+                # Shared functions see the shared variables.
+                self.assertEqual(ev("(get-base)", two), 100)
+                self.assertEqual(ev("(get-base)", interp.context()), 100)
+
+                # Shared functions cannot set shared variables, functions
+                # defined in a context set the variables of the context.
+                with self.assertRaises(error.LispError):
+                    ev("(reset-base)", one)
+                ev("(defun set-base (n) (setq base n))", one)
+                self.assertEqual(ev("(set-base 7)", one), 7)
+                self.assertEqual(ev("base", one), 7)
+
+    def test_02_threads(self) -> None:
+        """Test evaluating in contexts from several threads at once"""
+        switch: Final[float] = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+        try:
+            for compiled in (False, True):
+                with self.subTest(compiled=compiled):
+                    interp = lisp.LispInterpreter(compiled=compiled, threadsafe=True)
+                    evaluate(interp, PRELUDE)
+                    interp.freeze()
+                    results: dict[int, set] = {}
+                    symbols: list[str] = []
+                    threads = [threading.Thread(target=work, args=(interp, idx, results, symbols))
+                               for idx in range(6)]
+                    for thread in threads:
+                        thread.start()
+                    for thread in threads:
+                        thread.join()
+                    self.assertEqual(results, {idx: {110 + idx} for idx in range(6)})
+                    self.assertEqual(len(set(symbols)), 120)
+                    self.assertEqual(len(interp.calls), 0)
+        finally:
+            sys.setswitchinterval(switch)
+
+    def test_03_caches(self) -> None:
+        """Test that the caches can be invalidated while other threads store into them"""
+        switch: Final[float] = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        errors: list[BaseException] = []
+        calls: Final[lisp.CallCache] = lisp.CallCache(1024)
+        macros: Final[lisp.MacroCache] = lisp.MacroCache(1024)
+        root: Final[data.Environment] = data.Environment()
+        fn: Final[data.ConsCell] = parser.parse_string("(lambda (x) x)")
+        macro: Final[data.ConsCell] = parser.parse_string("(macro (x) x)")
+
+        sites: Final[dict[str, list]] = {name: [parser.parse_string(f"({name} {idx})") for idx in range(5000)]
+                                         for name in ("f", "g", "local")}
+        stored: Final[threading.Event] = threading.Event()
+
+        def store(name: str) -> None:
+            try:
+                for lst in sites[name]:
+                    calls.store(lst, root, fn)
+                    macros.store(macro, lst, lst)
+            except Exception as err:  # pylint: disable-msg=W0718
+                errors.append(err)
+
+        def invalidate() -> None:
+            try:
+                idx = 0
+                while not stored.is_set():
+                    calls.shadow((f"x{idx}",))
+                    macros.invalidate(macro)
+                    idx += 1
+                calls.shadow(("local",))
+            except Exception as err:  # pylint: disable-msg=W0718
+                errors.append(err)
+
+        try:
+            threads = [threading.Thread(target=store, args=(name,)) for name in sites]
+            invalidator = threading.Thread(target=invalidate)
+            invalidator.start()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stored.set()
+            invalidator.join()
+        finally:
+            sys.setswitchinterval(switch)
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(calls.sites), 1024)
+        self.assertLessEqual(len(macros.sites), 1024)
+        # Once a name is shadowed, calls to it are gone.
+        self.assertFalse([entry for entry in calls.sites.values() if entry[0].head.value == "local"])
+
+
+def work(interp: lisp.LispInterpreter, idx: int, results: dict[int, set], symbols: list[str]) -> None:
+    """Evaluate forms in a context of interp, and record their values in results and symbols."""
+    env: Final[data.Environment] = interp.context()
+    evaluate(interp, f"(setq base {idx})", env)
+    evaluate(interp, "(defun add-base (x) (+ x base))", env)
+    values = set()
+    for _ in range(20):
+        values.add(evaluate(interp, "(add-base (twice (fib 10)))", env))
+        symbols.append(evaluate(interp, "(gensym)", env))
+    results[idx] = values
+
+
+def evaluate(interp: lisp.LispInterpreter, src: str, env: Optional[data.Environment] = None) -> Any:
+    """Evaluate the forms in the source code src in env, and return the value of the last one."""
+    res = None
+    for form in parser.read(src):
+        res = interp.eval_expr(form, env)
+    return res
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #
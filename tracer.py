@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Time-stamp: <2026-10-17 13:10:00 krylon>
+#
+# /data/code/python/krylisp/tracer.py
+# created on 17. 10. 2026
+# (c) 2026 Benjamin Walkenhorst
+#
+# This file is part of the Wetterfrosch weather app. It is distributed
+# under the terms of the GNU General Public License 3. See the file
+# LICENSE for details or find a copy online at
+# https://www.gnu.org/licenses/gpl-3.0
+
+"""
+krylisp.tracer
+
+Tracers receive structured events from the interpreter while it evaluates.
+
+(c) 2026 Benjamin Walkenhorst
+"""
+
+from typing import Any
+
+from krylib import moan
+
+from krylisp import data
+
+# Samstag, 17. 10. 2026
+# The interpreter looks at its tracer once per call to walk. If there is
+# none, it evaluates exactly as if tracing did not exist; otherwise walk
+# hands the expression to a separate loop that reports every step to the
+# tracer. So a Tracer can afford to be slow, the interpreter without one
+# does not pay for it.
+
+
+class Tracer:
+    """
+    Tracer is the base class for objects that watch the interpreter.
+
+    Each method is called for one kind of event and does nothing by default,
+    so a subclass only needs to override the events it is interested in.
+    """
+
+    def enter(self, expr: Any, env: data.Environment) -> None:
+        """Called before expr is evaluated in env."""
+
+    def exit(self, expr: Any, value: Any) -> None:
+        """Called after expr has evaluated to value."""
+
+    def lookup(self, name: data.Atom, value: Any) -> None:
+        """Called after the variable name has been looked up."""
+
+    def expand(self, macro: data.ConsCell, form: data.ConsCell, expansion: Any) -> None:
+        """Called after the call form to macro has been expanded."""
+
+
+class DebugTracer(Tracer):
+    """DebugTracer prints every event to stderr. It is what (dbg t) installs."""
+
+    __slots__ = ['depth']
+
+    def __init__(self) -> None:
+        self.depth = 0
+
+    def enter(self, expr: Any, env: data.Environment) -> None:
+        moan("{0}Evaluating {1}", "  " * self.depth, expr)
+        self.depth += 1
+
+    def exit(self, expr: Any, value: Any) -> None:
+        self.depth = max(self.depth - 1, 0)
+        moan("{0}{1} --> {2}", "  " * self.depth, expr, value)
+
+    def lookup(self, name: data.Atom, value: Any) -> None:
+        moan("{0}Variable {1} is {2}", "  " * self.depth, name, value)
+
+    def expand(self, macro: data.ConsCell, form: data.ConsCell, expansion: Any) -> None:
+        moan("{0}Macro call {1}\n\texpands to\n\t--> {2}", "  " * self.depth, form, expansion)
+
+# Local Variables: #
+# python-indent: 4 #
+# End: #